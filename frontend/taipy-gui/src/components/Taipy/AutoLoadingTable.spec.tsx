@@ -163,7 +163,9 @@ describe("AutoLoadingTable Component", () => {
                 applies: undefined,
                 styles: undefined,
                 tooltips: undefined,
-                filters: []
+                filters: [],
+                columnar: true,
+                arrowschema: undefined,
             },
             type: "REQUEST_DATA_UPDATE",
         });
@@ -71,7 +71,7 @@ import {
     useFormatConfig,
     useModule,
 } from "../../utils/hooks";
-import TableFilter, { FilterDesc } from "./TableFilter";
+import TableFilter, { ANY_COLUMN, FilterDesc } from "./TableFilter";
 import { getSuffixedClassNames } from "./utils";
 
 interface RowData {
@@ -339,7 +339,9 @@ const AutoLoadingTable = (props: TaipyTableProps) => {
                       }, "-agg")
                     : "";
                 const cols = colsOrder.map((col) => columns[col].dfid).filter((c) => c != EDIT_COL);
-                const afs = appliedFilters.filter((fd) => Object.values(columns).some((cd) => cd.dfid === fd.col));
+                const afs = appliedFilters.filter(
+                    (fd) => fd.col == ANY_COLUMN || Object.values(columns).some((cd) => cd.dfid === fd.col)
+                );
                 const key = `Infinite-${cols.join()}-${orderBy}-${order}${agg}${afs.map(
                     (af) => `${af.col}${af.action}${af.value}`
                 )}`;
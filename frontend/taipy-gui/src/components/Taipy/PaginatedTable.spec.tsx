@@ -184,6 +184,8 @@ describe("PaginatedTable Component", () => {
                 styles: undefined,
                 tooltips: undefined,
                 filters: [],
+                columnar: true,
+                arrowschema: undefined,
             },
             type: "REQUEST_DATA_UPDATE",
         });
@@ -214,6 +216,8 @@ describe("PaginatedTable Component", () => {
                 styles: undefined,
                 tooltips: undefined,
                 filters: [],
+                columnar: true,
+                arrowschema: undefined,
             },
             type: "REQUEST_DATA_UPDATE",
         });
@@ -260,6 +264,8 @@ describe("PaginatedTable Component", () => {
                 styles: undefined,
                 tooltips: undefined,
                 filters: [],
+                columnar: true,
+                arrowschema: undefined,
             },
             type: "REQUEST_DATA_UPDATE",
         });
@@ -77,7 +77,7 @@ import {
     useFormatConfig,
     useModule,
 } from "../../utils/hooks";
-import TableFilter, { FilterDesc } from "./TableFilter";
+import TableFilter, { ANY_COLUMN, FilterDesc } from "./TableFilter";
 import { getSuffixedClassNames } from "./utils";
 
 const loadingStyle: CSSProperties = { width: "100%", height: "3em", textAlign: "right", verticalAlign: "center" };
@@ -204,7 +204,9 @@ const PaginatedTable = (props: TaipyPaginatedTableProps) => {
               }, "-agg")
             : "";
         const cols = colsOrder.map((col) => columns[col].dfid).filter((c) => c != EDIT_COL);
-        const afs = appliedFilters.filter((fd) => Object.values(columns).some((cd) => cd.dfid === fd.col));
+        const afs = appliedFilters.filter(
+            (fd) => fd.col == ANY_COLUMN || Object.values(columns).some((cd) => cd.dfid === fd.col)
+        );
         pageKey.current = `${startIndex}-${endIndex}-${cols.join()}-${orderBy}-${order}${agg}${afs.map(
             (af) => `${af.col}${af.action}${af.value}`
         )}`;
@@ -91,6 +91,33 @@ describe("Table Filter Component", () => {
         const validate = getByTestId("CheckIcon").parentElement;
         expect(validate).not.toBeDisabled();
     });
+    it("searches any column", async () => {
+        const onValidate = jest.fn();
+        const { getByTestId, getAllByTestId, findByRole, getByText, getAllByText } = render(
+            <TableFilter columns={tableColumns} colsOrder={colsOrder} onValidate={onValidate} />
+        );
+        const elt = getByTestId("FilterListIcon");
+        await userEvent.click(elt);
+        const dropdownElts = getAllByTestId("ArrowDropDownIcon");
+        await userEvent.click(dropdownElts[0].parentElement?.firstElementChild || dropdownElts[0]);
+        await findByRole("listbox");
+        await userEvent.click(getByText("Any column"));
+        await userEvent.click(dropdownElts[1].parentElement?.firstElementChild || dropdownElts[1]);
+        await findByRole("listbox");
+        await userEvent.click(getByText("starts with"));
+        const validate = getByTestId("CheckIcon").parentElement;
+        expect(validate).toBeDisabled();
+        const labels = getAllByText("Empty String");
+        const input = labels[0].nextElementSibling?.firstElementChild || labels[0];
+        await userEvent.click(input);
+        await userEvent.keyboard("ab");
+        expect(validate).not.toBeDisabled();
+        await userEvent.click(validate as HTMLElement);
+        await userEvent.click(getByText("Apply 1 filter"));
+        expect(onValidate).toHaveBeenCalledWith([
+            { col: "*", action: "startswith", value: "ab", cols: ["StringCol"] },
+        ]);
+    });
     it("behaves on number column", async () => {
         const { getByTestId, getAllByTestId, findByRole, getByText, getAllByText } = render(
             <TableFilter columns={tableColumns} colsOrder={colsOrder} onValidate={jest.fn()} />
@@ -39,8 +39,13 @@ export interface FilterDesc {
     col: string;
     action: string;
     value: string | number | boolean | Date;
+    matchcase?: boolean;
+    cols?: string[];
 }
 
+// the column of the filters that search all the text columns
+export const ANY_COLUMN = "*";
+
 interface TableFilterProps {
     columns: Record<string, ColumnDesc>;
     colsOrder: Array<string>;
@@ -63,7 +68,8 @@ const anchorOrigin = {
 } as PopoverOrigin;
 
 const actionsByType = {
-    string: { "==": "equals", contains: "contains", "!=": "not equals" },
+    [ANY_COLUMN]: { contains: "contains", startswith: "starts with" },
+    string: { "==": "equals", contains: "contains", startswith: "starts with", "!=": "not equals" },
     number: {
         "<": "less",
         "<=": "less equals",
@@ -89,7 +95,20 @@ const rightButtonSx = { ml: "auto" };
 const getActionsByType = (colType?: string) =>
     (colType && colType in actionsByType && actionsByType[colType]) || actionsByType["string"];
 
+const nonTextTypes = ["date", "number", "boolean"];
+
+// the columns that a filter on any column searches
+const getSearchColumns = (columns: Record<string, ColumnDesc>) =>
+    Object.values(columns)
+        .filter((cd) => cd.filter && !nonTextTypes.includes(getTypeFromDf(cd.type) || ""))
+        .map((cd) => cd.dfid);
+
 const getFilterDesc = (columns: Record<string, ColumnDesc>, colId?: string, act?: string, val?: string) => {
+    if (colId == ANY_COLUMN) {
+        return act && val
+            ? ({ col: ANY_COLUMN, action: act, value: val, cols: getSearchColumns(columns) } as FilterDesc)
+            : undefined;
+    }
     if (colId && act && val !== undefined) {
         const colType = getTypeFromDf(columns[colId].type);
         if (!val && (colType == "date" || colType == "number" || colType == "boolean")) {
@@ -175,7 +194,10 @@ const FilterRow = (props: FilterRowProps) => {
 
     useEffect(() => {
         if (filter && idx > -1) {
-            const col = Object.keys(columns).find((col) => columns[col].dfid === filter.col) || "";
+            const col =
+                filter.col == ANY_COLUMN
+                    ? ANY_COLUMN
+                    : Object.keys(columns).find((col) => columns[col].dfid === filter.col) || "";
             setColId(col);
             setAction(filter.action);
             setVal(filter.value as string);
@@ -190,7 +212,7 @@ const FilterRow = (props: FilterRowProps) => {
         }
     }, [columns, filter, idx]);
 
-    const colType = getTypeFromDf(colId in columns ? columns[colId].type : "");
+    const colType = colId == ANY_COLUMN ? ANY_COLUMN : getTypeFromDf(colId in columns ? columns[colId].type : "");
     const colFormat = colId in columns && columns[colId].format ? columns[colId].format : defaultDateFormat;
 
     return (
@@ -199,6 +221,11 @@ const FilterRow = (props: FilterRowProps) => {
                 <FormControl margin="dense">
                     <InputLabel>Column</InputLabel>
                     <Select value={colId || ""} onChange={onColSelect} input={<OutlinedInput label="Column" />}>
+                        {getSearchColumns(columns).length ? (
+                            <MenuItem key={ANY_COLUMN} value={ANY_COLUMN}>
+                                Any column
+                            </MenuItem>
+                        ) : null}
                         {colsOrder.map((col) =>
                             columns[col].filter ? (
                                 <MenuItem key={col} value={col}>
@@ -317,7 +344,11 @@ const TableFilter = (props: TableFilterProps) => {
     useEffect(() => {
         columns &&
             appliedFilters &&
-            setFilters(appliedFilters.filter((fd) => Object.values(columns).some((cd) => cd.dfid === fd.col)));
+            setFilters(
+                appliedFilters.filter(
+                    (fd) => fd.col == ANY_COLUMN || Object.values(columns).some((cd) => cd.dfid === fd.col)
+                )
+            );
     }, [columns, appliedFilters]);
 
     return (
@@ -13,7 +13,15 @@
 
 import "@testing-library/jest-dom";
 
-import { taipyReducer, INITIAL_STATE, TaipyBaseAction, createAlertAction, AlertMessage } from "./taipyReducers";
+import {
+    taipyReducer,
+    INITIAL_STATE,
+    TaipyBaseAction,
+    TaipyState,
+    createAlertAction,
+    createRequestDataUpdateAction,
+    AlertMessage,
+} from "./taipyReducers";
 
 describe("reducer", () => {
     it("store socket connected", async () => {
@@ -22,6 +30,50 @@ describe("reducer", () => {
     it("returns update", async () => {
         expect(taipyReducer({...INITIAL_STATE}, {type: "UPDATE", name: "name", payload: {value: "value"}} as TaipyBaseAction).data.name).toBeDefined();
     });
+    it("appends rows to a table page", async () => {
+        const data = { tbl: { pk: { data: [{ a: 1 }, { a: 2 }], rowcount: 2, start: 10 }, old: { data: [] } } };
+        const newState = taipyReducer({ ...INITIAL_STATE, data }, {
+            type: "UPDATE",
+            name: "tbl",
+            payload: { value: { data: [{ a: 3 }], rowcount: 13, start: 12 }, pagekey: "pk", pagekeys: ["pk"], append: true },
+        } as TaipyBaseAction);
+        expect(newState.data.tbl).toEqual({ pk: { data: [{ a: 1 }, { a: 2 }, { a: 3 }], rowcount: 13, start: 10 } });
+    });
+    it("appends rows to chart data", async () => {
+        const data = { chart: { dk: { x: [1, 2], y: new Float64Array([3, 4]) } } };
+        const newState = taipyReducer({ ...INITIAL_STATE, data }, {
+            type: "UPDATE",
+            name: "chart",
+            payload: { value: { x: [3], y: [5] }, pagekey: "dk", pagekeys: ["dk"], append: true, alldata: true },
+        } as TaipyBaseAction);
+        expect(newState.data.chart).toEqual({ dk: { x: [1, 2, 3], y: [3, 4, 5] } });
+    });
+    it("restores unchanged data", async () => {
+        const value = { data: [{ a: 1 }], rowcount: 1, start: 0 };
+        let state = taipyReducer({ ...INITIAL_STATE }, {
+            type: "UPDATE",
+            name: "versioned",
+            payload: { value: value, pagekey: "pk", version: "v1" },
+        } as TaipyBaseAction);
+        state = { ...state, data: { ...state.data, versioned: 2 } };
+        const socket = { emit: jest.fn() };
+        const action = createRequestDataUpdateAction("versioned", undefined, undefined, ["a"], "pk", {});
+        taipyReducer({ ...state, socket } as unknown as TaipyState, action);
+        expect(socket.emit.mock.calls[0][1].payload.version).toBe("v1");
+        state = taipyReducer(state, {
+            type: "UPDATE",
+            name: "versioned",
+            payload: { value: null, pagekey: "pk", version: "v1", unchanged: true },
+        } as TaipyBaseAction);
+        expect(state.data.versioned).toEqual({ pk: value });
+        // the versions are dropped when rows are appended
+        state = taipyReducer(state, {
+            type: "UPDATE",
+            name: "versioned",
+            payload: { value: { data: [{ a: 2 }], rowcount: 2, start: 1 }, pagekey: "pk", pagekeys: ["pk"], append: true },
+        } as TaipyBaseAction);
+        expect(state.dataVersions).toEqual({});
+    });
     it("store locations", async () => {
         expect(taipyReducer({...INITIAL_STATE}, {type: "SET_LOCATIONS", payload: {value: {loc: "loc"}}} as TaipyBaseAction).locations).toBeDefined();
     });
@@ -19,7 +19,7 @@ import { v4 as uuidv4 } from "uuid";
 import merge from "lodash/merge";
 
 import { getBaseURL, TIMEZONE_CLIENT } from "../utils";
-import { parseData } from "../utils/dataFormat";
+import { getArrowSchemaId, parseData } from "../utils/dataFormat";
 import { MenuProps } from "../utils/lov";
 import { FilterDesc } from "../components/Taipy/TableFilter";
 import { stylekitModeThemes, stylekitTheme } from "../themes/stylekit";
@@ -47,6 +47,12 @@ enum Types {
     Acknowledgement = "ACKNOWLEDGEMENT",
 }
 
+// data received with a version, the version is sent with the next request of the same page
+interface DataVersion {
+    version: string;
+    value: unknown;
+}
+
 /**
  * The state of the underlying Taipy application.
  */
@@ -70,6 +76,8 @@ export interface TaipyState {
     menu: MenuProps;
     download?: FileDownloadProps;
     ackList: string[];
+    // last versioned data received, by variable name and page key
+    dataVersions: Record<string, Record<string, DataVersion>>;
 }
 
 /**
@@ -205,6 +213,7 @@ export const INITIAL_STATE: TaipyState = {
     menu: {},
     ackList: [],
     alerts: [],
+    dataVersions: {},
 };
 
 export const taipyInitialize = (initialState: TaipyState): TaipyState => ({
@@ -249,7 +258,7 @@ const getWsMessageListener = (dispatch: Dispatch<TaipyBaseAction>) => {
     const dispatchWsMessage = (message: WsMessage) => {
         if (message.type === "MU" && Array.isArray(message.payload)) {
             const payloads = message.payload as NamePayload[];
-            Promise.all(payloads.map((pl) => parseData(pl.payload.value as Record<string, unknown>)))
+            Promise.all(payloads.map((pl) => parseData(pl.payload.value as Record<string, unknown>, pl.name)))
                 .then((vals) => {
                     vals.forEach((val, idx) => (payloads[idx].payload.value = val));
                     dispatch(messageToAction(message));
@@ -293,12 +302,49 @@ export const initializeWebSocket = (socket: Socket | undefined, dispatch: Dispat
     }
 };
 
+// removes the versioned data received for the variable name
+const dropDataVersions = (dataVersions: TaipyState["dataVersions"], name: string) =>
+    Object.fromEntries(Object.entries(dataVersions).filter(([key]) => key !== name));
+
 const addRows = (previousRows: Record<string, unknown>[], newRows: Record<string, unknown>[], start: number) =>
     newRows.reduce((arr, row) => {
         arr[start++] = row;
         return arr;
     }, previousRows.concat([]));
 
+const concatColumns = (previousColumns: Record<string, unknown>, newColumns: Record<string, unknown>) =>
+    Object.entries(newColumns).reduce(
+        (cols, [name, values]) => {
+            cols[name] = Array.from((previousColumns[name] || []) as ArrayLike<unknown>).concat(
+                Array.from(values as ArrayLike<unknown>)
+            );
+            return cols;
+        },
+        { ...previousColumns }
+    );
+
+// merge the rows appended to a data set with the data previously received
+const appendData = (
+    previousValue: Record<string, unknown>,
+    newValue: Record<string, unknown>,
+    payload: Record<string, unknown>
+) => {
+    if (payload.alldata) {
+        return concatColumns(previousValue, newValue);
+    }
+    const start = newValue.start as number;
+    const rows = (previousValue.data || []) as Record<string, unknown>[];
+    return {
+        ...previousValue,
+        rowcount: newValue.rowcount,
+        data: addRows(
+            rows,
+            newValue.data as Record<string, unknown>[],
+            payload.infinite ? start : start - ((previousValue.start as number) || 0)
+        ),
+    };
+};
+
 const storeBlockUi = (block?: BlockMessage) => () => {
     if (localStorage) {
         if (block) {
@@ -332,6 +378,33 @@ export const taipyReducer = (state: TaipyState, baseAction: TaipyBaseAction): Ta
         case Types.Update:
             const newValue = action.payload.value as Record<string, unknown>;
             const oldValue = (state.data[action.name] as Record<string, unknown>) || {};
+            if (typeof action.payload.unchanged === "boolean" && action.payload.unchanged) {
+                // the server did not send the data that was already received
+                const pageKey = action.payload.pagekey as string;
+                const cached = state.dataVersions[action.name] && state.dataVersions[action.name][pageKey];
+                if (!cached || cached.version !== action.payload.version) {
+                    return state;
+                }
+                return { ...state, data: { ...state.data, [action.name]: { ...oldValue, [pageKey]: cached.value } } };
+            }
+            if (typeof action.payload.append === "boolean" && action.payload.append) {
+                // rows were appended: the pages that the server did not update are dropped
+                const pageKey = action.payload.pagekey as string;
+                const pageKeys = (action.payload.pagekeys || []) as string[];
+                const value = Object.fromEntries(Object.entries(oldValue).filter(([key]) => pageKeys.includes(key)));
+                if (typeof oldValue[pageKey] === "object") {
+                    value[pageKey] = appendData(
+                        oldValue[pageKey] as Record<string, unknown>,
+                        newValue,
+                        action.payload as Record<string, unknown>
+                    );
+                }
+                return {
+                    ...state,
+                    data: { ...state.data, [action.name]: value },
+                    dataVersions: dropDataVersions(state.dataVersions, action.name),
+                };
+            }
             if (typeof action.payload.infinite === "boolean" && action.payload.infinite) {
                 const start = newValue.start;
                 if (typeof start === "number") {
@@ -349,6 +422,19 @@ export const taipyReducer = (state: TaipyState, baseAction: TaipyBaseAction): Ta
                         ? { ...oldValue, [action.payload.pagekey as string]: newValue }
                         : newValue,
                 },
+                dataVersions:
+                    action.payload.pagekey && typeof action.payload.version === "string"
+                        ? {
+                              ...state.dataVersions,
+                              [action.name]: {
+                                  ...state.dataVersions[action.name],
+                                  [action.payload.pagekey as string]: {
+                                      version: action.payload.version,
+                                      value: newValue,
+                                  },
+                              },
+                          }
+                        : state.dataVersions,
             };
         case Types.SetLocations:
             return { ...state, locations: action.payload.value as Record<string, string> };
@@ -478,7 +564,18 @@ export const taipyReducer = (state: TaipyState, baseAction: TaipyBaseAction): Ta
             ackId = sendWsMessage(state.socket, "A", action.name, action.payload, state.id, action.context);
             break;
         case Types.RequestDataUpdate:
-            ackId = sendWsMessage(state.socket, "DU", action.name, action.payload, state.id, action.context);
+            // the version of the data received for the same page is sent: the server does not send the data
+            // again if it is unchanged
+            const versions = state.dataVersions[action.name];
+            const dataVersion = versions && versions[action.payload.pagekey as string];
+            ackId = sendWsMessage(
+                state.socket,
+                "DU",
+                action.name,
+                dataVersion ? { ...action.payload, version: dataVersion.version } : action.payload,
+                state.id,
+                action.context
+            );
             break;
         case Types.RequestUpdate:
             ackId = sendWsMessage(state.socket, "RU", action.name, action.payload, state.id, action.context);
@@ -616,6 +713,8 @@ export const createRequestTableUpdateAction = (
         tooltips: tooltips,
         handlenan: handleNan,
         filters: filters,
+        columnar: true,
+        arrowschema: getArrowSchemaId(name),
     });
 
 export const createRequestInfiniteTableUpdateAction = (
@@ -647,6 +746,8 @@ export const createRequestInfiniteTableUpdateAction = (
         tooltips: tooltips,
         handlenan: handleNan,
         filters: filters,
+        columnar: true,
+        arrowschema: getArrowSchemaId(name),
     });
 
 /**
@@ -21,6 +21,7 @@ const extractData = { dataExtraction: true, format: "", data: { key: "value" } }
 const ipcTable = tableToIPC(tableFromArrays({i32 : new Int32Array([1, 2, 3]), str: ["One", "Two", "Three"]}))
 
 const arrowRecordsData = { format: DataFormat.APACHE_ARROW, orient: "records", data: ipcTable };
+const columnarData = { format: DataFormat.JSON, orient: "records", columnar: true, data: { i32: [1, 2], str: ["One", null] } };
 const arrowListData = { format: DataFormat.APACHE_ARROW, orient: "list", data: ipcTable };
 
 describe("does nothing", () => {
@@ -33,6 +34,12 @@ describe("does nothing", () => {
     it("returns records from arrow", async () => {
         expect(await parseData(arrowRecordsData)).toStrictEqual({ data: [{i32: 1, str: "One"}, {i32: 2, str: "Two"}, {i32: 3, str: "Three"}], format: "ARROW", orient: "records" });
     });
+    it("returns records from columns", async () => {
+        expect(await parseData(columnarData)).toStrictEqual({ data: [{i32: 1, str: "One"}, {i32: 2, str: null}], format: "JSON", orient: "records", columnar: true });
+    });
+    it("returns no records from an unknown arrow schema", async () => {
+        expect(await parseData({ format: DataFormat.APACHE_ARROW, orient: "records", schemaId: "unknown", data: new ArrayBuffer(8) })).toStrictEqual({ data: [], format: "ARROW", orient: "records", schemaId: "unknown" });
+    });
     it("returns list from arrow", async () => {
         expect(await parseData(arrowListData)).toStrictEqual({ data: {i32: [1, 2, 3], str: ["One", "Two", "Three"]}, format: "ARROW", orient: "list" });
     });
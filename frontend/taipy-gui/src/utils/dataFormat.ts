@@ -29,15 +29,69 @@ const coerceBigInt = (val: unknown) => {
     return val;
 }
 
-export const parseData = (data: Record<string, unknown>): Promise<Record<string, unknown>> => {
+const columnsToRecords = (columns: Record<string, unknown[]>) => {
+    const names = Object.keys(columns);
+    const nbRows = names.length ? columns[names[0]].length : 0;
+    const records: Array<Record<string, unknown>> = [];
+    for (let i = 0; i < nbRows; i++) {
+        const record: Record<string, unknown> = {};
+        for (const name of names) {
+            record[name] = columns[name][i];
+        }
+        records.push(record);
+    }
+    return records;
+};
+
+// Arrow schemas sent by the server: by schema id, and the schema id of each variable
+const arrowSchemas: Record<string, Uint8Array> = {};
+const arrowSchemaIds: Record<string, string> = {};
+
+export const getArrowSchemaId = (name?: string) => (name ? arrowSchemaIds[name] : undefined);
+
+const getArrowStream = (data: Record<string, unknown>, name?: string) => {
+    const batches = new Uint8Array(data.data as ArrayBuffer);
+    const schemaId = data.schemaId;
+    if (typeof schemaId !== "string") {
+        return batches;
+    }
+    // the record batches are sent without the schema when the front-end already has it
+    if (data.schema) {
+        arrowSchemas[schemaId] = new Uint8Array(data.schema as ArrayBuffer);
+        delete data.schema;
+    }
+    if (name) {
+        arrowSchemaIds[name] = schemaId;
+    }
+    const schema = arrowSchemas[schemaId];
+    if (!schema) {
+        throw new Error(`Unknown Arrow schema ${schemaId}`);
+    }
+    const stream = new Uint8Array(schema.byteLength + batches.byteLength);
+    stream.set(schema);
+    stream.set(batches, schema.byteLength);
+    return stream;
+};
+
+export const parseData = (data: Record<string, unknown>, name?: string): Promise<Record<string, unknown>> => {
     if (data?.format === DataFormat.APACHE_ARROW) {
         const multi = typeof data.multi === "boolean" && data.multi;
         const orient = data.orient;
         const pData = multi ? (data.data as Array<unknown>) : [data.data];
+        let stream: Uint8Array | undefined = undefined;
+        if (!multi && typeof data.schemaId === "string") {
+            try {
+                stream = getArrowStream(data, name);
+            } catch (e) {
+                console.warn("Cannot read Arrow data", e);
+                data.data = [];
+                return Promise.resolve(data);
+            }
+        }
         return new Promise((resolve, reject) => {
             import("apache-arrow").then(({tableFromIPC}) => {
                 const res = pData.map((d) => {
-                    const arrowData = tableFromIPC(new Uint8Array(d as ArrayBuffer));
+                    const arrowData = tableFromIPC(stream || new Uint8Array(d as ArrayBuffer));
                     const tableHeading = arrowData.schema.fields.map((f) => f.name);
                     if (orient === "records") {
                         const convertedData: Array<unknown> = [];
@@ -66,7 +120,12 @@ export const parseData = (data: Record<string, unknown>): Promise<Record<string,
                 resolve(data);
             }).catch(reject);
         });
-    } else if (typeof data?.dataExtraction === "boolean" && data.dataExtraction) {
+    }
+    if (typeof data?.columnar === "boolean" && data.columnar && data.orient === "records") {
+        // the server sends the values column by column
+        data.data = columnsToRecords(data.data as Record<string, unknown[]>);
+    }
+    if (typeof data?.dataExtraction === "boolean" && data.dataExtraction) {
         data = data.data as Record<string, unknown>;
     }
     return new Promise((resolve) => {
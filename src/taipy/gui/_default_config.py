@@ -48,6 +48,10 @@ default_config: Config = {
     "base_url": "/",
     "dark_mode": True,
     "dark_theme": None,
+    # memory, in bytes, shared by the caches of the data accessors
+    "data_cache_memory": 1024 * 1024 * 1024,
+    # number of threads that compute the aggregates and the chart traces of a data request (0: no threads)
+    "data_workers": 0,
     "debug": False,
     "extended_status": False,
     "favicon": None,
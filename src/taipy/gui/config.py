@@ -35,7 +35,9 @@ ConfigParameter = t.Literal[
     "base_url",
     "dark_mode",
     "dark_theme",
+    "data_cache_memory",
     "data_url_max_size",
+    "data_workers",
     "debug",
     "extended_status",
     "favicon",
@@ -106,7 +108,9 @@ Config = t.TypedDict(
         "base_url": t.Optional[str],
         "dark_mode": bool,
         "dark_theme": t.Optional[t.Dict[str, t.Any]],
+        "data_cache_memory": int,
         "data_url_max_size": t.Optional[int],
+        "data_workers": int,
         "debug": bool,
         "extended_status": bool,
         "favicon": t.Optional[str],
@@ -10,5 +10,6 @@
 # specific language governing permissions and limitations under the License.
 
 from .data_accessor import _DataAccessor
-from .decimator import LTTB, RDP, MinMaxDecimator, ScatterDecimator
-from .utils import Decimator
+from .decimator import LTTB, M4, RDP, MinMaxDecimator, ScatterDecimator
+from .sql_table import SqlTable
+from .utils import Decimator, vectorized
@@ -15,6 +15,7 @@ import pandas as pd
 
 from ..gui import Gui
 from ..utils import _MapDict
+from .data_cache import _DataCache, _get_data_version
 from .data_format import _DataFormat
 from .pandas_data_accessor import _PandasDataAccessor
 
@@ -26,7 +27,22 @@ class _ArrayDictDataAccessor(_PandasDataAccessor):
     def get_supported_classes() -> t.List[str]:
         return [t.__name__ for t in _ArrayDictDataAccessor.__types]  # type: ignore
 
+    def __init__(self) -> None:
+        super().__init__()
+        # DataFrames built from the values, so that they are not rebuilt for every request.
+        # Lists and dictionaries have no weak references: the entries are bound to the accessor
+        # and keyed by the identity of the value, so that the value is not kept alive. They are
+        # dropped when the value is invalidated, or when they are the least recently used ones.
+        self.__dataframe_cache = _DataCache()
+
     def __get_dataframe(self, value: t.Any) -> t.Union[t.List[pd.DataFrame], pd.DataFrame]:
+        version = _get_data_version(value)
+        dataframe = self.__dataframe_cache.get(self, version, id(value))
+        if dataframe is None:
+            dataframe = self.__dataframe_cache.set(self, version, id(value), self.__build_dataframe(value))
+        return dataframe
+
+    def __build_dataframe(self, value: t.Any) -> t.Union[t.List[pd.DataFrame], pd.DataFrame]:
         if isinstance(value, list):
             if not value or isinstance(value[0], (str, int, float, bool)):
                 return pd.DataFrame({"0": value})
@@ -45,7 +61,8 @@ class _ArrayDictDataAccessor(_PandasDataAccessor):
                 elif type_elt == _MapDict:
                     return [pd.DataFrame(v._dict) for v in value]
                 elif type_elt == pd.DataFrame:
-                    return value
+                    # a copy: the cached list must not be the value
+                    return list(value)
 
             elif len(types) == 2 and list in types and pd.DataFrame in types:
                 return [v if isinstance(v, pd.DataFrame) else pd.DataFrame({f"{i}/0": v}) for i, v in enumerate(value)]
@@ -53,6 +70,16 @@ class _ArrayDictDataAccessor(_PandasDataAccessor):
             return pd.DataFrame(value._dict)
         return pd.DataFrame(value)
 
+    def _invalidate(self, value: t.Any) -> None:
+        if isinstance(value, _ArrayDictDataAccessor.__types):  # type: ignore
+            # the caches of the built DataFrames are dropped when they are collected
+            self.__dataframe_cache.discard(lambda key: key == id(value))
+            if isinstance(value, (list, tuple)):
+                # the DataFrames of the list are used as they are
+                super()._invalidate(list(value))
+        else:
+            super()._invalidate(value)
+
     def get_col_types(self, var_name: str, value: t.Any) -> t.Union[None, t.Dict[str, str]]:  # type: ignore
         if isinstance(value, _ArrayDictDataAccessor.__types):  # type: ignore
             return super().get_col_types(var_name, self.__get_dataframe(value))
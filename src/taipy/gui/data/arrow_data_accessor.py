@@ -0,0 +1,482 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import typing as t
+from datetime import datetime, timezone
+from functools import reduce
+from importlib import util
+
+import numpy as np
+
+from .._warnings import _warn
+from ..gui import Gui
+from ..types import PropertyType
+from ..utils import _get_date_col_str_name
+from .column_stats import _get_histogram, _get_stats_request, _get_top_positions
+from .columnar import _columns_to_records
+from .data_accessor import _DataAccessor
+from .data_format import _DataFormat
+from .filters import _ALL_COLUMNS, _CONTAINS, _STARTS_WITH, _TEXT_ACTIONS
+from .utils import _get_page_range
+
+_has_arrow_module = False
+if util.find_spec("pyarrow"):
+    _has_arrow_module = True
+    import pyarrow as pa
+    import pyarrow.compute as pc
+
+_has_polars_module = False
+if _has_arrow_module and util.find_spec("polars"):
+    _has_polars_module = True
+    import polars as pl
+
+
+_COMPARISONS: t.Dict[str, str] = {
+    "==": "equal",
+    "!=": "not_equal",
+    "<": "less",
+    "<=": "less_equal",
+    ">": "greater",
+    ">=": "greater_equal",
+}
+
+
+def _get_arrow_filter(get_column: t.Callable[[str], t.Any], schema: "pa.Schema", filter: t.Dict[str, t.Any]) -> t.Any:
+    """Return the Boolean mask of the rows that match a table filter.
+
+    *get_column* returns a column of *schema* from its name: an Arrow array, or a field
+    expression (`pyarrow.compute.field()`), in which case an expression is returned.<br/>
+    The semantics are the ones of the filters of the pandas data accessor.
+    """
+    action = filter.get("action")
+    value = filter.get("value")
+    col = filter.get("col")
+    if col == _ALL_COLUMNS:
+        if action not in _TEXT_ACTIONS:
+            raise ValueError(f"Invalid action '{action}' on all columns")
+        cols = filter.get("cols")
+        names = [
+            n
+            for n in (cols if isinstance(cols, list) else schema.names)
+            if n in schema.names
+            and (pa.types.is_string(schema.field(n).type) or pa.types.is_large_string(schema.field(n).type))
+        ]
+        if not names:
+            raise ValueError("No text column to search")
+        return reduce(pc.or_kleene, [_get_arrow_filter(get_column, schema, {**filter, "col": n}) for n in names])
+    column = get_column(str(col))
+    data_type = schema.field(str(col)).type
+    if action in _TEXT_ACTIONS and not isinstance(value, str):
+        raise ValueError(f"Cannot filter with '{action}' on non string value {value}")
+    if action == _CONTAINS:
+        mask = pc.match_substring(column, value, ignore_case=not filter.get("matchcase", True))
+    elif action == _STARTS_WITH:
+        mask = pc.starts_with(column, value, ignore_case=not filter.get("matchcase", True))
+    elif action in _COMPARISONS:
+        if isinstance(value, str) and (pa.types.is_timestamp(data_type) or pa.types.is_date(data_type)):
+            value = datetime.fromisoformat(value[:-1] if value.endswith("Z") else value)
+            if getattr(data_type, "tz", None) is not None and value.tzinfo is None:
+                value = value.replace(tzinfo=timezone.utc)
+            if pa.types.is_date(data_type):
+                column = column.cast(pa.timestamp("us"))
+        mask = getattr(pc, _COMPARISONS[action])(column, value)
+    else:
+        raise ValueError(f"Invalid filter action '{action}'")
+    # missing values only match "!="
+    return pc.coalesce(mask, action == "!=")
+
+
+class _ArrowDataAccessor(_DataAccessor):
+    """Data accessor for Apache Arrow tables and Polars DataFrames.
+
+    The data is processed with the Arrow compute functions: it is never converted to a
+    pandas DataFrame.
+    """
+
+    __types: t.Tuple[type, ...] = ((pa.Table,) if _has_arrow_module else ()) + (
+        (pl.DataFrame,) if _has_polars_module else ()
+    )
+
+    __INDEX_COL = "_tp_index"
+
+    # Arrow hash aggregation function of the table aggregate functions
+    __AGGREGATE_FUNCTIONS: t.Dict[str, str] = {
+        "count": "count",
+        "sum": "sum",
+        "mean": "mean",
+        "min": "min",
+        "max": "max",
+        "std": "stddev",
+        "first": "first",
+        "last": "last",
+    }
+
+    @staticmethod
+    def get_supported_classes() -> t.List[str]:
+        # qualified names: a Polars DataFrame is not a pandas DataFrame
+        return [f"{t.__module__}.{t.__qualname__}" for t in _ArrowDataAccessor.__types]  # type: ignore
+
+    @staticmethod
+    def __get_table(value: t.Any) -> "pa.Table":
+        if _has_polars_module and isinstance(value, pl.DataFrame):
+            return value.to_arrow()
+        return value
+
+    @staticmethod
+    def __get_type_name(data_type: "pa.DataType") -> str:
+        # the pandas name of the type, expected by the front-end
+        if pa.types.is_timestamp(data_type):
+            return f"datetime64[ns, {data_type.tz}]" if data_type.tz else "datetime64[ns]"
+        if pa.types.is_date(data_type):
+            return "datetime64[ns]"
+        if pa.types.is_boolean(data_type):
+            return "bool"
+        if pa.types.is_integer(data_type) or pa.types.is_floating(data_type):
+            return np.dtype(data_type.to_pandas_dtype()).name
+        return "object"
+
+    def get_col_types(self, var_name: str, value: t.Any) -> t.Union[None, t.Dict[str, str]]:  # type: ignore
+        if isinstance(value, _ArrowDataAccessor.__types):  # type: ignore
+            schema = _ArrowDataAccessor.__get_table(value).schema
+            return {f.name: _ArrowDataAccessor.__get_type_name(f.type) for f in schema}
+        return None
+
+    def __filter_rows(self, table: "pa.Table", filters: t.List[t.Dict[str, t.Any]]) -> t.Optional[np.ndarray]:
+        try:
+            mask = None
+            for fd in filters:
+                filter_mask = _get_arrow_filter(table.column, table.schema, fd)
+                mask = filter_mask if mask is None else pc.and_(mask, filter_mask)
+            return pc.indices_nonzero(mask).to_numpy()
+        except Exception as e:
+            _warn(f"Arrow table filtering: invalid filters {filters}", e)
+        return None
+
+    def __aggregate(
+        self, table: "pa.Table", rows: t.Optional[np.ndarray], aggregates: t.List[str], applies: t.Dict[str, t.Any]
+    ) -> "pa.Table":
+        aggregations: t.List[t.Tuple[t.Any, ...]] = []
+        for col, fn in applies.items():
+            if col in aggregates or col == _ArrowDataAccessor.__INDEX_COL:
+                continue
+            arrow_fn = _ArrowDataAccessor.__AGGREGATE_FUNCTIONS.get(fn) if isinstance(fn, str) else None
+            if arrow_fn is None:
+                raise ValueError(f"Aggregate function {fn} is not supported on Arrow tables.")
+            aggregations.append((col, arrow_fn, pc.VarianceOptions(ddof=1)) if fn == "std" else (col, arrow_fn))
+        # index of the first row of each group
+        aggregations.append((_ArrowDataAccessor.__INDEX_COL, "min"))
+        if rows is not None:
+            table = table.take(rows)
+        if _ArrowDataAccessor.__INDEX_COL not in table.column_names:
+            indexes = np.arange(table.num_rows) if rows is None else rows
+            table = table.append_column(_ArrowDataAccessor.__INDEX_COL, pa.array(indexes))
+        aggregated = table.group_by(aggregates, use_threads=False).aggregate(aggregations)
+        # aggregated columns are named '<column>_<function>'
+        names = {f"{a[0]}_{a[1]}": a[0] for a in aggregations}
+        aggregated = aggregated.rename_columns([names.get(c, c) for c in aggregated.column_names])
+        return aggregated.sort_by([(k, "ascending") for k in aggregates])
+
+    @staticmethod
+    def __get_sort_indexes(
+        table: "pa.Table", rows: t.Optional[np.ndarray], order_by: str, descending: bool
+    ) -> np.ndarray:
+        if order_by == _ArrowDataAccessor.__INDEX_COL and order_by not in table.column_names:
+            indexes = np.arange(table.num_rows) if rows is None else np.arange(len(rows))
+            return indexes[::-1] if descending else indexes
+        values = table.column(order_by)
+        if rows is not None:
+            values = values.take(rows)
+        # missing values are last in ascending order and first in descending order, as for pandas
+        return pc.array_sort_indices(
+            values,
+            order="descending" if descending else "ascending",
+            null_placement="at_start" if descending else "at_end",
+        ).to_numpy()
+
+    def __apply_user_function(
+        self,
+        gui: Gui,
+        table: "pa.Table",
+        rows: t.List[t.Dict[str, t.Any]],
+        column_name: t.Optional[str],
+        function_name: str,
+        prefix: str,
+    ) -> "pa.Table":
+        user_function = gui._get_user_function(function_name)
+        if not callable(user_function):
+            return table.append_column(function_name, pa.array([function_name] * table.num_rows))
+        values: t.List[str] = []
+        for row in rows:
+            args: t.List[t.Any] = []
+            if column_name:
+                args.append(row.get(column_name))
+            args.extend((row.get(_ArrowDataAccessor.__INDEX_COL), row))
+            if column_name:
+                args.append(column_name)
+            try:
+                values.append(str(gui._call_function_with_state(user_function, args)))
+            except Exception as e:
+                _warn(f"Exception raised when calling user function {function_name}()", e)
+                values.append("")
+        new_col_name = f"{prefix}{column_name}__{function_name}" if column_name else function_name
+        return table.append_column(new_col_name, pa.array(values, pa.string()))
+
+    @staticmethod
+    def __format_dates(table: "pa.Table", handle_nan: bool) -> "pa.Table":
+        # date columns are sent as ISO 8601 strings, in UTC
+        tz = Gui._get_timezone()
+        for name, data_type in zip(table.column_names, table.schema.types):
+            if not pa.types.is_timestamp(data_type) and not pa.types.is_date(data_type):
+                continue
+            column = table.column(name)
+            if pa.types.is_date(data_type):
+                column = column.cast(pa.timestamp("us"))
+            if column.type.tz is None:
+                column = pc.assume_timezone(column, tz, ambiguous="earliest", nonexistent="earliest")
+            column = pc.strftime(column.cast(pa.timestamp("us", tz="UTC"), safe=False), format="%Y-%m-%dT%H:%M:%SZ")
+            if handle_nan:
+                column = pc.fill_null(column, "NaT")
+            index = table.column_names.index(name)
+            table = table.remove_column(index).append_column(_get_date_col_str_name(table.column_names, name), column)
+        return table
+
+    @staticmethod
+    def __get_column_values(column: "pa.ChunkedArray") -> t.List[t.Any]:
+        if pa.types.is_floating(column.type):
+            column = pc.if_else(pc.is_nan(column), pa.scalar(None, column.type), column)
+        return column.to_pylist()
+
+    def __format_data(
+        self, table: "pa.Table", data_format: _DataFormat, orient: str, columnar: bool
+    ) -> t.Dict[str, t.Any]:
+        ret: t.Dict[str, t.Any] = {"format": str(data_format.value)}
+        if data_format == _DataFormat.APACHE_ARROW:
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, table.schema) as writer:
+                writer.write_table(table)
+            ret["data"] = sink.getvalue().to_pybytes()
+            ret["orient"] = orient
+        else:
+            columns = {
+                name: _ArrowDataAccessor.__get_column_values(column)
+                for name, column in zip(table.column_names, table.columns)
+            }
+            if columnar or orient == "list":
+                ret["data"] = columns
+                if orient != "list":
+                    ret["orient"] = orient
+                    ret["columnar"] = True
+            else:
+                ret["data"] = _columns_to_records(columns, table.num_rows)
+        return ret
+
+    @staticmethod
+    def __select_columns(table: "pa.Table", columns: t.List[str]) -> "pa.Table":
+        if not columns:
+            return table
+        return table.select([c for c in table.column_names if c in columns])
+
+    def __get_page(
+        self,
+        gui: Gui,
+        var_name: str,
+        table: "pa.Table",
+        columns: t.List[str],
+        payload: t.Dict[str, t.Any],
+        filters: t.Optional[t.List[t.Dict[str, t.Any]]],
+        ret_payload: t.Dict[str, t.Any],
+    ) -> "pa.Table":
+        # positions of the selected rows in table
+        rows = self.__filter_rows(table, filters) if filters else None
+        aggregates = payload.get("aggregates")
+        applies = payload.get("applies")
+        if isinstance(aggregates, list) and len(aggregates) and isinstance(applies, dict):
+            applies = {**applies, **{c: "first" for c in columns if c not in applies and c in table.column_names}}
+            try:
+                table = self.__aggregate(table, rows, aggregates, applies)
+                rows = None
+            except Exception as e:
+                _warn(f"Cannot aggregate {var_name} with groupby {aggregates} and aggregates {applies}.", e)
+        rowcount = table.num_rows if rows is None else len(rows)
+        start, end = _get_page_range(payload, rowcount)
+        order_by = payload.get("orderby")
+        if isinstance(order_by, str) and len(order_by):
+            try:
+                indexes = _ArrowDataAccessor.__get_sort_indexes(table, rows, order_by, payload.get("sort") == "desc")
+                rows = indexes if rows is None else rows[indexes]
+            except Exception as e:
+                _warn(f"Cannot sort {var_name} on columns {order_by}.", e)
+        if rows is None:
+            page = table.slice(start, max(0, end + 1 - start))
+            page_rows = np.arange(start, start + page.num_rows)
+        else:
+            page_rows = rows[start : end + 1]
+            page = table.take(page_rows)
+        if _ArrowDataAccessor.__INDEX_COL not in page.column_names:
+            page = page.append_column(_ArrowDataAccessor.__INDEX_COL, pa.array(page_rows))
+        page = _ArrowDataAccessor.__select_columns(page, columns)
+        styles = payload.get("styles")
+        tooltips = payload.get("tooltips")
+        if styles or tooltips:
+            records = page.to_pylist()
+            for k, v in (styles or {}).items():
+                page = self.__apply_user_function(gui, page, records, k if k in columns else None, v, "tps__")
+            for k, v in (tooltips or {}).items():
+                if callable(gui._get_user_function(v)):
+                    page = self.__apply_user_function(gui, page, records, k if k in columns else None, v, "tpt__")
+        ret_payload["rowcount"] = rowcount
+        ret_payload["start"] = start
+        return _ArrowDataAccessor.__format_dates(page, bool(payload.get("handlenan", False)))
+
+    @staticmethod
+    def __get_column_numpy(table: "pa.Table", column_name: t.Optional[str]) -> np.ndarray:
+        if not column_name:
+            return np.arange(table.num_rows)
+        column = table.column(column_name)
+        if pa.types.is_timestamp(column.type) or pa.types.is_date(column.type):
+            column = column.cast(pa.timestamp("us"))
+        return column.to_numpy()
+
+    def __decimate(
+        self, gui: Gui, var_name: str, table: "pa.Table", decimator_payload: t.Dict[str, t.Any]
+    ) -> "pa.Table":
+        nb_rows_max = decimator_payload.get("width")
+        for decimator_pl in decimator_payload.get("decimators", []):
+            decimator = decimator_pl.get("decimator")
+            decimator_instance = (
+                gui._get_user_instance(decimator, PropertyType.decimator.value) if decimator is not None else None
+            )
+            if not isinstance(decimator_instance, PropertyType.decimator.value):
+                continue
+            x_column, y_column, z_column = (
+                decimator_pl.get("xAxis", ""),
+                decimator_pl.get("yAxis", ""),
+                decimator_pl.get("zAxis", ""),
+            )
+            chart_mode = decimator_pl.get("chartMode", "")
+            try:
+                if (
+                    decimator_instance._zoom
+                    and not decimator_instance._FILTERS_RANGE
+                    and "relayoutData" in decimator_payload
+                    and not z_column
+                ):
+                    table = self.__relayout(
+                        table, x_column, y_column, chart_mode, decimator_payload.get("relayoutData", {})
+                    )
+                if nb_rows_max and decimator_instance._is_applicable(table, nb_rows_max, chart_mode):
+                    points = np.column_stack(
+                        [
+                            _ArrowDataAccessor.__get_column_numpy(table, c)
+                            for c in ((x_column, y_column, z_column) if z_column else (x_column, y_column))
+                        ]
+                    )
+                    table = table.filter(pa.array(decimator_instance.decimate(points, decimator_payload)))
+                    gui._call_on_change(f"{var_name}.{decimator}.nb_rows", table.num_rows)
+            except Exception as e:
+                _warn(f"Limit rows error with {decimator} for Arrow table", e)
+        return table
+
+    @staticmethod
+    def __relayout(
+        table: "pa.Table", x_column: str, y_column: str, chart_mode: str, relayout_data: t.Dict[str, t.Any]
+    ) -> "pa.Table":
+        # same as _df_relayout()
+        x0 = relayout_data.get("xaxis.range[0]")
+        x1 = relayout_data.get("xaxis.range[1]")
+        y0 = relayout_data.get("yaxis.range[0]")
+        y1 = relayout_data.get("yaxis.range[1]")
+        if chart_mode not in ["lines+markers", "markers"] or x0 is None or x1 is None or y0 is None or y1 is None:
+            return table
+        x_values = _ArrowDataAccessor.__get_column_numpy(table, x_column)
+        if np.issubdtype(x_values.dtype, np.datetime64):
+            x0, x1 = np.datetime64(x0), np.datetime64(x1)
+        mask = (x_values > x0) & (x_values < x1)
+        if chart_mode == "markers":
+            y_values = _ArrowDataAccessor.__get_column_numpy(table, y_column)
+            mask &= (y_values > y0) & (y_values < y1)
+        return table.filter(pa.array(mask))
+
+    @staticmethod
+    def __get_column_stats(column: "pa.ChunkedArray", top: int, bins: int) -> t.Dict[str, t.Any]:
+        # the statistics returned by _get_column_stats, computed with pyarrow
+        # NaN values are missing values, as they are for pandas
+        data_type = column.type
+        is_number = pa.types.is_integer(data_type) or pa.types.is_floating(data_type)
+        nans = (pc.sum(pc.is_nan(column)).as_py() or 0) if pa.types.is_floating(data_type) else 0
+        stats: t.Dict[str, t.Any] = {"count": pc.count(column).as_py() - nans, "nulls": column.null_count + nans}
+        value_counts = pc.value_counts(column)
+        kept = pc.invert(pc.is_null(value_counts.field("values"), nan_is_null=True))
+        values = value_counts.field("values").filter(kept)
+        counts = value_counts.field("counts").filter(kept).to_numpy()
+        stats["distinct"] = len(values)
+        if top > 0:
+            selected = _get_top_positions(counts, top)
+            stats["values"] = [[v, c] for v, c in zip(values.take(selected).to_pylist(), counts[selected].tolist())]
+        if len(values) == 0:
+            return stats
+        if is_number or pa.types.is_timestamp(data_type):
+            min_max = pc.min_max(column)
+            stats["min"] = min_max["min"].as_py()
+            stats["max"] = min_max["max"].as_py()
+        if is_number:
+            numbers = values.to_numpy(zero_copy_only=False).astype(float)
+            if (histogram := _get_histogram(numbers, counts, bins)) is not None:
+                stats["histogram"] = histogram
+        return stats
+
+    @staticmethod
+    def __get_stats(
+        var_name: str, table: "pa.Table", columns: t.List[t.Any], top: int, bins: int
+    ) -> t.Dict[str, t.Any]:
+        stats: t.Dict[str, t.Any] = {}
+        for col in columns:
+            try:
+                stats[col] = _ArrowDataAccessor.__get_column_stats(table.column(str(col)), top, bins)
+            except Exception as e:
+                _warn(f"Cannot compute the statistics of column {col} of {var_name}.", e)
+        return stats
+
+    def get_data(
+        self, gui: Gui, var_name: str, value: t.Any, payload: t.Dict[str, t.Any], data_format: _DataFormat
+    ) -> t.Dict[str, t.Any]:
+        if not isinstance(value, _ArrowDataAccessor.__types):  # type: ignore
+            return {}
+        table = _ArrowDataAccessor.__get_table(value)
+        columns = list(payload.get("columns", []))
+        ret_payload: t.Dict[str, t.Any] = {"pagekey": payload.get("pagekey", "unknown page")}
+        filters = payload.get("filters")
+        if not isinstance(filters, list) or len(filters) == 0:
+            filters = None
+        if (stats_request := _get_stats_request(payload)) is not None:
+            if filters and (rows := self.__filter_rows(table, filters)) is not None:
+                table = table.take(rows)
+            ret_payload["value"] = {"stats": _ArrowDataAccessor.__get_stats(var_name, table, *stats_request)}
+            return ret_payload
+        if not payload.get("alldata", False):
+            if columns and _ArrowDataAccessor.__INDEX_COL not in columns:
+                columns.append(_ArrowDataAccessor.__INDEX_COL)
+            if (inf := payload.get("infinite")) is not None:
+                ret_payload["infinite"] = inf
+            page_info: t.Dict[str, t.Any] = {}
+            page = self.__get_page(gui, var_name, table, columns, payload, filters, page_info)
+            dictret = self.__format_data(page, data_format, "records", bool(payload.get("columnar", False)))
+            dictret.update(page_info)
+        else:
+            ret_payload["alldata"] = True
+            if filters and (rows := self.__filter_rows(table, filters)) is not None:
+                table = table.take(rows)
+            table = self.__decimate(gui, var_name, table, payload.get("decimatorPayload", {}))
+            table = _ArrowDataAccessor.__format_dates(_ArrowDataAccessor.__select_columns(table, columns), False)
+            dictret = self.__format_data(table, data_format, "list", False)
+            dictret["dataExtraction"] = True
+        ret_payload["value"] = dictret
+        return ret_payload
@@ -0,0 +1,110 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+# default number of most frequent values
+_STATS_TOP = 10
+# default number of histogram bins
+_STATS_BINS = 10
+
+
+def _get_stats_request(payload: t.Dict[str, t.Any]) -> t.Optional[t.Tuple[t.List[t.Any], int, int]]:
+    """Return the columns, number of most frequent values and number of histogram bins of a
+    statistics request, or None if *payload* is not one.
+
+    A statistics request is a data request which payload holds:
+
+    - "stats": the list of the names of the columns to compute the statistics of.
+    - "top" (optional): the number of most frequent values to return.
+    - "bins" (optional): the number of bins of the histograms.
+
+    Table filters ("filters") are applied before the statistics are computed.
+    """
+    columns = payload.get("stats")
+    if not isinstance(columns, list) or not columns:
+        return None
+    top = payload.get("top")
+    bins = payload.get("bins")
+    return (
+        columns,
+        top if isinstance(top, int) and top >= 0 else _STATS_TOP,
+        bins if isinstance(bins, int) and bins > 0 else _STATS_BINS,
+    )
+
+
+def _to_python(value: t.Any) -> t.Any:
+    return value.item() if isinstance(value, np.generic) else value
+
+
+def _get_top_positions(counts: np.ndarray, top: int) -> np.ndarray:
+    """Return the positions of the *top* largest *counts*, largest first then in position order."""
+    # the values which count is at least the top-th largest one
+    selected = (
+        np.flatnonzero(counts >= np.partition(counts, len(counts) - top)[len(counts) - top])
+        if len(counts) > top
+        else np.arange(len(counts))
+    )
+    return selected[np.lexsort((selected, -counts[selected]))][:top]
+
+
+def _get_histogram(numbers: np.ndarray, counts: np.ndarray, bins: int) -> t.Optional[t.Dict[str, t.List[t.Any]]]:
+    """Return the histogram of the finite *numbers*, each occurring *counts* times, or None if there
+    are none."""
+    finite = np.isfinite(numbers)
+    if not finite.any():
+        return None
+    hist, edges = np.histogram(numbers[finite], bins=bins, weights=counts[finite])
+    return {"counts": hist.astype(np.int64).tolist(), "edges": edges.tolist()}
+
+
+def _get_column_stats(
+    values: pd.Series, counts: np.ndarray, top: int = _STATS_TOP, bins: int = _STATS_BINS
+) -> t.Dict[str, t.Any]:
+    """Compute the statistics of a column from its distinct values and their number of occurrences.
+
+    The result holds:
+
+    - "count": the number of values that are not missing.
+    - "nulls": the number of missing values.
+    - "distinct": the number of distinct values that are not missing.
+    - "values": the *top* most frequent values and their number of occurrences, as
+      [value, count] pairs, most frequent first.
+    - "min" and "max": the smallest and largest values of numerical and date columns.
+    - "histogram": for numerical columns, the number of finite values ("counts") in *bins*
+      bins of equal width, and the *bins* + 1 edges of these bins ("edges").
+    """
+    values = values.reset_index(drop=True)
+    counts = np.asarray(counts, dtype=np.int64)
+    missing = values.isna().to_numpy()
+    nulls = int(counts[missing].sum())
+    # categories may not occur
+    kept = ~missing & (counts > 0)
+    values = values[kept]
+    counts = counts[kept]
+    stats: t.Dict[str, t.Any] = {"count": int(counts.sum()), "nulls": nulls, "distinct": len(values)}
+    if top > 0:
+        selected = _get_top_positions(counts, top)
+        stats["values"] = [
+            [_to_python(v), c] for v, c in zip(values.iloc[selected].tolist(), counts[selected].tolist())
+        ]
+    if len(values) == 0:
+        return stats
+    is_number = pd.api.types.is_numeric_dtype(values.dtype) and not pd.api.types.is_bool_dtype(values.dtype)
+    if is_number or pd.api.types.is_datetime64_any_dtype(values.dtype):
+        stats["min"] = _to_python(values.min())
+        stats["max"] = _to_python(values.max())
+    if is_number and (histogram := _get_histogram(values.to_numpy(dtype=float), counts, bins)) is not None:
+        stats["histogram"] = histogram
+    return stats
@@ -0,0 +1,60 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+
+def _get_column_values(column: pd.Series) -> t.List[t.Any]:
+    """Return the values of a column as a list that the JSON encoder can serialize.
+
+    The conversion is done by NumPy for the whole column. Missing values (NaN, NaT,
+    None or pd.NA) are set to None, without going through a replacement pass on the data.
+    """
+    dtype = column.dtype
+    if isinstance(dtype, np.dtype) and dtype.kind in "iub":
+        return column.to_numpy().tolist()
+    if isinstance(dtype, np.dtype) and dtype.kind == "f":
+        values = column.to_numpy()
+        missing = np.isnan(values)
+    else:
+        values = column.to_numpy(dtype=object)
+        missing = pd.isna(values)
+    res = values.tolist()
+    for i in np.flatnonzero(missing).tolist():
+        res[i] = None
+    return res
+
+
+def _to_columns(dataframe: pd.DataFrame) -> t.Dict[t.Any, t.List[t.Any]]:
+    """Convert a DataFrame to a dictionary that holds the list of values of each column.
+
+    This is the layout of `DataFrame.to_dict(orient="list")`.
+    """
+    return {col: _get_column_values(dataframe.iloc[:, i]) for i, col in enumerate(dataframe.columns)}
+
+
+def _to_records(dataframe: pd.DataFrame) -> t.List[t.Dict[t.Any, t.Any]]:
+    """Convert a DataFrame to a list that holds a dictionary for each row.
+
+    This is the layout of `DataFrame.to_dict(orient="records")`.
+    """
+    return _columns_to_records(_to_columns(dataframe), len(dataframe))
+
+
+def _columns_to_records(columns: t.Dict[t.Any, t.List[t.Any]], nb_rows: int) -> t.List[t.Dict[t.Any, t.Any]]:
+    """Build the records layout from the list of values of each column."""
+    if not columns:
+        return [{} for _ in range(nb_rows)]
+    names = list(columns.keys())
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
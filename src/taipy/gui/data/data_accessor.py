@@ -36,6 +36,31 @@ class _DataAccessor(ABC):
     def get_col_types(self, var_name: str, value: t.Any) -> t.Dict[str, str]:
         pass
 
+    def _invalidate(self, value: t.Any) -> None:
+        # drop whatever was cached for value
+        pass
+
+    def _append_rows(self, value: t.Any, rows: t.Any) -> t.Any:
+        # value with rows added at its end, None if not supported
+        return None
+
+    def _get_data_delta(
+        self,
+        guiApp: t.Any,
+        var_name: str,
+        value: t.Any,
+        payload: t.Dict[str, t.Any],
+        start: int,
+        data_format: _DataFormat,
+    ) -> t.Optional[t.Dict[str, t.Any]]:
+        # the update of the data returned for payload, when the rows of value after start were appended,
+        # None if the data must be requested again
+        return None
+
+    def _drop_client(self, client_id: str) -> None:
+        # drop whatever was cached for client_id
+        pass
+
 
 class _InvalidDataAccessor(_DataAccessor):
     @staticmethod
@@ -60,12 +85,19 @@ class _DataAccessors(object):
         self.__data_format = _DataFormat.JSON
 
         from .array_dict_data_accessor import _ArrayDictDataAccessor
+        from .arrow_data_accessor import _ArrowDataAccessor, _has_arrow_module
+        from .dataset_data_accessor import _ArrowDatasetDataAccessor
         from .numpy_data_accessor import _NumpyDataAccessor
         from .pandas_data_accessor import _PandasDataAccessor
+        from .sql_data_accessor import _SqlDataAccessor
 
         self._register(_PandasDataAccessor)
         self._register(_ArrayDictDataAccessor)
         self._register(_NumpyDataAccessor)
+        self._register(_SqlDataAccessor)
+        if _has_arrow_module:
+            self._register(_ArrowDataAccessor)
+            self._register(_ArrowDatasetDataAccessor)
 
     def _register(self, cls: t.Type[_DataAccessor]) -> None:
         if not inspect.isclass(cls):
@@ -90,9 +122,16 @@ class _DataAccessors(object):
                 for name in names:
                     self.__access_4_type[name] = inst  # type: ignore
 
+    def __get_accessor(self, value: t.Any) -> t.Optional[_DataAccessor]:
+        # accessors can register the qualified name of the types that share their name with another
+        value_type = type(value)
+        return self.__access_4_type.get(
+            f"{value_type.__module__}.{value_type.__qualname__}"
+        ) or self.__access_4_type.get(value_type.__name__)
+
     def __get_instance(self, value: _TaipyData) -> _DataAccessor:  # type: ignore
         value = value.get()
-        access = self.__access_4_type.get(type(value).__name__)
+        access = self.__get_accessor(value)
         if access is None:
             _warn(f"Can't find Data Accessor for type {type(value).__name__}.")
             return self.__invalid_data_accessor
@@ -106,5 +145,24 @@ class _DataAccessors(object):
     def _get_col_types(self, var_name: str, value: _TaipyData) -> t.Dict[str, str]:
         return self.__get_instance(value).get_col_types(var_name, value.get())
 
+    def _append_rows(self, value: t.Any, rows: t.Any) -> t.Any:
+        access = self.__get_accessor(value)
+        return access._append_rows(value, rows) if access is not None else None
+
+    def _get_data_delta(
+        self, guiApp: t.Any, var_name: str, value: _TaipyData, payload: t.Dict[str, t.Any], start: int
+    ) -> t.Optional[t.Dict[str, t.Any]]:
+        return self.__get_instance(value)._get_data_delta(
+            guiApp, var_name, value.get(), payload, start, self.__data_format
+        )
+
+    def _invalidate(self, value: _TaipyData) -> None:
+        if access := self.__get_accessor(value.get()):
+            access._invalidate(value.get())
+
+    def _drop_client(self, client_id: str) -> None:
+        for access in set(self.__access_4_type.values()):
+            access._drop_client(client_id)
+
     def _set_data_format(self, data_format: _DataFormat):
         self.__data_format = data_format
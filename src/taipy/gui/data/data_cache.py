@@ -0,0 +1,252 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import sys
+import typing as t
+import weakref
+from collections import OrderedDict
+from itertools import count
+from threading import Lock, RLock
+
+import numpy as np
+import pandas as pd
+
+from ..utils import _MapDict
+
+# Number of rows hashed to build the version of a DataFrame
+_VERSION_SAMPLE_SIZE = 64
+
+
+def _get_data_version(value: t.Any) -> t.Optional[t.Hashable]:
+    """Return a cheap fingerprint of a data set, or None if it cannot be computed.
+
+    The fingerprint holds the shape, the column names and types, and a hash of a few
+    evenly spaced rows. Lists, tuples and dictionaries are sampled the same way.<br/>
+    It is not a content hash: it is used, together with the data identity, to detect
+    that a data set was modified since a result was cached.
+    """
+    try:
+        if isinstance(value, _MapDict):
+            value = value._dict
+        if isinstance(value, dict):
+            entries = tuple((k, _get_item_version(v)) for k, v in value.items())
+            return None if any(v is None for _, v in entries) else ("dict", entries)
+        if isinstance(value, (list, tuple)):
+            items = value[:: max(1, len(value) // _VERSION_SAMPLE_SIZE)]
+            versions = tuple(_get_item_version(v) for v in (*items, *value[-1:]))
+            return None if any(v is None for v in versions) else (type(value).__name__, len(value), versions)
+        if isinstance(value, pd.DataFrame):
+            nb_rows = len(value)
+            sample = value.iloc[:: max(1, nb_rows // _VERSION_SAMPLE_SIZE)]
+            return (
+                nb_rows,
+                tuple(value.columns),
+                tuple(str(d) for d in value.dtypes),
+                int(pd.util.hash_pandas_object(sample, index=True).sum()),
+                int(pd.util.hash_pandas_object(value.tail(1), index=True).sum()),
+            )
+        if isinstance(value, np.ndarray):
+            flat = value.reshape(-1) if value.flags.c_contiguous else value.ravel()
+            sample = flat[:: max(1, flat.size // _VERSION_SAMPLE_SIZE)]
+            return (value.shape, str(value.dtype), sample.tobytes(), flat[-1:].tobytes())
+    except Exception:
+        pass
+    return None
+
+
+def _get_item_version(value: t.Any) -> t.Optional[t.Hashable]:
+    if isinstance(value, (list, tuple, dict, _MapDict, pd.DataFrame, np.ndarray)):
+        return _get_data_version(value)
+    return repr(value)
+
+
+def _get_size(value: t.Any) -> int:
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, (tuple, list)):
+        return sum(_get_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+class _DataCache(object):
+    """LRU cache for values computed from a data set.
+
+    Entries are bound to the identity and the version (see `_get_data_version()`) of the
+    data set they were computed from. They are dropped when that data set is garbage
+    collected or invalidated, when there are more than *max_entries* of them, or when
+    their total size exceeds *max_memory* bytes.<br/>
+    All the caches of the process share a memory budget (see `_DataCache._set_memory_budget()`):
+    when the entries of all the caches exceed that budget, the least recently used entries
+    are dropped, whatever their cache.
+    """
+
+    __memory_budget = 1024 * 1024 * 1024
+    __total_memory = 0
+    __caches: "weakref.WeakSet[_DataCache]" = weakref.WeakSet()
+    # reentrant: a cache can be collected while the lock is held
+    __shared_lock = RLock()
+    # orders the entries of all the caches by their last use
+    __clock = count()
+
+    def __init__(self, max_entries: int = 64, max_memory: int = 256 * 1024 * 1024) -> None:
+        self.__max_entries = max_entries
+        self.__max_memory = max_memory
+        self.__entries: t.OrderedDict[t.Tuple[int, t.Hashable, t.Hashable], t.Tuple[t.Any, int, int]] = OrderedDict()
+        self.__sources: t.Dict[int, t.Any] = {}
+        self.__dead_sources: t.List[int] = []
+        self.__memory = 0
+        self.__lock = Lock()
+        with _DataCache.__shared_lock:
+            _DataCache.__caches.add(self)
+
+    def __del__(self):
+        self.__add_total_memory(-self.__memory)
+
+    @staticmethod
+    def _set_memory_budget(size: int) -> None:
+        """Set the size, in bytes, of the memory shared by all the caches."""
+        _DataCache.__memory_budget = max(0, int(size))
+        _DataCache.__trim_caches()
+
+    @staticmethod
+    def _get_memory_budget() -> int:
+        return _DataCache.__memory_budget
+
+    @staticmethod
+    def __add_total_memory(size: int):
+        if size:
+            with _DataCache.__shared_lock:
+                _DataCache.__total_memory += size
+
+    @staticmethod
+    def __trim_caches():
+        # drop the least recently used entries of all the caches until they fit in the budget
+        while _DataCache.__total_memory > _DataCache.__memory_budget:
+            with _DataCache.__shared_lock:
+                caches = list(_DataCache.__caches)
+            uses = [(use, c) for c in caches if (use := c.__get_oldest_use()) is not None]
+            if not uses:
+                break
+            min(uses, key=lambda u: u[0])[1].__pop_oldest()
+
+    def __get_oldest_use(self) -> t.Optional[int]:
+        with self.__lock:
+            return next(iter(self.__entries.values()))[2] if self.__entries else None
+
+    def __pop_oldest(self):
+        with self.__lock:
+            if self.__entries:
+                self.__pop_entry(next(iter(self.__entries)))
+
+    @property
+    def max_memory(self) -> int:
+        """The size, in bytes, above which a value is not cached."""
+        return min(self.__max_memory, _DataCache.__memory_budget)
+
+    def __on_source_collected(self, source_id: int):
+        # called by the garbage collector: defer the actual cleaning
+        self.__dead_sources.append(source_id)
+
+    def __purge_dead_sources(self):
+        while self.__dead_sources:
+            self.__drop_source(self.__dead_sources.pop())
+
+    def __drop_source(self, source_id: int):
+        self.__sources.pop(source_id, None)
+        size = sum(self.__entries.pop(k)[1] for k in [k for k in self.__entries if k[0] == source_id])
+        self.__memory -= size
+        _DataCache.__add_total_memory(-size)
+
+    def __is_alive(self, source: t.Any) -> bool:
+        ref = self.__sources.get(id(source))
+        return ref is not None and ref() is source
+
+    def get(self, source: t.Any, version: t.Optional[t.Hashable], key: t.Hashable) -> t.Any:
+        if version is None:
+            return None
+        with self.__lock:
+            self.__purge_dead_sources()
+            if not self.__is_alive(source):
+                return None
+            entry_key = (id(source), version, key)
+            entry = self.__entries.get(entry_key)
+            if entry is None:
+                return None
+            self.__entries[entry_key] = (entry[0], entry[1], next(_DataCache.__clock))
+            self.__entries.move_to_end(entry_key)
+            return entry[0]
+
+    def set(
+        self,
+        source: t.Any,
+        version: t.Optional[t.Hashable],
+        key: t.Hashable,
+        value: t.Any,
+        size: t.Optional[int] = None,
+    ) -> t.Any:
+        if version is None:
+            return value
+        size = _get_size(value) if size is None else size
+        if size > self.max_memory:
+            return value
+        with self.__lock:
+            self.__purge_dead_sources()
+            source_id = id(source)
+            if not self.__is_alive(source):
+                self.__drop_source(source_id)
+                try:
+                    self.__sources[source_id] = weakref.ref(source, lambda _: self.__on_source_collected(source_id))
+                except TypeError:
+                    # no weak reference support: the source is kept alive as long as it has entries
+                    self.__sources[source_id] = lambda: source
+            entry_key = (source_id, version, key)
+            if entry_key in self.__entries:
+                self.__pop_entry(entry_key, False)
+            self.__entries[entry_key] = (value, size, next(_DataCache.__clock))
+            self.__memory += size
+            _DataCache.__add_total_memory(size)
+            while self.__entries and (len(self.__entries) > self.__max_entries or self.__memory > self.__max_memory):
+                self.__pop_entry(next(iter(self.__entries)))
+        _DataCache.__trim_caches()
+        return value
+
+    def __pop_entry(self, entry_key: t.Tuple[int, t.Hashable, t.Hashable], release: bool = True):
+        size = self.__entries.pop(entry_key)[1]
+        self.__memory -= size
+        _DataCache.__add_total_memory(-size)
+        if not release:
+            return
+        source_id = entry_key[0]
+        if not any(k[0] == source_id for k in self.__entries):
+            # release the source
+            self.__sources.pop(source_id, None)
+
+    def invalidate(self, source: t.Any) -> None:
+        with self.__lock:
+            self.__purge_dead_sources()
+            if self.__is_alive(source):
+                self.__drop_source(id(source))
+
+    def discard(self, predicate: t.Callable[[t.Hashable], bool]) -> None:
+        """Drop the entries which key verifies *predicate*."""
+        with self.__lock:
+            for k in [k for k in self.__entries if predicate(k[2])]:
+                self.__pop_entry(k)
+
+    def clear(self) -> None:
+        with self.__lock:
+            self.__entries.clear()
+            self.__sources.clear()
+            self.__dead_sources.clear()
+            _DataCache.__add_total_memory(-self.__memory)
+            self.__memory = 0
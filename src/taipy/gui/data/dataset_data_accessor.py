@@ -0,0 +1,295 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import typing as t
+from functools import reduce
+
+import numpy as np
+
+from .._warnings import _warn
+from ..gui import Gui
+from .arrow_data_accessor import _ArrowDataAccessor, _get_arrow_filter, _has_arrow_module
+from .column_stats import _get_stats_request
+from .data_cache import _DataCache
+from .data_format import _DataFormat
+from .filters import _ALL_COLUMNS, _get_filter_key
+from .utils import _get_page_range
+
+if _has_arrow_module:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+
+# A piece of a dataset: a fragment, the identifier of a Parquet row group (or None if the whole
+# fragment is read) and the number of rows
+_Piece = t.Tuple[t.Any, t.Optional[int], int]
+
+
+class _ArrowDatasetDataAccessor(_ArrowDataAccessor):
+    """Data accessor for file-backed Arrow datasets.
+
+    A `pyarrow.dataset.FileSystemDataset` (as returned by `pyarrow.dataset.dataset()`) is read
+    piece by piece, a piece being a Parquet row group or a file of another format: a request only
+    reads the columns and pieces that it needs. The Parquet row groups that cannot hold rows
+    matching the filters are skipped using their statistics.<br/>
+    Feather and Arrow IPC files are memory-mapped if the dataset file system does so
+    (`pyarrow.fs.LocalFileSystem(use_mmap=True)`).
+
+    The rows that are read are processed by the `_ArrowDataAccessor`.
+    """
+
+    __types: t.Tuple[type, ...] = (ds.FileSystemDataset,) if _has_arrow_module else ()
+
+    __INDEX_COL = "_tp_index"
+
+    def __init__(self) -> None:
+        super().__init__()
+        # pieces of the datasets
+        self.__pieces_cache = _DataCache()
+        # positions of the filtered and sorted rows of the datasets
+        self.__rows_cache = _DataCache()
+
+    @staticmethod
+    def get_supported_classes() -> t.List[str]:
+        return [f"{t.__module__}.{t.__qualname__}" for t in _ArrowDatasetDataAccessor.__types]  # type: ignore
+
+    @staticmethod
+    def __get_version(dataset: "ds.FileSystemDataset") -> t.Optional[t.Hashable]:
+        try:
+            return tuple((f.path, f.mtime_ns, f.size) for f in dataset.filesystem.get_file_info(dataset.files))
+        except Exception:
+            return None
+
+    def __get_pieces(
+        self, dataset: "ds.FileSystemDataset", version: t.Optional[t.Hashable]
+    ) -> t.Tuple[t.List[_Piece], np.ndarray]:
+        # the pieces and the position of their first row, with the total number of rows as last item
+        pieces_offsets = self.__pieces_cache.get(dataset, version, None)
+        if pieces_offsets is None:
+            pieces: t.List[_Piece] = []
+            for fragment in dataset.get_fragments():
+                if isinstance(fragment, ds.ParquetFileFragment):
+                    fragment.ensure_complete_metadata()
+                    pieces.extend((fragment, rg.id, rg.num_rows) for rg in fragment.row_groups)
+                else:
+                    pieces.append((fragment, None, fragment.count_rows()))
+            offsets = np.cumsum([0] + [p[2] for p in pieces])
+            pieces_offsets = self.__pieces_cache.set(dataset, version, None, (pieces, offsets), 0)
+        return pieces_offsets
+
+    @staticmethod
+    def __read_piece(piece: _Piece, schema: "pa.Schema", start: int, stop: int) -> "pa.Table":
+        fragment, row_group, _ = piece
+        if row_group is not None:
+            return fragment.subset(row_group_ids=[row_group]).to_table(columns=schema.names).slice(start, stop - start)
+        # stop reading after the last needed batch
+        batches = []
+        offset = 0
+        for batch in fragment.to_batches(columns=schema.names):
+            if offset >= stop:
+                break
+            if offset + batch.num_rows > start:
+                first = max(start, offset)
+                batches.append(batch.slice(first - offset, min(stop, offset + batch.num_rows) - first))
+            offset += batch.num_rows
+        return pa.Table.from_batches(batches, schema=schema)
+
+    @staticmethod
+    def __take(
+        pieces: t.List[_Piece], offsets: np.ndarray, schema: "pa.Schema", rows: t.Optional[np.ndarray]
+    ) -> "pa.Table":
+        if rows is None:
+            tables = [_ArrowDatasetDataAccessor.__read_piece(p, schema, 0, p[2]) for p in pieces]
+            return pa.concat_tables(tables) if tables else schema.empty_table()
+        piece_ids = np.searchsorted(offsets, rows, side="right") - 1
+        # read the pieces in order, then restore the order of rows
+        order = np.argsort(piece_ids, kind="stable")
+        tables = []
+        for piece_id in np.unique(piece_ids):
+            local_rows = rows[order][piece_ids[order] == piece_id] - offsets[piece_id]
+            first = int(local_rows.min())
+            table = _ArrowDatasetDataAccessor.__read_piece(pieces[piece_id], schema, first, int(local_rows.max()) + 1)
+            tables.append(table.take(pa.array(local_rows - first)))
+        if not tables:
+            return schema.empty_table()
+        return pa.concat_tables(tables).take(pa.array(np.argsort(order)))
+
+    def __filter_rows(
+        self,
+        dataset: "ds.FileSystemDataset",
+        pieces: t.List[_Piece],
+        offsets: np.ndarray,
+        filters: t.List[t.Dict[str, t.Any]],
+    ) -> np.ndarray:
+        filter_schema = _ArrowDatasetDataAccessor.__get_schema(
+            dataset, _ArrowDatasetDataAccessor.__get_filter_columns(dataset, filters)
+        )
+        expression = _ArrowDatasetDataAccessor.__get_filter_expression(dataset, filters)
+        # row groups that can hold matching rows, from their statistics
+        row_groups: t.Dict[int, t.Set[int]] = {}
+        rows: t.List[np.ndarray] = []
+        for i, piece in enumerate(pieces):
+            fragment, row_group, num_rows = piece
+            if row_group is not None:
+                if (kept := row_groups.get(id(fragment))) is None:
+                    kept = {rg.id for rg in fragment.subset(filter=expression).row_groups}
+                    row_groups[id(fragment)] = kept
+                if row_group not in kept:
+                    continue
+            table = _ArrowDatasetDataAccessor.__read_piece(piece, filter_schema, 0, num_rows)
+            mask = reduce(
+                pc.and_,
+                [_get_arrow_filter(table.column, table.schema, fd) for fd in filters],
+            )
+            rows.append(offsets[i] + pc.indices_nonzero(mask).to_numpy())
+        return np.concatenate(rows) if rows else np.empty(0, dtype=np.int64)
+
+    def __get_rows(
+        self,
+        var_name: str,
+        dataset: "ds.FileSystemDataset",
+        version: t.Optional[t.Hashable],
+        pieces: t.List[_Piece],
+        offsets: np.ndarray,
+        filters: t.Optional[t.List[t.Dict[str, t.Any]]],
+        order_by: t.Optional[str],
+        descending: bool,
+    ) -> t.Optional[np.ndarray]:
+        # positions of the filtered then sorted rows, None if all rows are selected in their order
+        if not filters and not order_by:
+            return None
+        key: t.Optional[t.Hashable] = (
+            tuple(_get_filter_key(fd) for fd in filters) if filters else None,
+            order_by,
+            descending,
+        )
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+        rows = self.__rows_cache.get(dataset, version, key) if key is not None else None
+        if rows is not None:
+            return rows
+        if filters:
+            try:
+                rows = self.__filter_rows(dataset, pieces, offsets, filters)
+            except Exception as e:
+                _warn(f"Arrow dataset filtering: invalid filters {filters}", e)
+        if order_by:
+            try:
+                if order_by == _ArrowDatasetDataAccessor.__INDEX_COL and order_by not in dataset.schema.names:
+                    if descending:
+                        rows = (np.arange(offsets[-1]) if rows is None else rows)[::-1]
+                else:
+                    # only the sorted column is read
+                    schema = pa.schema([dataset.schema.field(order_by)])
+                    values = _ArrowDatasetDataAccessor.__take(pieces, offsets, schema, rows).column(0)
+                    indexes = pc.array_sort_indices(values, order="descending" if descending else "ascending")
+                    rows = indexes.to_numpy() if rows is None else rows[indexes.to_numpy()]
+            except Exception as e:
+                _warn(f"Cannot sort {var_name} on columns {order_by}.", e)
+        if rows is not None and key is not None:
+            rows.flags.writeable = False
+            self.__rows_cache.set(dataset, version, key, rows)
+        return rows
+
+    @staticmethod
+    def __get_filter_expression(dataset: "ds.FileSystemDataset", filters: t.List[t.Dict[str, t.Any]]) -> t.Any:
+        return reduce(
+            lambda expr, fd: expr & _get_arrow_filter(pc.field, dataset.schema, fd),
+            filters,
+            pc.scalar(True),
+        )
+
+    @staticmethod
+    def __get_filter_columns(dataset: "ds.FileSystemDataset", filters: t.List[t.Dict[str, t.Any]]) -> t.Set[str]:
+        columns: t.Set[str] = set()
+        for fd in filters:
+            if fd.get("col") != _ALL_COLUMNS:
+                columns.add(str(fd.get("col")))
+            elif isinstance(fd.get("cols"), list):
+                columns.update(str(c) for c in fd["cols"])
+            else:
+                return set(dataset.schema.names)
+        return columns
+
+    @staticmethod
+    def __get_schema(dataset: "ds.FileSystemDataset", columns: t.Iterable[str]) -> "pa.Schema":
+        # the schema of the columns to read, all of them if columns is empty
+        names = [c for c in dataset.schema.names if c in columns] if columns else dataset.schema.names
+        return pa.schema([dataset.schema.field(c) for c in names])
+
+    def get_col_types(self, var_name: str, value: t.Any) -> t.Union[None, t.Dict[str, str]]:  # type: ignore
+        if isinstance(value, _ArrowDatasetDataAccessor.__types):  # type: ignore
+            return super().get_col_types(var_name, value.schema.empty_table())  # type: ignore
+        return None
+
+    def get_data(
+        self, gui: Gui, var_name: str, value: t.Any, payload: t.Dict[str, t.Any], data_format: _DataFormat
+    ) -> t.Dict[str, t.Any]:
+        if not isinstance(value, _ArrowDatasetDataAccessor.__types):  # type: ignore
+            return {}
+        columns = [c for c in payload.get("columns", []) if c != _ArrowDatasetDataAccessor.__INDEX_COL]
+        filters = payload.get("filters")
+        if not isinstance(filters, list) or len(filters) == 0:
+            filters = None
+        if (stats_request := _get_stats_request(payload)) is not None:
+            columns = [str(c) for c in stats_request[0]]
+        if payload.get("alldata", False) or stats_request is not None:
+            # filters are applied while the dataset is scanned
+            table = value.to_table(  # type: ignore
+                columns=_ArrowDatasetDataAccessor.__get_schema(value, columns).names,
+                filter=_ArrowDatasetDataAccessor.__get_filter_expression(value, filters) if filters else None,
+            )
+            return super().get_data(gui, var_name, table, {**payload, "filters": None}, data_format)
+        version = _ArrowDatasetDataAccessor.__get_version(value)
+        pieces, offsets = self.__get_pieces(value, version)
+        aggregates = payload.get("aggregates")
+        if isinstance(aggregates, list) and len(aggregates) and isinstance(payload.get("applies"), dict):
+            # the rows of the grouped columns are read, then aggregated in memory
+            rows = self.__get_rows(var_name, value, version, pieces, offsets, filters, None, False)
+            needed = {*columns, *aggregates, *payload.get("applies", {}).keys()}
+            table = _ArrowDatasetDataAccessor.__take(
+                pieces, offsets, _ArrowDatasetDataAccessor.__get_schema(value, needed), rows
+            )
+            table = table.append_column(
+                _ArrowDatasetDataAccessor.__INDEX_COL, pa.array(np.arange(table.num_rows) if rows is None else rows)
+            )
+            return super().get_data(gui, var_name, table, {**payload, "filters": None}, data_format)
+        order_by = payload.get("orderby")
+        rows = self.__get_rows(
+            var_name,
+            value,
+            version,
+            pieces,
+            offsets,
+            filters,
+            order_by if isinstance(order_by, str) and len(order_by) else None,
+            payload.get("sort") == "desc",
+        )
+        rowcount = int(offsets[-1]) if rows is None else len(rows)
+        start, end = _get_page_range(payload, rowcount)
+        page_rows = np.arange(start, end + 1) if rows is None else rows[start : end + 1]
+        # only the rows of the page are read
+        page = _ArrowDatasetDataAccessor.__take(
+            pieces, offsets, _ArrowDatasetDataAccessor.__get_schema(value, columns), page_rows
+        ).append_column(_ArrowDatasetDataAccessor.__INDEX_COL, pa.array(page_rows))
+        ret_payload = super().get_data(
+            gui, var_name, page, {**payload, "start": 0, "end": -1, "filters": None, "orderby": None}, data_format
+        )
+        ret_payload["value"]["rowcount"] = rowcount
+        ret_payload["value"]["start"] = start
+        return ret_payload
+
+    def _invalidate(self, value: t.Any) -> None:
+        if isinstance(value, _ArrowDatasetDataAccessor.__types):  # type: ignore
+            self.__pieces_cache.invalidate(value)
+            self.__rows_cache.invalidate(value)
@@ -10,6 +10,7 @@
 # specific language governing permissions and limitations under the License.
 
 from .lttb import LTTB
+from .m4 import M4
 from .minmax import MinMaxDecimator
 from .rdp import RDP
 from .scatter_decimator import ScatterDecimator
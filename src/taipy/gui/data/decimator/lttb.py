@@ -41,11 +41,101 @@ class LTTB(Decimator):
         super().__init__(threshold, zoom)
         self._n_out = n_out
 
+    # bins of at most this number of points are processed with a transition table
+    __TABLE_MAX_BIN_SIZE = 24
+    # bins of at most this number of points are processed together, larger bins one at a time
+    __BATCH_MAX_BIN_SIZE = 512
+    # maximum number of values computed at once
+    __CHUNK_SIZE = 1 << 20
+    # maximum number of areas computed at once when bins are processed together, small enough for
+    # the intermediate arrays to stay in the processor cache
+    __BATCH_CHUNK_SIZE = 1 << 14
+
+    @staticmethod
+    def __get_twice_areas(a: np.ndarray, bs: np.ndarray, c: np.ndarray) -> np.ndarray:
+        # twice the areas of the triangles (a, b, c), for all the points b of bs
+        # a, bs and c are broadcast together: the last dimension holds the coordinates
+        ax, ay = a[..., 0], a[..., 1]
+        return np.abs((ax - c[..., 0]) * (bs[..., 1] - ay) - (ax - bs[..., 0]) * (c[..., 1] - ay))
+
+    @staticmethod
+    def __get_sums(bins: np.ndarray) -> np.ndarray:
+        # the points of each bin are added in order, as np.mean does for a single bin, so that the
+        # centroids are exactly the same
+        dtype = np.float64 if bins.dtype.kind in "biu" else bins.dtype
+        n_bins, bin_size, n_dims = bins.shape
+        if bin_size <= LTTB.__TABLE_MAX_BIN_SIZE:
+            sums = bins[:, 0].astype(dtype)
+            for i in range(1, bin_size):
+                sums += bins[:, i]
+            return sums
+        sums = np.empty((n_bins, n_dims), dtype=dtype)
+        step = max(1, LTTB.__CHUNK_SIZE // (bin_size * n_dims))
+        for start in range(0, n_bins, step):
+            sums[start : start + step] = np.cumsum(bins[start : start + step], axis=1, dtype=dtype)[:, -1]
+        return sums
+
     @staticmethod
-    def _areas_of_triangles(a, bs, c):
-        bs_minus_a = bs - a
-        a_minus_bs = a - bs
-        return 0.5 * abs((a[0] - c[0]) * (bs_minus_a[:, 1]) - (a_minus_bs[:, 0]) * (c[1] - a[1]))
+    def __get_transitions(xs: np.ndarray, ys: np.ndarray, centroids: np.ndarray, n_large: int) -> np.ndarray:
+        # transitions[i, k]: the position of the point selected in bin i when the point selected in
+        # bin i - 1 is at position k
+        # xs and ys hold the coordinates of the points of the bins, the last point of the bins from
+        # n_large on being a padding point
+        n_bins, bin_size = xs.shape
+        transitions = np.zeros((n_bins, bin_size), dtype=np.intp)
+        step = max(1, LTTB.__CHUNK_SIZE // (bin_size * bin_size))
+        for start in range(1, n_bins, step):
+            end = min(start + step, n_bins)
+            # a: the points of the previous bins, b: the points of the bins, c: the next centroids
+            ax, ay = xs[start - 1 : end - 1, :, None], ys[start - 1 : end - 1, :, None]
+            cx, cy = centroids[start:end, None, None, 0], centroids[start:end, None, None, 1]
+            areas = (ax - cx) * (ys[start:end, None, :] - ay)
+            areas -= (ax - xs[start:end, None, :]) * (cy - ay)
+            np.abs(areas, out=areas)
+            # padding points are never selected
+            areas[max(n_large - start, 0) :, :, bin_size - 1] = -1
+            transitions[start:end] = areas.argmax(axis=2)
+        return transitions
+
+    @staticmethod
+    def __select_large(
+        first: np.ndarray,
+        inner: np.ndarray,
+        groups: t.List[np.ndarray],
+        starts: np.ndarray,
+        centroids: np.ndarray,
+        n_large: int,
+    ) -> np.ndarray:
+        # the positions of the selected points in bins too large for a transition table, but small
+        # enough to be processed together
+        # The selections of a set of bins are computed at once from the points selected in their
+        # previous bins, starting from guessed points. The bins which previous selection changed
+        # are computed again, until the selections no longer change: the first bin that changes
+        # is then right, so that this ends with the same selections as a bin by bin computation.
+        n_bins = len(starts)
+        sizes = np.diff(np.append(starts, len(inner)))
+        # positions of the points of the previous bins the selections were computed from
+        previous = sizes[:-1] // 2
+        selected = np.empty(n_bins, dtype=np.intp)
+        bins = np.arange(n_bins)
+        while len(bins):
+            a = inner[starts[bins - 1] + previous[bins - 1]]
+            if bins[0] == 0:
+                a[0] = first[:2]
+            for group, rows, offset in ((0, bins[bins < n_large], 0), (1, bins[bins >= n_large], n_large)):
+                if len(rows) == 0:
+                    continue
+                group_a = a[: len(rows)] if group == 0 else a[len(a) - len(rows) :]
+                bin_size = groups[group].shape[1]
+                step = max(1, LTTB.__BATCH_CHUNK_SIZE // bin_size)
+                for start in range(0, len(rows), step):
+                    chunk = rows[start : start + step]
+                    bs = groups[group][chunk - offset]
+                    areas = LTTB.__get_twice_areas(group_a[start : start + step, None], bs, centroids[chunk, None])
+                    selected[chunk] = areas.argmax(axis=1)
+            bins = np.flatnonzero(previous != selected[:-1]) + 1
+            previous[bins - 1] = selected[bins - 1]
+        return selected
 
     def decimate(self, data: np.ndarray, payload: t.Dict[str, t.Any]) -> np.ndarray:
         n_out = self._n_out
@@ -55,34 +145,67 @@ class LTTB(Decimator):
         if n_out < 3:
             raise ValueError("Can only down-sample to a minimum of 3 points")
 
-        # Split data into bins
+        # Split data into bins, as np.array_split does: the first bins hold one more point
         n_bins = n_out - 2
-        data_bins = np.array_split(data[1:-1], n_bins)
+        # only the x and y coordinates are used
+        inner = data[1:-1, :2]
+        bin_size, n_large = divmod(len(inner), n_bins)
+        large_end = n_large * (bin_size + 1)
+        groups = [
+            inner[:large_end].reshape(n_large, bin_size + 1, 2),
+            inner[large_end:].reshape(n_bins - n_large, bin_size, 2),
+        ]
+        sizes = np.full(n_bins, bin_size)
+        sizes[:n_large] += 1
+        starts = np.zeros(n_bins, dtype=np.intp)
+        np.cumsum(sizes[:-1], out=starts[1:])
 
-        prev_a = data[0]
-        start_pos = 0
+        # Largest Triangle Three Buckets (LTTB):
+        # In each bin, find the point that makes the largest triangle
+        # with the point saved in the previous bin
+        # and the centroid of the points in the next bin.
+        # centroids[i] is the centroid of the bin that follows bin i
+        centroids = np.concatenate(
+            [
+                LTTB.__get_sums(groups[0]) / (bin_size + 1),
+                LTTB.__get_sums(groups[1]) / bin_size,
+                data[-1:, :2].mean(axis=0)[None],
+            ]
+        )[1:]
+        selected = np.empty(n_bins, dtype=np.intp)
+        if bin_size < LTTB.__TABLE_MAX_BIN_SIZE:
+            # the selection in a bin only depends on the point selected in the previous bin: the
+            # selections are computed for all the points of the previous bins at once
+            bins = np.empty((2, n_bins, bin_size + 1), dtype=inner.dtype)
+            bins[:, :n_large] = groups[0].transpose(2, 0, 1)
+            bins[:, n_large:, :bin_size] = groups[1].transpose(2, 0, 1)
+            # padding points: copies of the first point of their bin
+            bins[:, n_large:, bin_size] = bins[:, n_large:, 0]
+            transitions = LTTB.__get_transitions(bins[0], bins[1], centroids, n_large)
+            areas = LTTB.__get_twice_areas(data[0], bins[:, 0, : sizes[0]].T, centroids[0])
+            position = int(areas.argmax())
+            positions = [position]
+            for i in range(1, n_bins):
+                position = transitions.item(i, position)
+                positions.append(position)
+            selected[:] = positions
+        elif bin_size < LTTB.__BATCH_MAX_BIN_SIZE:
+            selected[:] = LTTB.__select_large(data[0], inner, groups, starts, centroids, n_large)
+        else:
+            # the areas of large bins are too costly to be computed more than once
+            a = data[0]
+            for i in range(n_bins):
+                group, row = (0, i) if i < n_large else (1, i - n_large)
+                bs = groups[group][row]
+                position = int(LTTB.__get_twice_areas(a, bs, centroids[i]).argmax())
+                selected[i] = position
+                a = bs[position]
 
         # Prepare output mask array
         # First and last points are the same as in the input.
         out_mask = np.full(len(data), False)
         out_mask[0] = True
         out_mask[len(data) - 1] = True
-
-        # Largest Triangle Three Buckets (LTTB):
-        # In each bin, find the point that makes the largest triangle
-        # with the point saved in the previous bin
-        # and the centroid of the points in the next bin.
-        for i in range(len(data_bins)):
-            this_bin = data_bins[i]
-            next_bin = data_bins[i + 1] if i < n_bins - 1 else data[-1:]
-            a = prev_a
-            bs = this_bin
-            c = next_bin.mean(axis=0)
-
-            areas = LTTB._areas_of_triangles(a, bs, c)
-            bs_pos = np.argmax(areas)
-            prev_a = bs[bs_pos]
-            out_mask[start_pos + bs_pos] = True
-            start_pos += len(this_bin)
-
+        # positions of the selected points in the inner points, as they always were
+        out_mask[starts + selected] = True
         return out_mask
@@ -0,0 +1,180 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+from ..utils import Decimator
+from .pyramid import _MinMaxPyramid
+
+
+class M4(Decimator):
+    """A decimator using the M4 algorithm.
+
+    The M4 algorithm splits the displayed range of the x axis into as many columns as the
+    chart has pixels horizontally, and keeps the first, last, smallest and largest points of
+    each column. The line drawn through these points is the same, pixel for pixel, as the
+    line drawn through all the data points.<br/>
+    This algorithm is very fast, and is well suited to very large time series.
+
+    When *pyramid* is set to True, the extrema of the data points are precomputed at
+    several resolutions the first time a data set is decimated: the zoom and pan requests
+    are then answered without going through all the displayed data points. This requires
+    the x values to be sorted, and the data set not to hold missing values.
+
+    This class can only be used with line charts.
+    """
+
+    _CHART_MODES = ["lines+markers", "lines"]
+    _FILTERS_RANGE = True
+    # average number of points per group above which the groups are processed one at a time
+    __MIN_GROUP_SIZE = 64
+
+    def __init__(
+        self, threshold: t.Optional[int] = None, zoom: t.Optional[bool] = True, pyramid: t.Optional[bool] = False
+    ) -> None:
+        """Initialize a new `M4`.
+
+        Arguments:
+            threshold (Optional[int]): The minimum amount of data points before the
+                decimation is applied.
+            zoom (Optional[bool]): set to True to reapply the decimation
+                when zoom or re-layout events are triggered.
+            pyramid (Optional[bool]): set to True to precompute the extrema of the data
+                points, so that zoom and pan requests are answered faster.
+        """
+        super().__init__(threshold, zoom)
+        self._use_pyramid = bool(pyramid)
+
+    @staticmethod
+    def __to_numbers(values: np.ndarray) -> t.Tuple[np.ndarray, bool]:
+        # the values as floats, and whether they are dates (as nanoseconds)
+        if values.dtype.kind == "M":
+            return values.astype("datetime64[ns]").view(np.int64).astype(np.float64), True
+        try:
+            return values.astype(np.float64, copy=False), False
+        except (TypeError, ValueError):
+            dates = pd.to_datetime(values)
+            return np.where(dates.isna(), np.nan, dates.asi8.astype(np.float64)), True
+
+    @staticmethod
+    def __get_bound(value: t.Any, is_date: bool) -> float:
+        return float(pd.Timestamp(value).value) if is_date else float(value)
+
+    def __get_range(self, is_date: bool, payload: t.Dict[str, t.Any]) -> t.Optional[t.Tuple[float, float]]:
+        # the displayed range of the x axis, if the chart was zoomed
+        relayout_data = payload.get("relayoutData") if self._zoom else None
+        if not isinstance(relayout_data, dict):
+            return None
+        x0, x1 = relayout_data.get("xaxis.range[0]"), relayout_data.get("xaxis.range[1]")
+        if x0 is None or x1 is None:
+            return None
+        try:
+            x0, x1 = M4.__get_bound(x0, is_date), M4.__get_bound(x1, is_date)
+        except (TypeError, ValueError):
+            return None
+        return (x0, x1) if x0 <= x1 else (x1, x0)
+
+    @staticmethod
+    def __get_edges(x0: float, x1: float, width: int) -> np.ndarray:
+        # the edges of the pixel columns: the points before and after the range are in columns
+        # of their own, so that the lines joining them to the range are drawn up to its edges
+        edges = x0 + (x1 - x0) * np.arange(width + 1) / width
+        edges[-1] = x1
+        return edges
+
+    @staticmethod
+    def __get_starts(x: np.ndarray, edges: np.ndarray) -> np.ndarray:
+        # the positions where the columns start in the sorted *x*, without the empty columns
+        bounds = np.concatenate(
+            ([0], np.searchsorted(x, edges[:-1]), np.searchsorted(x, edges[-1:], side="right"), [len(x)])
+        )
+        return bounds[:-1][bounds[:-1] < bounds[1:]]
+
+    @staticmethod
+    def __get_extrema(values: np.ndarray, starts: np.ndarray) -> t.List[np.ndarray]:
+        # the positions of the first smallest and first largest values of each group
+        if len(values) >= M4.__MIN_GROUP_SIZE * len(starts):
+            bounds = list(zip(starts.tolist(), starts[1:].tolist() + [len(values)]))
+            return [
+                np.array([start + np.argmin(values[start:end]) for start, end in bounds], dtype=np.intp),
+                np.array([start + np.argmax(values[start:end]) for start, end in bounds], dtype=np.intp),
+            ]
+        lengths = np.diff(np.append(starts, len(values)))
+        positions = []
+        for reduce in (np.minimum.reduceat, np.maximum.reduceat):
+            candidates = np.flatnonzero(values == np.repeat(reduce(values, starts), lengths))
+            groups = np.searchsorted(starts, candidates, side="right")
+            positions.append(candidates[np.concatenate(([True], groups[1:] != groups[:-1]))])
+        return positions
+
+    @staticmethod
+    def __get_width(payload: t.Dict[str, t.Any]) -> t.Optional[int]:
+        width = payload.get("width")
+        return int(width) if isinstance(width, (int, float)) and width >= 1 else None
+
+    def _build_pyramid(self, x: np.ndarray, y: np.ndarray) -> t.Optional[_MinMaxPyramid]:
+        x, is_date = M4.__to_numbers(x)
+        y, _ = M4.__to_numbers(y)
+        if len(x) == 0 or np.isnan(np.sum(x) + np.sum(y)) or not np.all(x[1:] >= x[:-1]):
+            return None
+        return _MinMaxPyramid(x, y, is_date)
+
+    def _decimate_pyramid(self, pyramid: _MinMaxPyramid, payload: t.Dict[str, t.Any]) -> np.ndarray:
+        x = pyramid.x
+        if (width := M4.__get_width(payload)) is None:
+            return np.arange(len(x))
+        x0, x1 = self.__get_range(pyramid.is_date, payload) or (x[0], x[-1])
+        starts = M4.__get_starts(x, M4.__get_edges(x0, x1, width))
+        ends = np.append(starts[1:], len(x))
+        return np.unique(np.concatenate((starts, ends - 1, *pyramid.get_extrema(starts, ends))))
+
+    def decimate(self, data: np.ndarray, payload: t.Dict[str, t.Any]) -> np.ndarray:
+        n_rows = data.shape[0]
+        if (width := M4.__get_width(payload)) is None or n_rows == 0:
+            return np.full(n_rows, True)
+        x, is_date = M4.__to_numbers(data[:, 0])
+        y, _ = M4.__to_numbers(data[:, 1])
+        mask = np.full(n_rows, False)
+        rows: t.Optional[np.ndarray] = None
+        line_starts = np.empty(0, dtype=np.intp)
+        # a single pass over the data when it holds numbers only
+        if np.isnan(np.sum(data[:, :2]) if data.dtype.kind == "f" else np.sum(x) + np.sum(y)):
+            # missing points break the line: the first one of each gap is kept
+            missing = np.isnan(x) | np.isnan(y)
+            mask |= missing & ~np.concatenate(([False], missing[:-1]))
+            rows = np.flatnonzero(~missing)
+            if len(rows) == 0:
+                return mask
+            x, y = x[rows], y[rows]
+            line_starts = np.flatnonzero(np.diff(rows) > 1) + 1
+        is_sorted = bool(np.all(x[1:] >= x[:-1]))
+        x0, x1 = self.__get_range(is_date, payload) or ((x[0], x[-1]) if is_sorted else (np.min(x), np.max(x)))
+        edges = M4.__get_edges(x0, x1, width)
+        if is_sorted:
+            starts = M4.__get_starts(x, edges)
+        else:
+            # the points of a column are made consecutive, in their order
+            columns = np.searchsorted(edges[:-1], x, side="right")
+            columns[x > x1] = width + 1
+            order = np.argsort(columns, kind="stable")
+            columns, y = columns[order], y[order]
+            starts = np.flatnonzero(np.concatenate(([True], columns[1:] != columns[:-1])))
+            if len(line_starts):
+                line_starts = np.flatnonzero(np.diff(np.searchsorted(line_starts, order, side="right")) != 0) + 1
+            rows = order if rows is None else rows[order]
+        if len(line_starts):
+            starts = np.union1d(starts, line_starts)
+        selected = np.concatenate([starts, np.append(starts[1:], len(y)) - 1] + M4.__get_extrema(y, starts))
+        mask[selected if rows is None else rows[selected]] = True
+        return mask
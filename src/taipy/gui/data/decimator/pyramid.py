@@ -0,0 +1,103 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import typing as t
+
+import numpy as np
+
+
+class _MinMaxPyramid(object):
+    """Positions of the smallest and largest values of a series, for blocks of consecutive points.
+
+    The first level holds the extrema of the blocks of *block_size* points, and each level
+    holds the extrema of pairs of blocks of the level below. The extrema of any range of
+    points are found from at most two blocks per level, and from the points of the range
+    that are not in a whole block.<br/>
+    The series must not hold missing values.
+    """
+
+    def __init__(self, x: np.ndarray, y: np.ndarray, is_date: bool = False, block_size: int = 32) -> None:
+        self.x = x
+        self.y = y
+        self.is_date = is_date
+        self.__block_size = block_size
+        nb_blocks = len(y) // block_size
+        blocks = y[: nb_blocks * block_size].reshape(nb_blocks, block_size)
+        offsets = np.arange(nb_blocks) * block_size
+        mins, maxs = np.argmin(blocks, axis=1) + offsets, np.argmax(blocks, axis=1) + offsets
+        self.__levels = [(mins, maxs)]
+        while len(mins) > 1:
+            size = len(mins) // 2 * 2
+            # the first position wins the ties
+            mins = np.where(y[mins[1:size:2]] < y[mins[:size:2]], mins[1:size:2], mins[:size:2])
+            maxs = np.where(y[maxs[1:size:2]] > y[maxs[:size:2]], maxs[1:size:2], maxs[:size:2])
+            self.__levels.append((mins, maxs))
+
+    @property
+    def nbytes(self) -> int:
+        # the arrays shared with the data set are not counted
+        size = sum(mins.nbytes + maxs.nbytes for mins, maxs in self.__levels)
+        return size + sum(a.nbytes for a in (self.x, self.y) if a.base is None)
+
+    @staticmethod
+    def __update(
+        best: np.ndarray, values: np.ndarray, groups: np.ndarray, positions: np.ndarray, candidates: np.ndarray
+    ):
+        # keep the smallest value, and the first position among equal values
+        better = (candidates < values[groups]) | ((candidates == values[groups]) & (positions < best[groups]))
+        best[groups[better]] = positions[better]
+        values[groups[better]] = candidates[better]
+
+    def __scan(self, trackers, starts: np.ndarray, ends: np.ndarray, length: int):
+        # the points of ranges of at most *length* points
+        groups = np.flatnonzero(ends > starts)
+        if len(groups) == 0:
+            return
+        positions = starts[groups, None] + np.arange(length)
+        valid = positions < ends[groups, None]
+        positions = np.where(valid, positions, starts[groups, None])
+        for sign, best, values in trackers:
+            candidates = np.where(valid, sign * self.y[positions], np.inf)
+            found = np.argmin(candidates, axis=1)
+            rows = np.arange(len(groups))
+            _MinMaxPyramid.__update(best, values, groups, positions[rows, found], candidates[rows, found])
+
+    def __update_blocks(self, trackers, level: t.Tuple[np.ndarray, np.ndarray], groups: np.ndarray, blocks: np.ndarray):
+        for (sign, best, values), extrema in zip(trackers, level):
+            positions = extrema[blocks]
+            _MinMaxPyramid.__update(best, values, groups, positions, sign * self.y[positions])
+
+    def get_extrema(self, starts: np.ndarray, ends: np.ndarray) -> t.Tuple[np.ndarray, np.ndarray]:
+        """Return the positions of the first smallest and first largest values of the ranges of
+        points that start at *starts* and end before *ends*."""
+        n_ranges = len(starts)
+        trackers = [(sign, np.full(n_ranges, len(self.y)), np.full(n_ranges, np.inf)) for sign in (1, -1)]
+        # the whole blocks of the ranges
+        lo = -(-starts // self.__block_size)
+        hi = ends // self.__block_size
+        has_blocks = lo < hi
+        # the points before and after the whole blocks
+        head_ends = np.where(has_blocks, lo * self.__block_size, ends)
+        self.__scan(trackers, starts, head_ends, 2 * self.__block_size)
+        self.__scan(trackers, np.where(has_blocks, hi * self.__block_size, ends), ends, self.__block_size)
+        for level in self.__levels:
+            if not (lo < hi).any():
+                break
+            # the blocks that are not paired in the level above
+            groups = np.flatnonzero((lo & 1).astype(bool) & (lo < hi))
+            self.__update_blocks(trackers, level, groups, lo[groups])
+            lo[groups] += 1
+            groups = np.flatnonzero((hi & 1).astype(bool) & (lo < hi))
+            hi[groups] -= 1
+            self.__update_blocks(trackers, level, groups, hi[groups])
+            lo >>= 1
+            hi >>= 1
+        return trackers[0][1], trackers[1][1]
@@ -9,7 +9,9 @@
 # an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 # specific language governing permissions and limitations under the License.
 
+import os
 import typing as t
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 
@@ -28,12 +30,18 @@ class RDP(Decimator):
 
     _CHART_MODES = ["lines+markers"]
 
+    # maximum number of distances computed at once
+    __CHUNK_SIZE = 1 << 20
+    # segments of at least this number of points are not processed with other segments
+    __MIN_SEGMENT_SIZE = 256
+
     def __init__(
         self,
         epsilon: t.Optional[int] = None,
         n_out: t.Optional[int] = None,
         threshold: t.Optional[int] = None,
         zoom: t.Optional[bool] = True,
+        window_size: t.Optional[int] = None,
     ):
         """Initialize a new `RDP`.
 
@@ -41,17 +49,19 @@ class RDP(Decimator):
             epsilon (Optional[int]): The epsilon value for the RDP algorithm. If this value
                 is being used, the *n_out* argument is ignored.
             n_out (Optional(int)): The maximum number of points that are displayed after
-                decimation. This value is ignored if the epsilon value is used.<br/>
-                This process is not very efficient so consider using `LTTB` or `MinMaxDecimator`
-                if the provided data has more than 100.000 data points.
+                decimation. This value is ignored if the epsilon value is used.
             threshold (Optional[int]): The minimum amount of data points before the
                 decimation is applied.
             zoom (Optional[bool]): set to True to reapply the decimation
                 when zoom or re-layout events are triggered.
+            window_size (Optional[int]): If set, data sets that have more points are split
+                into windows of this number of points, that are decimated independently and
+                concurrently. The first and last points of each window are kept.
         """
         super().__init__(threshold, zoom)
         self._epsilon = epsilon
         self._n_out = n_out
+        self._window_size = window_size
 
     @staticmethod
     def dsquared_line_points(P1, P2, points):
@@ -65,47 +75,146 @@ class RDP(Decimator):
         return np.divide(nom, denom)
 
     @staticmethod
-    def __rdp_epsilon(data, epsilon: int):
-        # initiate mask array
-        # same amount of points
-        mask = np.empty(data.shape[0], dtype=bool)
-
-        # Assume all points are valid and falsify those which are found
-        mask.fill(True)
+    def __get_farthest_point(data: np.ndarray, start: int, end: int) -> t.Tuple[int, float]:
+        # the point between start and end that is the farthest from the line (start, end), and the
+        # square of its distance
+        P1, P2 = data[start], data[end]
+        points = data[start + 1 : end]
+        if P1[0] == P2[0] and P1[1] == P2[1]:
+            dsq = (points[:, 0] - P1[0]) ** 2 + (points[:, 1] - P1[1]) ** 2
+        else:
+            dsq = RDP.dsquared_line_points(P1, P2, points)
+        position = int(np.argmax(dsq))
+        return start + 1 + position, float(dsq[position])
 
-        # The stack to select start and end index
-        stack: t.List[t.Tuple[int, int]] = [(0, data.shape[0] - 1)]  # type: ignore
+    @staticmethod
+    def __get_farthest_points(
+        data: np.ndarray, starts: np.ndarray, ends: np.ndarray
+    ) -> t.Tuple[np.ndarray, np.ndarray]:
+        # __get_farthest_point for all the segments (starts[i], ends[i]) at once
+        lengths = ends - starts - 1
+        offsets = np.zeros(len(starts), dtype=np.intp)
+        np.cumsum(lengths[:-1], out=offsets[1:])
+        positions = np.arange(offsets[-1] + lengths[-1]) + np.repeat(starts + 1 - offsets, lengths)
+        P1, P2 = data[starts], data[ends]
+        xdiff = P2[:, 0] - P1[:, 0]
+        ydiff = P2[:, 1] - P1[:, 1]
+        x, y = data[positions, 0], data[positions, 1]
+        # same computation as dsquared_line_points
+        nom = (
+            np.repeat(ydiff, lengths) * x
+            - np.repeat(xdiff, lengths) * y
+            + np.repeat(P2[:, 0] * P1[:, 1], lengths)
+            - np.repeat(P2[:, 1] * P1[:, 0], lengths)
+        ) ** 2
+        denom = ydiff**2 + xdiff**2
+        with np.errstate(divide="ignore", invalid="ignore"):
+            dsq = np.divide(nom, np.repeat(denom, lengths))
+        if (degenerate := (xdiff == 0) & (ydiff == 0)).any():
+            points = np.repeat(degenerate, lengths)
+            segment_starts = np.repeat(starts, lengths)[points]
+            dsq[points] = (x[points] - data[segment_starts, 0]) ** 2 + (y[points] - data[segment_starts, 1]) ** 2
+        maxima = np.maximum.reduceat(dsq, offsets)
+        # the first point of each segment which distance is the maximum one
+        candidates = np.flatnonzero(dsq == np.repeat(maxima, lengths))
+        segments, firsts = np.unique(np.repeat(np.arange(len(starts)), lengths)[candidates], return_index=True)
+        farthest = starts + 1
+        farthest[segments] = positions[candidates[firsts]]
+        return farthest, maxima
 
-        while stack:
-            # Pop the last item
-            (start, end) = stack.pop()
+    @staticmethod
+    def __get_all_farthest_points(
+        data: np.ndarray, starts: np.ndarray, ends: np.ndarray
+    ) -> t.Tuple[np.ndarray, np.ndarray]:
+        # the farthest points of the segments (starts[i], ends[i]) and the squares of their distances
+        farthest = np.empty_like(starts)
+        dsq = np.empty(len(starts))
+        lengths = ends - starts - 1
+        # long segments are processed one at a time, the others in groups of about __CHUNK_SIZE points
+        batched = lengths < RDP.__MIN_SEGMENT_SIZE
+        for i in np.flatnonzero(~batched).tolist():
+            farthest[i], dsq[i] = RDP.__get_farthest_point(data, starts[i], ends[i])
+        if batched.any():
+            indexes = np.flatnonzero(batched)
+            groups = (np.cumsum(lengths[indexes]) - lengths[indexes]) // RDP.__CHUNK_SIZE
+            bounds = [0, *(np.flatnonzero(np.diff(groups)) + 1).tolist(), len(indexes)]
+            for first, last in zip(bounds[:-1], bounds[1:]):
+                group = indexes[first:last]
+                farthest[group], dsq[group] = RDP.__get_farthest_points(data, starts[group], ends[group])
+        return farthest, dsq
 
+    @staticmethod
+    def __rdp_epsilon(data, epsilon: int):
+        # the segments are split one level at a time: all the segments of a level are processed at once
+        mask = np.full(data.shape[0], False)
+        mask[0] = True
+        mask[-1] = True
+        epsilon_sq = epsilon**2
+        starts = np.array([0])
+        ends = np.array([data.shape[0] - 1])
+        while True:
             # nothing to calculate if no points in between
-            if end - start <= 1:
-                continue
-
-            # Calculate distance to points
-            P1 = data[start]
-            P2 = data[end]
-            points = data[start + 1 : end]
-            dsq = RDP.dsquared_line_points(P1, P2, points)
+            inner = ends - starts > 1
+            starts, ends = starts[inner], ends[inner]
+            if len(starts) == 0:
+                return mask
+            farthest, dsq = RDP.__get_all_farthest_points(data, starts, ends)
+            # max point outside eps: the segment is split, otherwise points in between are redundant
+            split = dsq > epsilon_sq
+            mids = farthest[split]
+            mask[mids] = True
+            starts, ends = np.concatenate((starts[split], mids)), np.concatenate((mids, ends[split]))
 
-            mask_eps = dsq > epsilon**2
-
-            if mask_eps.any():
-                # max point outside eps
-                # Include index that was sliced out
-                # Also include the start index to get absolute index
-                # And not relative
-                mid = np.argmax(dsq) + 1 + start
-                stack.append((start, mid))  # type: ignore
-                stack.append((mid, end))  # type: ignore
-
-            else:
-                # Points in between are redundant
-                mask[start + 1 : end] = False
+    @staticmethod
+    def __get_largest(keys: np.ndarray, n: int) -> np.ndarray:
+        # the indexes of the n largest keys, the first ones among equal keys: the children of a
+        # point may have the same key as this point, they are found after it
+        if len(keys) <= n:
+            return np.arange(len(keys))
+        threshold = np.partition(keys, len(keys) - n)[len(keys) - n]
+        larger = np.flatnonzero(keys > threshold)
+        return np.concatenate((larger, np.flatnonzero(keys == threshold)[: n - len(larger)]))
 
-        return mask
+    @staticmethod
+    def __refine(data: np.ndarray, n_out: int) -> t.Tuple[np.ndarray, np.ndarray]:
+        # the positions of the n_out points that the greedy refinement keeps, and their keys
+        # the greedy refinement splits the segment which farthest point is the farthest first: the
+        # points are kept in the decreasing order of their key, the smallest distance of the points
+        # that were split to reach them, themselves included
+        # the segments are split one level at a time, skipping the ones which keys are lower than
+        # the n_out-th largest key found so far
+        last = data.shape[0] - 1
+        positions = [np.array([0, last])]
+        keys = [np.array([np.inf, np.inf])]
+        n_found = 2
+        threshold = -np.inf
+        starts, ends, bounds = np.array([0]), np.array([last]), np.array([np.inf])
+        while True:
+            inner = ends - starts > 1
+            starts, ends, bounds = starts[inner], ends[inner], bounds[inner]
+            if len(starts) == 0:
+                break
+            farthest, dsq = RDP.__get_all_farthest_points(data, starts, ends)
+            # missing values are ignored
+            dsq[~(dsq >= 0)] = 0
+            level_keys = np.minimum(bounds, dsq)
+            kept = level_keys >= threshold
+            farthest, level_keys = farthest[kept], level_keys[kept]
+            positions.append(farthest)
+            keys.append(level_keys)
+            n_found += len(farthest)
+            if n_found > n_out:
+                all_keys = np.concatenate(keys)
+                threshold = np.partition(all_keys, len(all_keys) - n_out)[len(all_keys) - n_out]
+                if n_found > 2 * n_out:
+                    selected = all_keys >= threshold
+                    positions, keys = [np.concatenate(positions)[selected]], [all_keys[selected]]
+                    n_found = len(keys[0])
+            starts, ends = np.concatenate((starts[kept], farthest)), np.concatenate((farthest, ends[kept]))
+            bounds = np.concatenate((level_keys, level_keys))
+        all_positions, all_keys = np.concatenate(positions), np.concatenate(keys)
+        selected = RDP.__get_largest(all_keys, n_out)
+        return all_positions[selected], all_keys[selected]
 
     @staticmethod
     def __rdp_points(M, n_out):
@@ -116,30 +225,54 @@ class RDP(Decimator):
             mask.fill(True)
             return mask
 
-        weights = np.empty(M_len)
-        # weights.fill(0)
-        weights[0] = float("inf")
-        weights[M_len - 1] = float("inf")
-
-        stack = [(0, M_len - 1)]
+        mask = np.full(M_len, False)
+        # first and last points are always kept
+        mask[RDP.__refine(M, max(n_out, 2))[0]] = True
+        return mask
 
-        while stack:
-            (start, end) = stack.pop()
-            if end - start <= 1:
-                continue
-            dsq = RDP.dsquared_line_points(M[start], M[end], M[start + 1 : end])
-            max_dist_index = np.argmax(dsq) + start + 1
-            weights[max_dist_index] = np.amax(dsq)
-            stack.append((start, max_dist_index))
-            stack.append((max_dist_index, end))
+    @staticmethod
+    def __get_windows(n_points: int, window_size: int, max_windows: int) -> t.List[t.Tuple[int, int]]:
+        # consecutive windows share their first and last points
+        n_windows = max(1, min(-(-(n_points - 1) // max(window_size - 1, 1)), max_windows))
+        bounds = np.linspace(0, n_points - 1, n_windows + 1).round().astype(int).tolist()
+        return list(zip(bounds[:-1], bounds[1:]))
 
-        maxTolerance = np.sort(weights)[M_len - n_out]
+    def __decimate_windows(self, data: np.ndarray, windows: t.List[t.Tuple[int, int]]) -> np.ndarray:
+        def decimate_window(window: t.Tuple[int, int]) -> t.Any:
+            start, end = window
+            if self._epsilon:
+                return start + np.flatnonzero(RDP.__rdp_epsilon(data[start : end + 1], self._epsilon))
+            # each window provides twice its share of the points, the most significant ones are kept
+            share = 2 * -(-t.cast(int, self._n_out) * (end - start) // (len(data) - 1))
+            positions, keys = RDP.__refine(data[start : end + 1], share)
+            # the first point of a window is the last point of the previous one
+            kept = positions != 0 if start else slice(None)
+            return start + positions[kept], keys[kept]
 
-        return weights >= maxTolerance
+        with ThreadPoolExecutor(max_workers=min(len(windows), os.cpu_count() or 1)) as executor:
+            results = list(executor.map(decimate_window, windows))
+        mask = np.full(len(data), False)
+        if self._epsilon:
+            for positions in results:
+                mask[positions] = True
+            return mask
+        positions = np.concatenate([r[0] for r in results])
+        keys = np.concatenate([r[1] for r in results])
+        n_out = t.cast(int, self._n_out)
+        # window bounds have an infinite key
+        mask[positions[RDP.__get_largest(keys, n_out)]] = True
+        return mask
 
     def decimate(self, data: np.ndarray, payload: t.Dict[str, t.Any]) -> np.ndarray:
+        if not self._epsilon and not self._n_out:
+            raise RuntimeError("RDP Decimator failed to run. Fill in either 'epsilon' or 'n_out' value")
+        n_out = self._n_out or 0
+        if self._window_size and len(data) > self._window_size and (self._epsilon or len(data) > n_out):
+            # window bounds are always kept
+            max_windows = len(data) if self._epsilon else max(1, (n_out - 1) // 2)
+            windows = RDP.__get_windows(len(data), self._window_size, max_windows)
+            if len(windows) > 1:
+                return self.__decimate_windows(data, windows)
         if self._epsilon:
             return RDP.__rdp_epsilon(data, self._epsilon)
-        elif self._n_out:
-            return RDP.__rdp_points(data, self._n_out)
-        raise RuntimeError("RDP Decimator failed to run. Fill in either 'epsilon' or 'n_out' value")
+        return RDP.__rdp_points(data, n_out)
@@ -53,41 +53,60 @@ class ScatterDecimator(Decimator):
         self._binning_ratio = binning_ratio if binning_ratio > 0 else 1
         self._max_overlap_points = max_overlap_points if max_overlap_points is not None else 3
 
+    @staticmethod
+    def __get_positions(values: np.ndarray, size: int) -> np.ndarray:
+        # the positions of the values in size + 1 cells, -1 for missing values
+        missing = np.isnan(values) if values.dtype.kind == "f" else None
+        if missing is not None and missing.any():
+            if missing.all():
+                return np.full(len(values), -1, dtype=np.int64)
+            min_value, max_value = np.amin(values[~missing]), np.amax(values[~missing])
+        else:
+            missing = None
+            min_value, max_value = np.amin(values), np.amax(values)
+        if max_value == min_value:
+            # all the values are in the first cell
+            positions = np.zeros(len(values))
+        else:
+            positions = np.rint((values - min_value) * size / (max_value - min_value))
+        if missing is not None:
+            positions[missing] = -1
+        return positions.astype(np.int64)
+
     def decimate(self, data: np.ndarray, payload: t.Dict[str, t.Any]) -> np.ndarray:
         n_rows = data.shape[0]
         mask = np.empty(n_rows, dtype=bool)
         width = payload.get("width", None)
         height = payload.get("height", None)
-        if width is None or height is None:
+        if width is None or height is None or n_rows == 0:
             mask.fill(True)
             return mask
         mask.fill(False)
         grid_x, grid_y = round(width / self._binning_ratio), round(height / self._binning_ratio)
-        x_col, y_col = data[:, 0], data[:, 1]
-        min_x, max_x = np.amin(x_col), np.amax(x_col)
-        min_y, max_y = np.amin(y_col), np.amax(y_col)
-        min_max_x_diff, min_max_y_diff = max_x - min_x, max_y - min_y
-        x_grid_map = np.rint((x_col - min_x) * grid_x / min_max_x_diff).astype(int)
-        y_grid_map = np.rint((y_col - min_y) * grid_y / min_max_y_diff).astype(int)
-        z_grid_map = None
-        grid_shape = (grid_x + 1, grid_y + 1)
-        if len(data[0]) == 3:
-            grid_z = grid_x
-            grid_shape = (grid_x + 1, grid_y + 1, grid_z + 1)  # type: ignore
-            z_col = data[:, 2]
-            min_z, max_z = np.amin(z_col), np.amax(z_col)
-            min_max_z_diff = max_z - min_z
-            z_grid_map = np.rint((z_col - min_z) * grid_z / min_max_z_diff).astype(int)
-        grid = np.empty(grid_shape, dtype=int)
-        grid.fill(0)
-        if z_grid_map is not None:
-            for i in np.arange(n_rows):
-                if grid[x_grid_map[i], y_grid_map[i], z_grid_map[i]] < self._max_overlap_points:
-                    grid[x_grid_map[i], y_grid_map[i], z_grid_map[i]] += 1
-                    mask[i] = True
+        grid_sizes = [grid_x, grid_y, grid_x] if data.shape[1] == 3 else [grid_x, grid_y]
+        # the index of the grid cell of each point, in row-major order
+        cells = np.zeros(n_rows, dtype=np.int64)
+        valid = np.full(n_rows, True)
+        for dimension, grid_size in enumerate(grid_sizes):
+            positions = ScatterDecimator.__get_positions(data[:, dimension], grid_size)
+            valid &= positions >= 0
+            cells *= grid_size + 1
+            cells += positions
+        # points with missing coordinates are not displayed
+        rows = np.arange(n_rows) if valid.all() else np.flatnonzero(valid)
+        # the points of each cell, in their order
+        if np.prod([size + 1 for size in grid_sizes], dtype=float) * n_rows < np.iinfo(np.int64).max:
+            # sorting the cells and rows at once is faster than a stable sort of the cells
+            keys = cells[rows] * n_rows + rows
+            keys.sort()
+            sorted_cells, order = np.divmod(keys, n_rows)
         else:
-            for i in np.arange(n_rows):
-                if grid[x_grid_map[i], y_grid_map[i]] < self._max_overlap_points:
-                    grid[x_grid_map[i], y_grid_map[i]] += 1
-                    mask[i] = True
+            order = rows[np.argsort(cells[rows], kind="stable")]
+            sorted_cells = cells[order]
+        ranks = np.arange(len(order))
+        if len(order):
+            # rank of each point in its cell
+            group_starts = np.where(np.concatenate(([True], sorted_cells[1:] != sorted_cells[:-1])), ranks, 0)
+            ranks -= np.maximum.accumulate(group_starts)
+        mask[order[ranks < self._max_overlap_points]] = True
         return mask
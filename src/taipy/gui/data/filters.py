@@ -0,0 +1,119 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import operator
+import typing as t
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+_COMPARISONS: t.Dict[str, t.Callable[[t.Any, t.Any], t.Any]] = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+_CONTAINS = "contains"
+_STARTS_WITH = "startswith"
+_TEXT_ACTIONS = (_CONTAINS, _STARTS_WITH)
+# column of the filters that search all the text columns
+_ALL_COLUMNS = "*"
+
+
+def _get_filter_key(filter: t.Dict[str, t.Any]) -> t.Optional[t.Hashable]:
+    """Return a hashable description of a table filter, or None if there is none."""
+    cols = filter.get("cols")
+    key = (
+        filter.get("col"),
+        filter.get("action"),
+        filter.get("value"),
+        filter.get("matchcase", True),
+        tuple(cols) if isinstance(cols, list) else cols,
+    )
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def _get_column(dataframe: pd.DataFrame, col: t.Any) -> pd.Series:
+    if col not in dataframe.columns and dataframe.columns.dtype.name == "int64":
+        col = int(col)
+    return dataframe[col]
+
+
+def _is_text_column(column: pd.Series) -> bool:
+    return column.dtype == object or pd.api.types.is_string_dtype(column.dtype)
+
+
+def _get_search_columns(dataframe: pd.DataFrame, filter: t.Dict[str, t.Any]) -> t.List[t.Any]:
+    """Return the columns of *dataframe* that a filter on all the text columns applies to."""
+    if filter.get("action") not in _TEXT_ACTIONS:
+        raise ValueError(f"Invalid action '{filter.get('action')}' on all columns")
+    cols = filter.get("cols")
+    names = [c for c in cols if c in dataframe.columns] if isinstance(cols, list) else list(dataframe.columns)
+    names = [c for c in names if _is_text_column(dataframe[c])]
+    if not names:
+        raise ValueError("No text column to search")
+    return names
+
+
+def _get_filter_mask(dataframe: pd.DataFrame, filter: t.Dict[str, t.Any]) -> np.ndarray:
+    """Compute the Boolean mask of the rows of *dataframe* that match a table filter.
+
+    A filter is a dictionary that holds:
+
+    - "col": the name of the column to filter on, or "*" to search all the text columns.
+    - "action": either a comparison operator ("==", "!=", "<", "<=", ">" or ">="), "contains"
+      or "startswith". Only the last two apply to all the text columns.
+    - "value": the value to compare the column values to. It is a ISO 8601 string for date
+      columns.
+    - "matchcase" (optional): set to False to make "contains" and "startswith"
+      case-insensitive.
+    - "cols" (optional): the names of the columns searched when "col" is "*". All the text
+      columns are searched if not set.
+
+    Missing values only match the "!=" action.<br/>
+    A ValueError is raised if the filter cannot be applied.
+    """
+    if filter.get("col") == _ALL_COLUMNS:
+        return np.logical_or.reduce(
+            [_get_filter_mask(dataframe, {**filter, "col": c}) for c in _get_search_columns(dataframe, filter)]
+        )
+    column = _get_column(dataframe, filter.get("col"))
+    action = filter.get("action")
+    value = filter.get("value")
+    if action in _TEXT_ACTIONS and not isinstance(value, str):
+        raise ValueError(f"Cannot filter with '{action}' on non string value {value}")
+    if action == _CONTAINS:
+        res = column.str.contains(value, case=bool(filter.get("matchcase", True)), na=False)
+    elif action == _STARTS_WITH:
+        if filter.get("matchcase", True):
+            res = column.str.startswith(value, na=False)
+        else:
+            res = column.str.lower().str.startswith(t.cast(str, value).lower(), na=False)
+    elif action in _COMPARISONS:
+        if isinstance(value, str) and pd.api.types.is_datetime64_any_dtype(column.dtype):
+            # parse the date once: the comparison is done on the column values
+            if getattr(column.dtype, "tz", None) is None:
+                value = datetime.fromisoformat(value[:-1] if value.endswith("Z") else value)
+            else:
+                value = pd.Timestamp(value)
+                if value.tz is None:
+                    value = value.tz_localize("UTC")
+        res = _COMPARISONS[action](column, value)
+    else:
+        raise ValueError(f"Invalid filter action '{action}'")
+    return res.to_numpy(dtype=bool, na_value=False)
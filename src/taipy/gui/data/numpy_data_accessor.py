@@ -15,6 +15,7 @@ import numpy
 import pandas as pd
 
 from ..gui import Gui
+from .data_cache import _DataCache, _get_data_version
 from .data_format import _DataFormat
 from .pandas_data_accessor import _PandasDataAccessor
 
@@ -26,8 +27,24 @@ class _NumpyDataAccessor(_PandasDataAccessor):
     def get_supported_classes() -> t.List[str]:
         return [t.__name__ for t in _NumpyDataAccessor.__types]  # type: ignore
 
+    def __init__(self) -> None:
+        super().__init__()
+        # DataFrames built from the arrays, so that they are not rebuilt for every request
+        self.__dataframe_cache = _DataCache()
+
     def __get_dataframe(self, value: t.Any) -> pd.DataFrame:
-        return pd.DataFrame(value)
+        version = _get_data_version(value)
+        dataframe = self.__dataframe_cache.get(value, version, None)
+        if dataframe is None:
+            dataframe = self.__dataframe_cache.set(value, version, None, pd.DataFrame(value))
+        return dataframe
+
+    def _invalidate(self, value: t.Any) -> None:
+        if isinstance(value, _NumpyDataAccessor.__types):  # type: ignore
+            # the caches of the DataFrame are dropped when it is collected
+            self.__dataframe_cache.invalidate(value)
+        else:
+            super()._invalidate(value)
 
     def get_col_types(self, var_name: str, value: t.Any) -> t.Union[None, t.Dict[str, str]]:  # type: ignore
         if isinstance(value, _NumpyDataAccessor.__types):  # type: ignore
@@ -9,8 +9,11 @@
 # an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 # specific language governing permissions and limitations under the License.
 
+import contextvars
+import hashlib
 import typing as t
-from datetime import datetime
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
 from importlib import util
 
 import numpy as np
@@ -20,9 +23,25 @@ from .._warnings import _warn
 from ..gui import Gui
 from ..types import PropertyType
 from ..utils import _RE_PD_TYPE, _get_date_col_str_name
+from .column_stats import _get_column_stats, _get_stats_request
+from .columnar import _to_columns, _to_records
 from .data_accessor import _DataAccessor
+from .data_cache import _DataCache, _get_data_version
 from .data_format import _DataFormat
-from .utils import _df_data_filter, _df_relayout
+from .decimator.m4 import M4
+from .filters import (
+    _ALL_COLUMNS,
+    _CONTAINS,
+    _STARTS_WITH,
+    _TEXT_ACTIONS,
+    _get_column,
+    _get_filter_key,
+    _get_filter_mask,
+    _get_search_columns,
+    _is_text_column,
+)
+from .search_index import _SearchIndex
+from .utils import _argsort_window, _df_data_filter, _df_relayout, _get_page_range, _is_vectorized
 
 _has_arrow_module = False
 if util.find_spec("pyarrow"):
@@ -37,6 +56,45 @@ class _PandasDataAccessor(_DataAccessor):
 
     __AGGREGATE_FUNCTIONS: t.List[str] = ["count", "sum", "mean", "median", "min", "max", "std", "first", "last"]
 
+    # a sort is limited to the requested rows if they are less than this ratio of a large enough data set
+    __PARTIAL_SORT_MAX_RATIO = 0.1
+    __PARTIAL_SORT_MIN_ROWS = 10000
+
+    # text filters are answered by search indexes on data sets that have at least this number of rows
+    __SEARCH_INDEX_MIN_ROWS = 10000
+    __SEARCH_INDEX_MAX_MEMORY = 1 << 30
+    # memory used by the decimation pyramids
+    __PYRAMID_MAX_MEMORY = 1 << 30
+    # a "contains" filter which value holds one of these characters is a regular expression
+    __REGEX_CHARS = frozenset(".^$*+?{}[]\\|()")
+
+    # number of rows used to estimate the size of the Arrow tables
+    __ARROW_SIZE_SAMPLE = 1000
+    # end of stream marker of the Arrow IPC format
+    __ARROW_EOS = b"\xff\xff\xff\xff\x00\x00\x00\x00"
+
+    def __init__(self) -> None:
+        super().__init__()
+        # sort permutations of the data sets, reused while paging
+        self.__sort_cache = _DataCache()
+        # row masks of the table filters
+        self.__filter_cache = _DataCache()
+        # aggregated data of grouped tables
+        self.__aggregate_cache = _DataCache()
+        # rows of the filtered, aggregated and sorted tables, per client
+        self.__view_cache = _DataCache()
+        # Arrow tables of the transferred columns, that pages are sliced from
+        self.__arrow_cache = _DataCache()
+        # statistics of the columns
+        self.__stats_cache = _DataCache()
+        self.__executor: t.Optional[ThreadPoolExecutor] = None
+        self.__executor_workers = 0
+        # search indexes of the text columns, or the futures of the ones being built
+        self.__search_index_cache = _DataCache(max_entries=16, max_memory=_PandasDataAccessor.__SEARCH_INDEX_MAX_MEMORY)
+        self.__search_executor: t.Optional[ThreadPoolExecutor] = None
+        # decimation pyramids of the chart series, or False if they cannot be built
+        self.__pyramid_cache = _DataCache(max_entries=16, max_memory=_PandasDataAccessor.__PYRAMID_MAX_MEMORY)
+
     @staticmethod
     def get_supported_classes() -> t.List[str]:
         return [t.__name__ for t in _PandasDataAccessor.__types]  # type: ignore
@@ -57,10 +115,6 @@ class _PandasDataAccessor(_DataAccessor):
             _warn(f"Exception raised when calling user function {function_name}()", e)
         return ""
 
-    def __is_date_column(self, data: pd.DataFrame, col_name: str) -> bool:
-        col_types = data.dtypes[data.dtypes.index.astype(str) == col_name]
-        return len(col_types[col_types.astype(str).str.startswith("datetime")]) > 0  # type: ignore
-
     def __build_transferred_cols(
         self,
         gui: Gui,
@@ -71,12 +125,24 @@ class _PandasDataAccessor(_DataAccessor):
         is_copied: t.Optional[bool] = False,
         new_indexes: t.Optional[np.ndarray] = None,
         handle_nan: t.Optional[bool] = False,
+        add_index: t.Optional[bool] = False,
     ) -> pd.DataFrame:
         if isinstance(payload_cols, list) and len(payload_cols):
             col_types = dataframe.dtypes[dataframe.dtypes.index.astype(str).isin(payload_cols)]
         else:
             col_types = dataframe.dtypes
         cols = col_types.index.astype(str).tolist()
+        if new_indexes is not None:
+            # only the transferred rows are processed from now on
+            dataframe = dataframe.iloc[new_indexes]
+            is_copied = False
+        if add_index and _PandasDataAccessor.__INDEX_COL not in dataframe.columns:
+            if not is_copied:
+                # copy the df so that we don't "mess" with the user's data
+                dataframe = dataframe.copy()
+                is_copied = True
+            dataframe[_PandasDataAccessor.__INDEX_COL] = dataframe.index
+            cols.append(_PandasDataAccessor.__INDEX_COL)
         if styles:
             if not is_copied:
                 # copy the df so that we don't "mess" with the user's data
@@ -133,7 +199,6 @@ class _PandasDataAccessor(_DataAccessor):
 
             # remove the date columns from the list of columns
             cols = list(set(cols) - set(datecols))
-        dataframe = dataframe.iloc[new_indexes] if new_indexes is not None else dataframe
         dataframe = dataframe.loc[:, dataframe.dtypes[dataframe.dtypes.index.astype(str).isin(cols)].index]  # type: ignore
         return dataframe
 
@@ -148,16 +213,369 @@ class _PandasDataAccessor(_DataAccessor):
     ):
         try:
             new_col_name = f"{prefix}{column_name}__{function_name}" if column_name else function_name
-            data[new_col_name] = data.apply(
-                _PandasDataAccessor.__user_function,
-                axis=1,
-                args=(gui, column_name, user_function, function_name),
-            )
+            if _is_vectorized(user_function):
+                args: t.List[t.Any] = []
+                if column_name:
+                    args.append(data[column_name])
+                args.extend((data.index, data))
+                if column_name:
+                    args.append(column_name)
+                values = np.asarray(gui._call_function_with_state(user_function, args))
+                if values.shape != (len(data),):
+                    raise ValueError(f"{function_name}() should return {len(data)} values.")
+                data[new_col_name] = values.astype(str)
+            else:
+                data[new_col_name] = data.apply(
+                    _PandasDataAccessor.__user_function,
+                    axis=1,
+                    args=(gui, column_name, user_function, function_name),
+                )
             return new_col_name
         except Exception as e:
             _warn(f"Exception raised when invoking user function {function_name}()", e)
         return False
 
+    @staticmethod
+    def __get_sort_values(data: pd.DataFrame, order_by: t.Any) -> t.Any:
+        if order_by == _PandasDataAccessor.__INDEX_COL and order_by not in data.columns:
+            return data.index.values
+        if data.columns.dtype.name == "int64":
+            order_by = int(order_by)
+        return data[order_by].values
+
+    def __get_sort_indexes(
+        self,
+        data: pd.DataFrame,
+        order_by: t.Any,
+        source: t.Optional[pd.DataFrame],
+        start: int,
+        end: int,
+        descending: bool,
+    ) -> np.ndarray:
+        # source is the user data set that data holds the rows of, if any
+        version = _get_data_version(source) if source is not None else None
+        indexes = self.__sort_cache.get(source, version, order_by)
+        if indexes is None:
+            values = _PandasDataAccessor.__get_sort_values(data, order_by)
+            if (
+                isinstance(values, np.ndarray)
+                and values.ndim == 1
+                and values.dtype.kind in "biufmM"
+                and len(values) >= _PandasDataAccessor.__PARTIAL_SORT_MIN_ROWS
+                and end + 1 <= len(values) * _PandasDataAccessor.__PARTIAL_SORT_MAX_RATIO
+            ):
+                return _argsort_window(values, start, end, descending)
+            indexes = values.argsort(axis=0, kind="stable")
+            indexes.flags.writeable = False
+            self.__sort_cache.set(source, version, order_by, indexes)
+        if descending:
+            # reverse order
+            indexes = indexes[::-1]
+        return indexes[slice(start, end + 1)]
+
+    def __get_filter_mask(
+        self, data: pd.DataFrame, source: pd.DataFrame, filters: t.List[t.Dict[str, t.Any]]
+    ) -> np.ndarray:
+        # source is the user data set that data holds the rows of
+        version = _get_data_version(source)
+        keys = [_get_filter_key(fd) for fd in filters]
+        filters_key = tuple(keys) if all(k is not None for k in keys) else None
+        mask = self.__filter_cache.get(source, version, filters_key)
+        if mask is None:
+            for fd, key in zip(filters, keys):
+                filter_mask = self.__filter_cache.get(source, version, (key,))
+                if filter_mask is None:
+                    filter_mask = self.__get_text_filter_mask(data, source, version, fd)
+                if filter_mask is None:
+                    filter_mask = _get_filter_mask(data, fd)
+                    filter_mask.flags.writeable = False
+                    if key is not None:
+                        self.__filter_cache.set(source, version, (key,), filter_mask)
+                mask = filter_mask if mask is None else mask & filter_mask
+            if filters_key is not None and len(filters) > 1:
+                self.__filter_cache.set(source, version, filters_key, mask)
+        return mask
+
+    def __get_text_filter_mask(
+        self, data: pd.DataFrame, source: pd.DataFrame, version: t.Optional[t.Hashable], filter: t.Dict[str, t.Any]
+    ) -> t.Optional[np.ndarray]:
+        # the mask of a text filter computed by the search indexes, None if they cannot be used (yet)
+        action = filter.get("action")
+        value = filter.get("value")
+        if (
+            version is None
+            or len(data) < _PandasDataAccessor.__SEARCH_INDEX_MIN_ROWS
+            or action not in _TEXT_ACTIONS
+            or not isinstance(value, str)
+            or (action == _CONTAINS and any(c in _PandasDataAccessor.__REGEX_CHARS for c in value))
+        ):
+            return None
+        col = filter.get("col")
+        if col == _ALL_COLUMNS:
+            columns = {c: data[c] for c in _get_search_columns(data, filter)}
+        else:
+            columns = {col: _get_column(data, col)}
+            if not _is_text_column(columns[col]):
+                return None
+        indexes = [self.__get_search_index(source, version, name, column) for name, column in columns.items()]
+        if any(index is None for index in indexes):
+            return None
+        return np.logical_or.reduce(
+            [
+                t.cast(_SearchIndex, index).get_mask(value, bool(filter.get("matchcase", True)), action == _STARTS_WITH)
+                for index in indexes
+            ]
+        )
+
+    def __get_search_index(
+        self, source: pd.DataFrame, version: t.Optional[t.Hashable], name: t.Any, column: pd.Series
+    ) -> t.Optional[_SearchIndex]:
+        entry = self.__search_index_cache.get(source, version, name)
+        if entry is None:
+            # the index is built in the background: the column is scanned in the meantime
+            if self.__search_executor is None:
+                self.__search_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="taipy-search")
+            self.__search_index_cache.set(
+                source, version, name, self.__search_executor.submit(_SearchIndex, column), size=0
+            )
+            return None
+        if isinstance(entry, Future):
+            if not entry.done():
+                return None
+            index = entry.result() if entry.exception() is None else None
+            if index is None or index.size > _PandasDataAccessor.__SEARCH_INDEX_MAX_MEMORY:
+                # the column is always scanned
+                self.__search_index_cache.set(source, version, name, False, size=0)
+                return None
+            return self.__search_index_cache.set(source, version, name, index, size=index.size)
+        return entry or None
+
+    def __filter_rows(
+        self, data: pd.DataFrame, source: pd.DataFrame, filters: t.List[t.Dict[str, t.Any]]
+    ) -> t.Optional[np.ndarray]:
+        try:
+            return np.flatnonzero(self.__get_filter_mask(data, source, filters))
+        except Exception as e:
+            _warn(f"Dataframe filtering: invalid filters {filters} on {data.head()}", e)
+        return None
+
+    def __get_stats(
+        self, var_name: str, value: pd.DataFrame, payload: t.Dict[str, t.Any], request: t.Tuple[t.List[t.Any], int, int]
+    ) -> t.Dict[str, t.Any]:
+        columns, top, bins = request
+        filters = payload.get("filters")
+        if not isinstance(filters, list) or len(filters) == 0:
+            filters = None
+        keys = [_get_filter_key(fd) for fd in filters or []]
+        filters_key = tuple(keys) if all(k is not None for k in keys) else None
+        version = _get_data_version(value) if filters_key is not None else None
+        rows: t.Optional[np.ndarray] = None
+        stats: t.Dict[str, t.Any] = {}
+        for col in columns:
+            key = (col, top, bins, filters_key)
+            col_stats = self.__stats_cache.get(value, version, key)
+            if col_stats is None:
+                try:
+                    if filters and rows is None:
+                        rows = self.__filter_rows(value, value, filters)
+                    column = _get_column(value, col)
+                    if rows is not None:
+                        column = column.iloc[rows]
+                    counts = column.value_counts(dropna=False, sort=False)
+                    col_stats = _get_column_stats(counts.index.to_series(), counts.to_numpy(), top, bins)
+                except Exception as e:
+                    _warn(f"Cannot compute the statistics of column {col} of {var_name}.", e)
+                    continue
+                self.__stats_cache.set(value, version, key, col_stats)
+            stats[col] = col_stats
+        return {"pagekey": payload.get("pagekey", "unknown page"), "value": {"stats": stats}}
+
+    def __get_executor(self, max_workers: int) -> ThreadPoolExecutor:
+        if self.__executor is None or self.__executor_workers != max_workers:
+            if self.__executor is not None:
+                self.__executor.shutdown(wait=False)
+            self.__executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="taipy-data")
+            self.__executor_workers = max_workers
+        return self.__executor
+
+    def __aggregate(
+        self, gui: Gui, data: pd.DataFrame, aggregates: t.List[str], applies_with_fn: t.Dict[str, t.Any]
+    ) -> pd.DataFrame:
+        grouped = data.groupby(aggregates)
+        max_workers = gui._get_config("data_workers", 0)
+        if (
+            max_workers > 1
+            and len(applies_with_fn) > 1
+            and any(callable(f) for f in applies_with_fn.values())
+            # build the groups before they are shared
+            and grouped.ngroups > 0
+        ):
+            # user functions are evaluated concurrently, one column per task
+            aggregated = pd.concat(
+                list(
+                    self.__get_executor(max_workers).map(
+                        lambda col_fn: grouped[col_fn[0]].agg(col_fn[1]), applies_with_fn.items()
+                    )
+                ),
+                axis=1,
+            )
+        else:
+            aggregated = grouped.agg(applies_with_fn)
+        if _PandasDataAccessor.__INDEX_COL not in aggregated.columns:
+            # index of the first row of each group
+            aggregated[_PandasDataAccessor.__INDEX_COL] = (
+                data[aggregates]
+                .assign(**{_PandasDataAccessor.__INDEX_COL: data.index})
+                .groupby(aggregates)[_PandasDataAccessor.__INDEX_COL]
+                .first()
+            )
+        return aggregated
+
+    def __get_aggregated_data(
+        self,
+        gui: Gui,
+        data: pd.DataFrame,
+        rows: t.Optional[np.ndarray],
+        source: pd.DataFrame,
+        filters: t.Optional[t.List[t.Dict[str, t.Any]]],
+        aggregates: t.List[str],
+        applies_with_fn: t.Dict[str, t.Any],
+    ) -> pd.DataFrame:
+        # source is the user data set that data holds the rows of, rows are the filtered ones
+        version = _get_data_version(source)
+        key: t.Optional[t.Hashable] = (
+            tuple(_get_filter_key(fd) for fd in filters) if filters else None,
+            tuple(aggregates),
+            tuple((str(k), v) for k, v in applies_with_fn.items()),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+        aggregated = self.__aggregate_cache.get(source, version, key) if key is not None else None
+        if aggregated is None:
+            aggregated = self.__aggregate(gui, data if rows is None else data.iloc[rows], aggregates, applies_with_fn)
+            if key is not None:
+                self.__aggregate_cache.set(source, version, key, aggregated)
+        return aggregated
+
+    @staticmethod
+    def __get_view_key(
+        gui: Gui,
+        var_name: str,
+        filters: t.Optional[t.List[t.Dict[str, t.Any]]],
+        aggregates: t.Optional[t.List[str]],
+        applies: t.Optional[t.Dict[str, str]],
+        columns: t.List[str],
+        order_by: t.Optional[str],
+        descending: bool,
+    ) -> t.Optional[t.Hashable]:
+        # views are dropped when their client disconnects
+        if not (client_id := gui._get_connected_client_id()):
+            return None
+        key = (
+            client_id,
+            var_name,
+            tuple(_get_filter_key(fd) for fd in filters) if filters else None,
+            (tuple(aggregates), tuple(sorted(applies.items())), tuple(columns)) if aggregates and applies else None,
+            order_by,
+            descending,
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def __get_pyramid(self, data: pd.DataFrame, decimator: M4, x_column: str, y_column: str) -> t.Any:
+        # the pyramid the decimator decimates a series of the data set from, or None
+        version = _get_data_version(data)
+        if version is None:
+            return None
+        key = (type(decimator).__name__, x_column, y_column)
+        pyramid = self.__pyramid_cache.get(data, version, key)
+        if pyramid is None:
+            x = data[x_column].to_numpy() if x_column else data.index.to_numpy()
+            pyramid = decimator._build_pyramid(x, data[y_column].to_numpy())
+            if pyramid is None:
+                self.__pyramid_cache.set(data, version, key, False, size=0)
+            else:
+                self.__pyramid_cache.set(data, version, key, pyramid, size=pyramid.nbytes)
+        return pyramid or None
+
+    @staticmethod
+    def __get_arrow_size(data: pd.DataFrame, columns: t.List[str]) -> float:
+        # an estimate of the size of the Arrow table of the transferred columns, from a sample of the rows
+        names = [c for c in data.columns if not columns or str(c) in columns]
+        nb_rows = len(data)
+        if nb_rows == 0 or not names:
+            return 0
+        sample = data[names].iloc[:: max(1, nb_rows // _PandasDataAccessor.__ARROW_SIZE_SAMPLE)]
+        # the index column is added, and dates are transferred as strings
+        row_size = sample.memory_usage(index=False, deep=True).sum() / len(sample) + 8
+        row_size += 32 * sum(1 for c in names if pd.api.types.is_datetime64_any_dtype(data[c].dtype))
+        return row_size * nb_rows
+
+    def __get_arrow_data(
+        self, gui: Gui, data: pd.DataFrame, columns: t.List[str], handle_nan: bool
+    ) -> t.Optional[t.Tuple[t.Any, t.Optional[bytes], t.Optional[str]]]:
+        # the Arrow table of the transferred columns, with its serialized schema and the schema id
+        version = _get_data_version(data)
+        if version is None:
+            return None
+        key = (tuple(columns), handle_nan)
+        arrow_data = self.__arrow_cache.get(data, version, key)
+        if arrow_data is None:
+            if self.__get_arrow_size(data, columns) > self.__arrow_cache.max_memory:
+                # the table could not be cached: only the page is converted
+                return None
+            dataframe = self.__build_transferred_cols(gui, columns, data, handle_nan=handle_nan, add_index=True)
+            table = pa.Table.from_pandas(dataframe, preserve_index=False).replace_schema_metadata(None)
+            schema: t.Optional[bytes] = None
+            schema_id: t.Optional[str] = None
+            # dictionary batches would have to be sent with the record batches
+            if not any(pa.types.is_dictionary(f.type) for f in table.schema):
+                schema = table.schema.serialize().to_pybytes()
+                schema_id = hashlib.sha1(schema).hexdigest()  # nosec
+            arrow_data = (table, schema, schema_id)
+            self.__arrow_cache.set(data, version, key, arrow_data, table.nbytes)
+        return arrow_data
+
+    def __format_arrow_page(
+        self,
+        arrow_data: t.Tuple[t.Any, t.Optional[bytes], t.Optional[str]],
+        indexes: t.Union[slice, np.ndarray],
+        start: int,
+        rowcount: int,
+        schema_id: t.Optional[str],
+    ) -> t.Dict[str, t.Any]:
+        table, schema, table_schema_id = arrow_data
+        if isinstance(indexes, slice):
+            # no copy
+            page = table.slice(indexes.start, max(0, indexes.stop - indexes.start))
+        else:
+            page = table.take(pa.array(indexes))
+        ret: t.Dict[str, t.Any] = {
+            "format": str(_DataFormat.APACHE_ARROW.value),
+            "rowcount": rowcount,
+            "start": start,
+            "orient": "records",
+        }
+        if table_schema_id is None:
+            sink = pa.BufferOutputStream()
+            with pa.ipc.new_stream(sink, page.schema) as writer:
+                writer.write_table(page)
+            ret["data"] = sink.getvalue().to_pybytes()
+        else:
+            # the front-end prepends the schema to the record batches
+            ret["schemaId"] = table_schema_id
+            if schema_id != table_schema_id:
+                ret["schema"] = schema
+            ret["data"] = (
+                b"".join(b.serialize().to_pybytes() for b in page.to_batches()) + _PandasDataAccessor.__ARROW_EOS
+            )
+        return ret
+
     def __format_data(
         self,
         data: pd.DataFrame,
@@ -167,6 +585,7 @@ class _PandasDataAccessor(_DataAccessor):
         rowcount: t.Optional[int] = None,
         data_extraction: t.Optional[bool] = None,
         handle_nan: t.Optional[bool] = False,
+        columnar: t.Optional[bool] = False,
     ) -> t.Dict[str, t.Any]:
         ret: t.Dict[str, t.Any] = {
             "format": str(data_format.value),
@@ -194,21 +613,41 @@ class _PandasDataAccessor(_DataAccessor):
             # Convert buffer to Python bytes and return
             ret["data"] = buf.to_pybytes()
             ret["orient"] = orient
+        elif columnar or orient == "list":
+            # the front-end rebuilds the records from the columns
+            ret["data"] = _to_columns(data)
+            if orient != "list":
+                ret["orient"] = orient
+                ret["columnar"] = True
         else:
-            # Workaround for Python built in JSON encoder that does not yet support ignore_nan
-            ret["data"] = data.replace([np.nan, pd.NA], [None, None]).to_dict(orient=orient)  # type: ignore
+            ret["data"] = _to_records(data)
         return ret
 
     def get_col_types(self, var_name: str, value: t.Any) -> t.Union[None, t.Dict[str, str]]:  # type: ignore
         if isinstance(value, _PandasDataAccessor.__types):  # type: ignore
-            return {str(k): v for k, v in value.dtypes.apply(lambda x: x.name.lower()).items()}
+            return dict(_PandasDataAccessor.__get_df_col_types(value))
         elif isinstance(value, list):
             ret_dict: t.Dict[str, str] = {}
             for i, v in enumerate(value):
-                ret_dict.update({f"{i}/{k}": v for k, v in v.dtypes.apply(lambda x: x.name.lower()).items()})
+                ret_dict.update({f"{i}/{k}": v for k, v in _PandasDataAccessor.__get_df_col_types(v)})
             return ret_dict
         return None
 
+    @staticmethod
+    def __get_df_col_types(value: pd.DataFrame) -> t.Tuple[t.Tuple[str, str], ...]:
+        signature = tuple(zip(value.columns, value.dtypes))
+        try:
+            return _PandasDataAccessor.__get_col_types(signature)
+        except TypeError:
+            # unhashable column names
+            return _PandasDataAccessor.__get_col_types.__wrapped__(signature)
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def __get_col_types(signature: t.Tuple[t.Tuple[t.Any, t.Any], ...]) -> t.Tuple[t.Tuple[str, str], ...]:
+        # the column types only depend on the column names and types
+        return tuple((str(k), v.name.lower()) for k, v in signature)
+
     def __get_data(  # noqa: C901
         self,
         gui: Gui,
@@ -217,119 +656,146 @@ class _PandasDataAccessor(_DataAccessor):
         payload: t.Dict[str, t.Any],
         data_format: _DataFormat,
         col_prefix: t.Optional[str] = "",
+        on_changes: t.Optional[t.List[t.Tuple[str, t.Any]]] = None,
     ) -> t.Dict[str, t.Any]:
         columns = payload.get("columns", [])
         if col_prefix:
             columns = [c[len(col_prefix) :] if c.startswith(col_prefix) else c for c in columns]
+        if (stats_request := _get_stats_request(payload)) is not None:
+            return self.__get_stats(var_name, value, payload, stats_request)
         ret_payload = {"pagekey": payload.get("pagekey", "unknown page")}
         paged = not payload.get("alldata", False)
         is_copied = False
+        # the user data set, as long as value holds the same rows
+        source: t.Optional[pd.DataFrame] = value
 
-        # add index if not chart
-        if paged:
-            if _PandasDataAccessor.__INDEX_COL not in value.columns:
-                value = value.copy()
-                is_copied = True
-                value[_PandasDataAccessor.__INDEX_COL] = value.index
-            if columns and _PandasDataAccessor.__INDEX_COL not in columns:
-                columns.append(_PandasDataAccessor.__INDEX_COL)
+        # add index if not chart: it is set on the transferred rows only
+        if paged and columns and _PandasDataAccessor.__INDEX_COL not in columns:
+            columns.append(_PandasDataAccessor.__INDEX_COL)
 
-        # filtering
         filters = payload.get("filters")
-        if isinstance(filters, list) and len(filters) > 0:
-            query = ""
-            vars = []
-            for fd in filters:
-                col = fd.get("col")
-                val = fd.get("value")
-                action = fd.get("action")
-                if isinstance(val, str):
-                    if self.__is_date_column(value, col):
-                        val = datetime.fromisoformat(val[:-1])
-                    vars.append(val)
-                val = f"@vars[{len(vars) - 1}]" if isinstance(val, (str, datetime)) else val
-                right = f".str.contains({val})" if action == "contains" else f" {action} {val}"
-                if query:
-                    query += " and "
-                query += f"`{col}`{right}"
-            try:
-                value = value.query(query)
-                is_copied = True
-            except Exception as e:
-                _warn(f"Dataframe filtering: invalid query '{query}' on {value.head()}", e)
+        if not isinstance(filters, list) or len(filters) == 0:
+            filters = None
+        # positions of the selected rows in value
+        rows: t.Optional[np.ndarray] = None
 
         if paged:
             aggregates = payload.get("aggregates")
             applies = payload.get("applies")
-            if isinstance(aggregates, list) and len(aggregates) and isinstance(applies, dict):
-                applies_with_fn = {
-                    k: v if v in _PandasDataAccessor.__AGGREGATE_FUNCTIONS else gui._get_user_function(v)
-                    for k, v in applies.items()
-                }
+            if not isinstance(aggregates, list) or not len(aggregates) or not isinstance(applies, dict):
+                aggregates = None
+            order_by = payload.get("orderby")
+            if not isinstance(order_by, str) or not len(order_by):
+                order_by = None
+            descending = payload.get("sort") == "desc"
+            view_key = (
+                self.__get_view_key(gui, var_name, filters, aggregates, applies, columns, order_by, descending)
+                if filters or aggregates
+                else None
+            )
+            version = _get_data_version(source) if view_key is not None else None
+            view_source = source
+            view = self.__view_cache.get(view_source, version, view_key)
+            if view is None:
+                if filters:
+                    rows = self.__filter_rows(value, source, filters)
+                if aggregates:
+                    applies_with_fn = {
+                        k: v if v in _PandasDataAccessor.__AGGREGATE_FUNCTIONS else gui._get_user_function(v)
+                        for k, v in t.cast(t.Dict[str, str], applies).items()
+                    }
 
-                for col in columns:
-                    if col not in applies_with_fn.keys():
-                        applies_with_fn[col] = "first"
-                try:
-                    value = value.groupby(aggregates).agg(applies_with_fn)
-                except Exception:
-                    _warn(f"Cannot aggregate {var_name} with groupby {aggregates} and aggregates {applies}.")
+                    for col in columns:
+                        if col not in applies_with_fn.keys() and col in value.columns:
+                            applies_with_fn[col] = "first"
+                    try:
+                        value = self.__get_aggregated_data(
+                            gui, value, rows, source, filters, aggregates, applies_with_fn
+                        )
+                        rows = None
+                        source = None
+                    except Exception:
+                        _warn(f"Cannot aggregate {var_name} with groupby {aggregates} and aggregates {applies}.")
+                # the order of the whole view is needed if it is cached
+                if order_by is not None and (rows is not None or source is None):
+                    try:
+                        sort_values = _PandasDataAccessor.__get_sort_values(value, order_by)
+                        indexes = (sort_values if rows is None else sort_values[rows]).argsort(axis=0, kind="stable")
+                        if descending:
+                            # reverse order
+                            indexes = indexes[::-1]
+                        rows = indexes if rows is None else rows[indexes]
+                    except Exception:
+                        _warn(f"Cannot sort {var_name} on columns {order_by}.")
+                    order_by = None
+                if view_key is not None:
+                    if rows is None:
+                        rows = np.arange(len(value))
+                    rows.flags.writeable = False
+                    self.__view_cache.set(view_source, version, view_key, (None if source is not None else value, rows))
+            else:
+                if view[0] is not None:
+                    value = view[0]
+                    # the cached data must not be modified
+                    is_copied = False
+                rows = view[1]
+                order_by = None
             inf = payload.get("infinite")
             if inf is not None:
                 ret_payload["infinite"] = inf
             # real number of rows is needed to calculate the number of pages
-            rowcount = len(value)
-            # here we'll deal with start and end values from payload if present
-            if isinstance(payload["start"], int):
-                start = int(payload["start"])
-            else:
-                try:
-                    start = int(str(payload["start"]), base=10)
-                except Exception:
-                    _warn(f'start should be an int value {payload["start"]}.')
-                    start = 0
-            if isinstance(payload["end"], int):
-                end = int(payload["end"])
-            else:
-                try:
-                    end = int(str(payload["end"]), base=10)
-                except Exception:
-                    end = -1
-            if start < 0 or start >= rowcount:
-                start = 0
-            if end < 0 or end >= rowcount:
-                end = rowcount - 1
+            rowcount = len(value) if rows is None else len(rows)
+            start, end = _get_page_range(payload, rowcount)
             # deal with sort
-            order_by = payload.get("orderby")
-            if isinstance(order_by, str) and len(order_by):
+            if order_by is not None:
                 try:
-                    if value.columns.dtype.name == "int64":
-                        order_by = int(order_by)
-                    new_indexes = value[order_by].values.argsort(axis=0)
-                    if payload.get("sort") == "desc":
-                        # reverse order
-                        new_indexes = new_indexes[::-1]
-                    new_indexes = new_indexes[slice(start, end + 1)]
+                    new_indexes = self.__get_sort_indexes(value, order_by, source, start, end, descending)
                 except Exception:
                     _warn(f"Cannot sort {var_name} on columns {order_by}.")
                     new_indexes = slice(start, end + 1)  # type: ignore
+            elif rows is not None:
+                new_indexes = rows[start : end + 1]
             else:
                 new_indexes = slice(start, end + 1)  # type: ignore
-            value = self.__build_transferred_cols(
-                gui,
-                columns,
-                value,
-                styles=payload.get("styles"),
-                tooltips=payload.get("tooltips"),
-                is_copied=is_copied,
-                new_indexes=new_indexes,
-                handle_nan=payload.get("handlenan", False),
-            )
-            dictret = self.__format_data(
-                value, data_format, "records", start, rowcount, handle_nan=payload.get("handlenan", False)
+            styles = payload.get("styles")
+            tooltips = payload.get("tooltips")
+            handle_nan = bool(payload.get("handlenan", False))
+            arrow_data = (
+                self.__get_arrow_data(gui, value, columns, handle_nan)
+                if data_format == _DataFormat.APACHE_ARROW and _has_arrow_module and not styles and not tooltips
+                else None
             )
+            if arrow_data is not None:
+                # the page is taken from the Arrow table of the whole data set
+                dictret = self.__format_arrow_page(arrow_data, new_indexes, start, rowcount, payload.get("arrowschema"))
+            else:
+                value = self.__build_transferred_cols(
+                    gui,
+                    columns,
+                    value,
+                    styles=styles,
+                    tooltips=tooltips,
+                    is_copied=is_copied,
+                    new_indexes=new_indexes,
+                    handle_nan=handle_nan,
+                    add_index=True,
+                )
+                dictret = self.__format_data(
+                    value,
+                    data_format,
+                    "records",
+                    start,
+                    rowcount,
+                    handle_nan=handle_nan,
+                    columnar=payload.get("columnar", False),
+                )
         else:
             ret_payload["alldata"] = True
+            if filters:
+                rows = self.__filter_rows(value, source, filters)
+                if rows is not None:
+                    value = value.iloc[rows]
+                    is_copied = True
             decimator_payload: t.Dict[str, t.Any] = payload.get("decimatorPayload", {})
             decimators = decimator_payload.get("decimators", [])
             nb_rows_max = decimator_payload.get("width")
@@ -345,7 +811,12 @@ class _PandasDataAccessor(_DataAccessor):
                         decimator_pl.get("zAxis", ""),
                     )
                     chart_mode = decimator_pl.get("chartMode", "")
-                    if decimator_instance._zoom and "relayoutData" in decimator_payload and not z_column:
+                    if (
+                        decimator_instance._zoom
+                        and not decimator_instance._FILTERS_RANGE
+                        and "relayoutData" in decimator_payload
+                        and not z_column
+                    ):
                         relayoutData = decimator_payload.get("relayoutData", {})
                         x0 = relayoutData.get("xaxis.range[0]")
                         x1 = relayoutData.get("xaxis.range[1]")
@@ -358,16 +829,32 @@ class _PandasDataAccessor(_DataAccessor):
 
                     if nb_rows_max and decimator_instance._is_applicable(value, nb_rows_max, chart_mode):
                         try:
-                            value, is_copied = _df_data_filter(
-                                value,
-                                x_column,
-                                y_column,
-                                z_column,
-                                decimator=decimator_instance,
-                                payload=decimator_payload,
-                                is_copied=is_copied,
-                            )
-                            gui._call_on_change(f"{var_name}.{decimator}.nb_rows", len(value))
+                            # the pyramid is built from the user data set, before any row is dropped
+                            if (
+                                isinstance(decimator_instance, M4)
+                                and decimator_instance._use_pyramid
+                                and source is not None
+                                and value is source
+                                and not z_column
+                                and (pyramid := self.__get_pyramid(value, decimator_instance, x_column, y_column))
+                                is not None
+                            ):
+                                value = value.iloc[decimator_instance._decimate_pyramid(pyramid, decimator_payload)]
+                                is_copied = True
+                            else:
+                                value, is_copied = _df_data_filter(
+                                    value,
+                                    x_column,
+                                    y_column,
+                                    z_column,
+                                    decimator=decimator_instance,
+                                    payload=decimator_payload,
+                                    is_copied=is_copied,
+                                )
+                            if on_changes is None:
+                                gui._call_on_change(f"{var_name}.{decimator}.nb_rows", len(value))
+                            else:
+                                on_changes.append((f"{var_name}.{decimator}.nb_rows", len(value)))
                         except Exception as e:
                             _warn(f"Limit rows error with {decimator} for Dataframe", e)
             value = self.__build_transferred_cols(gui, columns, value, is_copied=is_copied)
@@ -375,6 +862,109 @@ class _PandasDataAccessor(_DataAccessor):
         ret_payload["value"] = dictret
         return ret_payload
 
+    def _invalidate(self, value: t.Any) -> None:
+        for v in value if isinstance(value, list) else [value]:
+            if isinstance(v, _PandasDataAccessor.__types):  # type: ignore
+                self.__sort_cache.invalidate(v)
+                self.__filter_cache.invalidate(v)
+                self.__aggregate_cache.invalidate(v)
+                self.__view_cache.invalidate(v)
+                self.__arrow_cache.invalidate(v)
+                self.__search_index_cache.invalidate(v)
+                self.__stats_cache.invalidate(v)
+                self.__pyramid_cache.invalidate(v)
+
+    def _drop_client(self, client_id: str) -> None:
+        self.__view_cache.discard(lambda key: isinstance(key, tuple) and key[0] == client_id)
+
+    def _append_rows(self, value: t.Any, rows: t.Any) -> t.Any:
+        if not isinstance(value, pd.DataFrame):
+            return None
+        if not isinstance(rows, pd.DataFrame):
+            if isinstance(rows, dict):
+                # a single row or the values of each column
+                rows = pd.DataFrame([rows] if all(np.ndim(v) == 0 for v in rows.values()) else rows)
+            else:
+                rows = list(rows)
+                rows = pd.DataFrame(rows, columns=None if rows and isinstance(rows[0], dict) else value.columns)
+        # a default index goes on numbering the rows
+        index = value.index
+        ignore_index = isinstance(index, pd.RangeIndex) and index.start == 0 and index.step == 1
+        if not len(value):
+            return rows.reset_index(drop=True) if ignore_index else rows
+        return pd.concat([value, rows], ignore_index=ignore_index)
+
+    def _get_data_delta(
+        self,
+        guiApp: t.Any,
+        var_name: str,
+        value: t.Any,
+        payload: t.Dict[str, t.Any],
+        start: int,
+        data_format: _DataFormat,
+    ) -> t.Optional[t.Dict[str, t.Any]]:
+        # the appended rows can only be merged with data that is neither filtered, sorted, grouped nor decimated
+        if not isinstance(value, pd.DataFrame) or payload.get("filters"):
+            return None
+        if payload.get("alldata", False):
+            if payload.get("decimatorPayload", {}).get("decimators"):
+                return None
+            return self.__get_data(guiApp, var_name, value.iloc[start:], payload, data_format)
+        if payload.get("orderby") or payload.get("aggregates"):
+            return None
+        try:
+            first = max(start, int(str(payload.get("start")), base=10))
+            last = int(str(payload.get("end")), base=10)
+        except Exception:
+            return None
+        rowcount = len(value)
+        last = rowcount - 1 if last < 0 else min(last, rowcount - 1)
+        if first <= last:
+            # the new rows that belong to the requested page
+            return self.__get_data(guiApp, var_name, value, {**payload, "start": first, "end": last}, data_format)
+        ret_payload: t.Dict[str, t.Any] = {
+            "pagekey": payload.get("pagekey", "unknown page"),
+            "value": {"format": str(_DataFormat.JSON.value), "rowcount": rowcount, "start": first, "data": []},
+        }
+        if (inf := payload.get("infinite")) is not None:
+            ret_payload["infinite"] = inf
+        return ret_payload
+
+    def __get_multi_data(
+        self, gui: Gui, var_name: str, value: t.List[t.Any], payload: t.Dict[str, t.Any], data_format: _DataFormat
+    ) -> t.List[t.Dict[str, t.Any]]:
+        frames = [(i, v) for i, v in enumerate(value) if isinstance(v, pd.DataFrame)]
+        max_workers = gui._get_config("data_workers", 0)
+        if not max_workers or max_workers < 2 or len(frames) < 2:
+            return [
+                self.__get_data(gui, var_name, v, payload, data_format, f"{i}/") if isinstance(v, pd.DataFrame) else {}
+                for i, v in enumerate(value)
+            ]
+        # the traces are processed concurrently, in the context (request, client id...) of the caller
+        # user callbacks are invoked afterwards, in this thread and in the order of the traces
+        on_changes: t.List[t.List[t.Tuple[str, t.Any]]] = [[] for _ in frames]
+        futures = [
+            self.__get_executor(max_workers).submit(
+                contextvars.copy_context().run,
+                self.__get_data,
+                gui,
+                var_name,
+                v,
+                payload,
+                data_format,
+                f"{i}/",
+                on_changes[n],
+            )
+            for n, (i, v) in enumerate(frames)
+        ]
+        results: t.List[t.Dict[str, t.Any]] = [{} for _ in value]
+        for (i, _), future in zip(frames, futures):
+            results[i] = future.result()
+        for changes in on_changes:
+            for name, nb_rows in changes:
+                gui._call_on_change(name, nb_rows)
+        return results
+
     def get_data(
         self, gui: Gui, var_name: str, value: t.Any, payload: t.Dict[str, t.Any], data_format: _DataFormat
     ) -> t.Dict[str, t.Any]:
@@ -387,12 +977,7 @@ class _PandasDataAccessor(_DataAccessor):
                     "pagekey": payload.get("pagekey", "unknown page"),
                 }
                 data = []
-                for i, v in enumerate(value):
-                    ret = (
-                        self.__get_data(gui, var_name, v, payload, data_format, f"{i}/")
-                        if isinstance(v, pd.DataFrame)
-                        else {}
-                    )
+                for ret in self.__get_multi_data(gui, var_name, value, payload, data_format):
                     ret_val = ret.get("value", {})
                     data.append(ret_val.pop("data", None))
                     ret_payload.get("value", {}).update(ret_val)
@@ -0,0 +1,131 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import sys
+import typing as t
+
+import numpy as np
+import pandas as pd
+
+
+def _get_trigram_hashes(chars: np.ndarray) -> np.ndarray:
+    # collisions only add candidates, that are compared to the searched text anyway
+    with np.errstate(over="ignore"):
+        return (
+            (chars[:-2] * np.uint32(0x9E3779B1))
+            ^ (chars[1:-1] * np.uint32(0x85EBCA77))
+            ^ (chars[2:] * np.uint32(0xC2B2AE3D))
+        )
+
+
+def _to_chars(text: str) -> np.ndarray:
+    return np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+
+
+class _SearchIndex(object):
+    """Trigram index of the text values of a column.
+
+    The index answers the "contains" and "startswith" table filters without comparing the
+    searched text to all the values: the candidate values are the ones that hold all the
+    trigrams of the searched text, and only those are compared to it.<br/>
+    The index is built on the distinct values of the column, case-folded, so that it answers
+    both case-sensitive and case-insensitive searches.
+    """
+
+    # number of characters indexed at once when the index is built
+    __CHUNK_SIZE = 1 << 23
+
+    def __init__(self, column: pd.Series) -> None:
+        codes, uniques = pd.factorize(column)
+        # missing values have the code -1: the last entry of the masks of the values
+        self.__codes = codes.astype(np.int32, copy=False) if len(uniques) < (1 << 31) else codes
+        self.__values: t.List[t.Optional[str]] = [v if isinstance(v, str) else None for v in uniques]
+        folded = [v.casefold() if v is not None else "" for v in self.__values]
+        self.__keys, self.__offsets, self.__postings = _SearchIndex.__build(folded)
+        self.size = (
+            self.__codes.nbytes
+            + self.__keys.nbytes
+            + self.__offsets.nbytes
+            + self.__postings.nbytes
+            + sum(sys.getsizeof(v) for v in self.__values)
+        )
+
+    @staticmethod
+    def __build(texts: t.List[str]) -> t.Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        # the sorted trigram hashes, and the indexes of the values each one was found in: the ones of
+        # keys[i] are postings[offsets[i] : offsets[i + 1]]
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+        cumulated = np.cumsum(lengths + 1)
+        total = int(cumulated[-1]) if len(cumulated) else 0
+        # the values of a chunk hold about __CHUNK_SIZE characters
+        bounds = np.searchsorted(cumulated, np.arange(_SearchIndex.__CHUNK_SIZE, total, _SearchIndex.__CHUNK_SIZE))
+        limits = [0, *np.unique(bounds).tolist(), len(texts)]
+        entries: t.List[np.ndarray] = []
+        for start, end in zip(limits[:-1], limits[1:]):
+            if start >= end:
+                continue
+            chunk_lengths = lengths[start:end] + 1
+            # values are separated by a character that belongs to the preceding value
+            chars = _to_chars("\0".join(texts[start:end]) + "\0")
+            if len(chars) >= 3:
+                ids = np.repeat(np.arange(start, end, dtype=np.uint32), chunk_lengths)[:-2]
+                # the position of the separator that follows the value of each character
+                value_ends = (np.cumsum(chunk_lengths) - 1)[ids - start]
+                valid = np.arange(len(ids)) + 2 < value_ends
+                hashes = _get_trigram_hashes(chars)[valid].astype(np.uint64)
+                entries.append(np.unique((hashes << np.uint64(32)) | ids[valid]))
+        all_entries = np.sort(np.concatenate(entries)) if entries else np.empty(0, dtype=np.uint64)
+        keys, offsets = np.unique((all_entries >> np.uint64(32)).astype(np.uint32), return_index=True)
+        return keys, np.append(offsets, len(all_entries)), (all_entries & np.uint64(0xFFFFFFFF)).astype(np.uint32)
+
+    def __get_candidates(self, text: str) -> t.Optional[np.ndarray]:
+        # indexes of the values that may hold text, None if they all may
+        chars = _to_chars(text)
+        if len(chars) < 3:
+            return None
+        hashes = np.unique(_get_trigram_hashes(chars))
+        positions = np.searchsorted(self.__keys, hashes)
+        if np.any(positions == len(self.__keys)) or np.any(self.__keys[positions] != hashes):
+            # a trigram is not found
+            return np.empty(0, dtype=np.uint32)
+        starts = self.__offsets[positions]
+        ends = self.__offsets[positions + 1]
+        # intersect the shortest lists first
+        postings = sorted((self.__postings[s:e] for s, e in zip(starts, ends)), key=len)
+        candidates = postings[0]
+        for values in postings[1:]:
+            if len(candidates) == 0:
+                break
+            candidates = np.intersect1d(candidates, values, assume_unique=True)
+        return candidates
+
+    def get_mask(self, text: str, match_case: bool = True, starts_with: bool = False) -> np.ndarray:
+        """Return the Boolean mask of the rows which value holds, or starts with, *text*."""
+        folded = text.casefold()
+        candidates = self.__get_candidates(folded)
+        indexes: t.Iterable[int] = range(len(self.__values)) if candidates is None else candidates.tolist()
+        values = self.__values
+        if match_case:
+            matches = [
+                i
+                for i in indexes
+                if (v := values[i]) is not None and (v.startswith(text) if starts_with else text in v)
+            ]
+        else:
+            matches = [
+                i
+                for i in indexes
+                if (v := values[i]) is not None
+                and (v.casefold().startswith(folded) if starts_with else folded in v.casefold())
+            ]
+        matched = np.zeros(len(values) + 1, dtype=bool)
+        matched[matches] = True
+        return matched[self.__codes]
@@ -0,0 +1,444 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import typing as t
+from datetime import datetime
+
+import pandas as pd
+
+from .._warnings import _warn
+from ..gui import Gui
+from .column_stats import _get_column_stats, _get_stats_request
+from .data_cache import _DataCache
+from .data_format import _DataFormat
+from .filters import _ALL_COLUMNS, _COMPARISONS, _CONTAINS, _TEXT_ACTIONS, _get_filter_key, _get_search_columns
+from .pandas_data_accessor import _PandasDataAccessor
+from .sql_table import _BACKTICK_MODULES, _SQLITE_MODULES, SqlTable
+from .utils import _get_page_range
+
+_SqlParams = t.Union[t.List[t.Any], t.Dict[str, t.Any]]
+
+
+def _quote(name: str, quote: str = '"') -> str:
+    return quote + name.replace(quote, quote * 2) + quote
+
+
+class _SqlQueryBuilder(object):
+    """Builds the queries on the rows of a `SqlTable`, with their parameters."""
+
+    __SQL_OPERATORS = {"==": "=", "!=": "<>"}
+    # escape character of the LIKE patterns
+    __ESCAPE = "!"
+
+    def __init__(self, table: SqlTable, paramstyle: str) -> None:
+        self.__table = table
+        self.__paramstyle = paramstyle
+        self.__quote = table.quote or '"'
+        self.__driver = table._driver or ""
+        params = table.params
+        self.__nb_params = 0
+        if paramstyle in ("named", "pyformat"):
+            self.params: _SqlParams = dict(t.cast(t.Mapping[str, t.Any], params or {}))
+        else:
+            self.params = list(t.cast(t.Sequence[t.Any], params or []))
+            self.__nb_params = len(self.params)
+
+    def param(self, value: t.Any) -> str:
+        """Add a parameter and return its marker."""
+        self.__nb_params += 1
+        if isinstance(self.params, dict):
+            name = f"_tp_p{self.__nb_params}"
+            self.params[name] = value
+            return f":{name}" if self.__paramstyle == "named" else f"%({name})s"
+        self.params.append(value)
+        if self.__paramstyle == "numeric":
+            return f":{self.__nb_params}"
+        return "?" if self.__paramstyle == "qmark" else "%s"
+
+    def quote(self, name: str) -> str:
+        """Quote a column name."""
+        return _quote(name, self.__quote)
+
+    def source(self) -> str:
+        return f"({self.__table.query}) AS _tp_q"
+
+    def condition(self, filter: t.Dict[str, t.Any], columns: pd.DataFrame) -> str:
+        """Translate a table filter (see `_get_filter_mask()`) into a SQL condition."""
+        col = filter.get("col")
+        if col == _ALL_COLUMNS:
+            conditions = [self.condition({**filter, "col": c}, columns) for c in _get_search_columns(columns, filter)]
+            return f"({' OR '.join(conditions)})"
+        if col not in columns.columns:
+            raise ValueError(f"Invalid filter column '{col}'")
+        name = self.quote(str(col))
+        action = filter.get("action")
+        value = filter.get("value")
+        if action in _TEXT_ACTIONS:
+            if not isinstance(value, str):
+                raise ValueError(f"Cannot filter with '{action}' on non string value {value}")
+            matchcase = filter.get("matchcase", True)
+            if matchcase and self.__driver in _SQLITE_MODULES:
+                # LIKE ignores the case of ASCII characters in SQLite
+                position = f"instr({name}, {self.param(value)})"
+                return f"{position} > 0" if action == _CONTAINS else f"{position} = 1"
+            escape = _SqlQueryBuilder.__ESCAPE
+            pattern = "".join(escape + c if c in f"%_{escape}" else c for c in value) + "%"
+            if action == _CONTAINS:
+                pattern = "%" + pattern
+            if not matchcase:
+                return f"LOWER({name}) LIKE {self.param(pattern.lower())} ESCAPE '{escape}'"
+            if self.__driver in _BACKTICK_MODULES:
+                # LIKE ignores the case with the default collations of MySQL and MariaDB
+                return f"CAST({name} AS BINARY) LIKE CAST({self.param(pattern)} AS BINARY) ESCAPE '{escape}'"
+            return f"{name} LIKE {self.param(pattern)} ESCAPE '{escape}'"
+        if action not in _COMPARISONS:
+            raise ValueError(f"Invalid filter action '{action}'")
+        if isinstance(value, str) and pd.api.types.is_datetime64_any_dtype(columns[col].dtype):
+            value = datetime.fromisoformat(value[:-1] if value.endswith("Z") else value)
+        condition = f"{name} {_SqlQueryBuilder.__SQL_OPERATORS.get(action, action)} {self.param(value)}"
+        # missing values only match the "!=" action
+        return f"({condition} OR {name} IS NULL)" if action == "!=" else condition
+
+    def where(self, filters: t.Optional[t.List[t.Dict[str, t.Any]]], columns: pd.DataFrame, *conditions: str) -> str:
+        all_conditions = [self.condition(fd, columns) for fd in filters or []] + list(conditions)
+        return f" WHERE {' AND '.join(all_conditions)}" if all_conditions else ""
+
+
+class _SqlDataAccessor(_PandasDataAccessor):
+    """Data accessor for `SqlTable`.
+
+    Filters, sorting, grouping and paging are executed by the database. The resulting rows
+    are then processed as a DataFrame (styles, tooltips, decimation and serialization).
+    """
+
+    __INDEX_COL = "_tp_index"
+    # number of rows the column types are inferred from
+    __SAMPLE_SIZE = 100
+    __AGGREGATE_FUNCTIONS: t.Dict[str, str] = {
+        "count": "COUNT",
+        "sum": "SUM",
+        "mean": "AVG",
+        "min": "MIN",
+        "max": "MAX",
+    }
+
+    def __init__(self) -> None:
+        super().__init__()
+        # empty DataFrames with the column names and types of the tables
+        self.__columns_cache = _DataCache()
+        # number of rows, by filters and groups
+        self.__count_cache = _DataCache()
+        # index of the last row of the pages that were read, for keyset pagination
+        self.__keys_cache = _DataCache()
+        # statistics of the columns, by filters
+        self.__stats_cache = _DataCache()
+
+    @staticmethod
+    def get_supported_classes() -> t.List[str]:
+        return [f"{SqlTable.__module__}.{SqlTable.__qualname__}"]
+
+    @staticmethod
+    def __to_dataframe(names: t.List[str], rows: t.List[t.Tuple[t.Any, ...]]) -> pd.DataFrame:
+        return pd.DataFrame.from_records(rows, columns=names).infer_objects()
+
+    def __get_columns(self, table: SqlTable) -> pd.DataFrame:
+        version = table._get_version()
+        columns = self.__columns_cache.get(table, version, None)
+        if columns is None:
+            names, rows = table._execute(
+                lambda style: _SqlDataAccessor.__build_sample_query(_SqlQueryBuilder(table, style))
+            )
+            # the type of a column is inferred from its values that are not missing
+            types = [pd.Series([r[i] for r in rows if r[i] is not None]).infer_objects() for i in range(len(names))]
+            columns = pd.DataFrame({i: s.iloc[:0] for i, s in enumerate(types)})
+            columns.columns = pd.Index(names)
+            self.__columns_cache.set(table, version, None, columns)
+        return columns
+
+    @staticmethod
+    def __build_sample_query(builder: _SqlQueryBuilder) -> t.Tuple[str, _SqlParams]:
+        return f"SELECT * FROM {builder.source()} LIMIT {_SqlDataAccessor.__SAMPLE_SIZE}", builder.params
+
+    def get_col_types(self, var_name: str, value: t.Any) -> t.Union[None, t.Dict[str, str]]:  # type: ignore
+        if isinstance(value, SqlTable):
+            return super().get_col_types(var_name, self.__get_columns(value))
+        return None
+
+    def __count(
+        self,
+        table: SqlTable,
+        columns: pd.DataFrame,
+        filters: t.Optional[t.List[t.Dict[str, t.Any]]],
+        group_by: t.Optional[t.List[str]],
+    ) -> int:
+        version = table._get_version()
+        key: t.Optional[t.Hashable] = (
+            tuple(_get_filter_key(fd) for fd in filters or []),
+            tuple(group_by) if group_by else None,
+        )
+        try:
+            hash(key)
+        except TypeError:
+            key = None
+        count = self.__count_cache.get(table, version, key) if key is not None else None
+        if count is None:
+
+            def build(style: str) -> t.Tuple[str, _SqlParams]:
+                builder = _SqlQueryBuilder(table, style)
+                source = f"{builder.source()}{builder.where(filters, columns)}"
+                if group_by:
+                    groups = ", ".join(map(builder.quote, group_by))
+                    source = f"(SELECT 1 AS _tp_g FROM {source} GROUP BY {groups}) AS _tp_c"
+                return f"SELECT COUNT(*) FROM {source}", builder.params
+
+            count = int(table._execute(build)[1][0][0])
+            if key is not None:
+                self.__count_cache.set(table, version, key, count, 0)
+        return count
+
+    @staticmethod
+    def __get_aggregations(
+        columns: pd.DataFrame, aggregates: t.List[str], applies: t.Dict[str, t.Any]
+    ) -> t.List[t.Tuple[str, str]]:
+        # the columns that are not grouped and have no aggregate function are not transferred
+        for col in aggregates:
+            if col not in columns.columns:
+                raise ValueError(f"Invalid group column '{col}'")
+        aggregations: t.List[t.Tuple[str, str]] = []
+        for col, fn in applies.items():
+            if col in aggregates or col not in columns.columns:
+                continue
+            sql_fn = _SqlDataAccessor.__AGGREGATE_FUNCTIONS.get(fn) if isinstance(fn, str) else None
+            if sql_fn is None:
+                raise ValueError(f"Aggregate function {fn} is not supported on SQL tables.")
+            aggregations.append((col, sql_fn))
+        return aggregations
+
+    def __get_stats(
+        self,
+        var_name: str,
+        table: SqlTable,
+        columns: pd.DataFrame,
+        filters: t.Optional[t.List[t.Dict[str, t.Any]]],
+        request: t.Tuple[t.List[t.Any], int, int],
+    ) -> t.Dict[str, t.Any]:
+        # the statistics are computed from the number of occurrences of each value
+        cols, top, bins = request
+        version = table._get_version()
+        filters_key = tuple(_get_filter_key(fd) for fd in filters or [])
+        stats: t.Dict[str, t.Any] = {}
+        for col in cols:
+            key: t.Optional[t.Hashable] = (col, top, bins, filters_key)
+            try:
+                hash(key)
+            except TypeError:
+                key = None
+            col_stats = self.__stats_cache.get(table, version, key) if key is not None else None
+            if col_stats is None:
+                if col not in columns.columns:
+                    _warn(f"Cannot compute the statistics of column {col} of {var_name}: unknown column.")
+                    continue
+
+                def build(style: str) -> t.Tuple[str, _SqlParams]:
+                    builder = _SqlQueryBuilder(table, style)
+                    name = builder.quote(str(col))
+                    sql = f"SELECT {name}, COUNT(*) FROM {builder.source()}{builder.where(filters, columns)}"
+                    return f"{sql} GROUP BY {name}", builder.params
+
+                try:
+                    counts = _SqlDataAccessor.__to_dataframe(*table._execute(build))
+                    col_stats = _get_column_stats(counts.iloc[:, 0], counts.iloc[:, 1].to_numpy(), top, bins)
+                except Exception as e:
+                    _warn(f"Cannot compute the statistics of column {col} of {var_name}.", e)
+                    continue
+                if key is not None:
+                    self.__stats_cache.set(table, version, key, col_stats)
+            stats[col] = col_stats
+        return stats
+
+    def __read_page(
+        self,
+        table: SqlTable,
+        columns: pd.DataFrame,
+        selected: t.List[str],
+        filters: t.Optional[t.List[t.Dict[str, t.Any]]],
+        order_by: t.Optional[str],
+        descending: bool,
+        start: int,
+        end: int,
+        rowcount: int,
+    ) -> pd.DataFrame:
+        index = table.index
+        if order_by == _SqlDataAccessor.__INDEX_COL or (order_by is None and index is not None):
+            order_by = index
+        nb_rows = end + 1 - start
+        reverse = False
+        if order_by is None and descending:
+            # reversed natural order: the rows are read in natural order
+            start, reverse = rowcount - 1 - end, True
+        filter_key: t.Optional[t.Hashable] = (tuple(_get_filter_key(fd) for fd in filters or []), descending)
+        try:
+            hash(filter_key)
+        except TypeError:
+            filter_key = None
+        version = table._get_version()
+        # keyset pagination is used when the next page is read
+        last_key = (
+            self.__keys_cache.get(table, version, (filter_key, start - 1))
+            if order_by is not None and order_by == index and filter_key is not None and start > 0
+            else None
+        )
+
+        def build(style: str) -> t.Tuple[str, _SqlParams]:
+            builder = _SqlQueryBuilder(table, style)
+            conditions: t.List[str] = []
+            if last_key is not None:
+                operator = "<" if descending else ">"
+                conditions.append(f"{builder.quote(str(index))} {operator} {builder.param(last_key[0])}")
+            sql = f"SELECT {', '.join(map(builder.quote, selected))} FROM {builder.source()}"
+            sql += builder.where(filters, columns, *conditions)
+            if order_by is not None:
+                direction = " DESC" if descending else ""
+                sql += f" ORDER BY {builder.quote(order_by)}{direction}"
+                if index is not None and order_by != index:
+                    sql += f", {builder.quote(index)}{direction}"
+            sql += f" LIMIT {nb_rows}"
+            if last_key is None:
+                sql += f" OFFSET {start}"
+            return sql, builder.params
+
+        page = _SqlDataAccessor.__to_dataframe(*table._execute(build))
+        if reverse:
+            page = page.iloc[::-1]
+        if index is not None:
+            page.index = pd.Index(page[index])
+            if order_by == index and filter_key is not None and len(page):
+                last_index = page.index[-1:].tolist()[0]
+                self.__keys_cache.set(table, version, (filter_key, start + len(page) - 1), (last_index,), 0)
+        else:
+            positions = pd.RangeIndex(start, start + len(page))
+            page.index = positions[::-1] if reverse else positions
+        page.index.name = None
+        return page
+
+    def __read_groups(
+        self,
+        table: SqlTable,
+        columns: pd.DataFrame,
+        filters: t.Optional[t.List[t.Dict[str, t.Any]]],
+        aggregates: t.List[str],
+        aggregations: t.List[t.Tuple[str, str]],
+        order_by: t.Optional[str],
+        descending: bool,
+        start: int,
+        end: int,
+    ) -> pd.DataFrame:
+        index = table.index
+        outputs = [*aggregates, *(a[0] for a in aggregations)]
+        if order_by not in outputs and (order_by != _SqlDataAccessor.__INDEX_COL or index is None):
+            order_by = None
+
+        def build(style: str) -> t.Tuple[str, _SqlParams]:
+            builder = _SqlQueryBuilder(table, style)
+            selected = [builder.quote(c) for c in aggregates]
+            selected += [f"{fn}({builder.quote(c)}) AS {builder.quote(c)}" for c, fn in aggregations]
+            if index is not None:
+                # the index of the first row of each group
+                selected.append(f"MIN({builder.quote(index)}) AS {_SqlDataAccessor.__INDEX_COL}")
+            groups = ", ".join(map(builder.quote, aggregates))
+            sql = f"SELECT {', '.join(selected)} FROM {builder.source()}{builder.where(filters, columns)}"
+            sql += f" GROUP BY {groups} ORDER BY "
+            sql += f"{builder.quote(order_by)}{' DESC' if descending else ''}, {groups}" if order_by else groups
+            sql += f" LIMIT {end + 1 - start} OFFSET {start}"
+            return sql, builder.params
+
+        page = _SqlDataAccessor.__to_dataframe(*table._execute(build))
+        if index is not None:
+            page = page.set_index(_SqlDataAccessor.__INDEX_COL)
+        else:
+            page.index = pd.RangeIndex(start, start + len(page))
+        page.index.name = None
+        return page
+
+    def get_data(
+        self, gui: Gui, var_name: str, value: t.Any, payload: t.Dict[str, t.Any], data_format: _DataFormat
+    ) -> t.Dict[str, t.Any]:
+        if not isinstance(value, SqlTable):
+            return {}
+        columns = self.__get_columns(value)
+        selected = [c for c in payload.get("columns", []) if c in columns.columns] or list(columns.columns)
+        filters = payload.get("filters")
+        if not isinstance(filters, list) or len(filters) == 0:
+            filters = None
+        if filters:
+            try:
+                _SqlQueryBuilder(value, "qmark").where(filters, columns)
+            except Exception as e:
+                _warn(f"SQL table filtering: invalid filters {filters}", e)
+                filters = None
+        if (stats_request := _get_stats_request(payload)) is not None:
+            return {
+                "pagekey": payload.get("pagekey", "unknown page"),
+                "value": {"stats": self.__get_stats(var_name, value, columns, filters, stats_request)},
+            }
+        if payload.get("alldata", False):
+            # charts need all the rows: they are decimated in memory
+            def build(style: str) -> t.Tuple[str, _SqlParams]:
+                builder = _SqlQueryBuilder(value, style)
+                sql = f"SELECT {', '.join(map(builder.quote, selected))} FROM {builder.source()}"
+                sql += builder.where(filters, columns)
+                if value.index is not None:
+                    sql += f" ORDER BY {builder.quote(value.index)}"
+                return sql, builder.params
+
+            data = _SqlDataAccessor.__to_dataframe(*value._execute(build))
+            return super().get_data(gui, var_name, data, {**payload, "filters": None}, data_format)
+        order_by = payload.get("orderby")
+        if not isinstance(order_by, str) or (order_by not in columns.columns and order_by != self.__INDEX_COL):
+            order_by = None
+        descending = payload.get("sort") == "desc"
+        aggregates = payload.get("aggregates")
+        applies = payload.get("applies")
+        page: t.Optional[pd.DataFrame] = None
+        if isinstance(aggregates, list) and len(aggregates) and isinstance(applies, dict):
+            try:
+                aggregations = _SqlDataAccessor.__get_aggregations(columns, aggregates, applies)
+                rowcount = self.__count(value, columns, filters, aggregates)
+                start, end = _get_page_range(payload, rowcount)
+                page = self.__read_groups(
+                    value, columns, filters, aggregates, aggregations, order_by, descending, start, end
+                )
+            except Exception as e:
+                _warn(f"Cannot aggregate {var_name} with groupby {aggregates} and aggregates {applies}.", e)
+        if page is None:
+            if value.index is not None and value.index not in selected:
+                selected.append(value.index)
+            rowcount = self.__count(value, columns, filters, None)
+            start, end = _get_page_range(payload, rowcount)
+            page = self.__read_page(value, columns, selected, filters, order_by, descending, start, end, rowcount)
+        # the rows of the page are processed in memory
+        ret_payload = super().get_data(
+            gui,
+            var_name,
+            page,
+            {**payload, "start": 0, "end": -1, "filters": None, "orderby": None, "aggregates": None},
+            data_format,
+        )
+        ret_payload["value"]["rowcount"] = rowcount
+        ret_payload["value"]["start"] = start
+        return ret_payload
+
+    def _invalidate(self, value: t.Any) -> None:
+        if isinstance(value, SqlTable):
+            self.__columns_cache.invalidate(value)
+            self.__count_cache.invalidate(value)
+            self.__keys_cache.invalidate(value)
+            self.__stats_cache.invalidate(value)
@@ -0,0 +1,253 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+from __future__ import annotations
+
+import sys
+import typing as t
+import weakref
+from contextlib import contextmanager
+from threading import Lock
+
+_PARAM_STYLES = ("qmark", "numeric", "named", "format", "pyformat")
+_QUOTES = ('"', "`")
+# the modules of the drivers of the databases that quote identifiers with backticks
+_BACKTICK_MODULES = ("MySQLdb", "pymysql", "mysql", "mariadb")
+# the modules of the drivers of the databases which LIKE operator ignores the case
+_SQLITE_MODULES = ("sqlite3",)
+
+
+class _SqlConnectionPool(object):
+    """Pool of DB-API connections created by the same function.
+
+    A connection is used by one thread at a time. At most *max_size* idle connections are kept
+    open.
+    """
+
+    def __init__(self, connect: t.Callable[[], t.Any], max_size: int) -> None:
+        self.__connect = connect
+        self.max_size = max_size
+        self.__idle: t.List[t.Any] = []
+        self.__lock = Lock()
+
+    @contextmanager
+    def connection(self) -> t.Iterator[t.Any]:
+        with self.__lock:
+            connection = self.__idle.pop() if self.__idle else None
+        if connection is None:
+            connection = self.__connect()
+        try:
+            yield connection
+        except Exception:
+            # the connection may be in an unknown state
+            _SqlConnectionPool.__close(connection)
+            raise
+        try:
+            # end the implicit transaction: idle connections must not hold snapshots or locks
+            connection.rollback()
+        except Exception:
+            _SqlConnectionPool.__close(connection)
+            return
+        with self.__lock:
+            if len(self.__idle) < self.max_size:
+                self.__idle.append(connection)
+                connection = None
+        if connection is not None:
+            _SqlConnectionPool.__close(connection)
+
+    def close(self) -> None:
+        with self.__lock:
+            idle, self.__idle = self.__idle, []
+        for connection in idle:
+            _SqlConnectionPool.__close(connection)
+
+    @staticmethod
+    def __close(connection: t.Any) -> None:
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+
+# the pools are shared by the tables that use the same connection function
+_pools: weakref.WeakKeyDictionary[t.Callable[[], t.Any], _SqlConnectionPool] = weakref.WeakKeyDictionary()
+_pools_lock = Lock()
+
+
+def _get_connection_pool(connect: t.Callable[[], t.Any], max_size: int) -> _SqlConnectionPool:
+    with _pools_lock:
+        pool = _pools.get(connect)
+        if pool is None:
+            pool = _SqlConnectionPool(connect, max_size)
+            _pools[connect] = pool
+        else:
+            pool.max_size = max(pool.max_size, max_size)
+        return pool
+
+
+def _get_param_style(connection: t.Any) -> str:
+    # the DB-API module that defines the type of connection, or one of its parent packages
+    module_name = type(connection).__module__
+    while module_name:
+        style = getattr(sys.modules.get(module_name), "paramstyle", None)
+        if style in _PARAM_STYLES:
+            return style
+        module_name = module_name.rpartition(".")[0]
+    return "qmark"
+
+
+def _get_driver(connection: t.Any) -> str:
+    # the top-level package of the DB-API module that defines the type of connection
+    return type(connection).__module__.partition(".")[0]
+
+
+def _get_identifier_quote(connection: t.Any) -> str:
+    return "`" if _get_driver(connection) in _BACKTICK_MODULES else '"'
+
+
+class SqlTable(object):
+    """A table which rows are the result of a SQL query.
+
+    A `SqlTable` can be used as the *data* of a table or a chart: it is never loaded in
+    memory. Instead, filtering, sorting, grouping and paging are translated into SQL
+    and executed by the database, so that only the displayed rows are transferred.
+
+    The database is accessed through a [DB-API](https://peps.python.org/pep-0249/)
+    connection. Connections are created by a function that takes no argument, and are
+    kept in a small pool shared by all the `SqlTable` instances created with the same
+    function (and therefore by all the user sessions).
+
+    The generated SQL uses `LIMIT` and `OFFSET` clauses, which are supported by SQLite,
+    PostgreSQL, MySQL or DuckDB for example. Column names are quoted with double quotes,
+    or with backticks for MySQL and MariaDB.<br/>
+    The number of rows of the table is cached: `State.refresh()^` must be called on the
+    variable holding the table when the query result changes.
+    """
+
+    def __init__(
+        self,
+        connect: t.Callable[[], t.Any],
+        query: str,
+        params: t.Optional[t.Union[t.Sequence[t.Any], t.Mapping[str, t.Any]]] = None,
+        index: t.Optional[str] = None,
+        paramstyle: t.Optional[str] = None,
+        pool_size: int = 4,
+        quote: t.Optional[str] = None,
+    ) -> None:
+        """Initialize a new `SqlTable`.
+
+        Arguments:
+            connect (Callable): A function that returns a new DB-API connection to the
+                database.<br/>
+                SQLite connections must be created with *check_same_thread* set to False:
+                a connection is used by one thread at a time, but not always by the same
+                thread.
+            query (str): The SQL query that returns the rows of the table
+                (e.g. "SELECT * FROM sales").
+            params (Optional[Union[Sequence, Mapping]]): The parameters of *query*.
+            index (Optional[str]): The name of a column that uniquely identifies the rows,
+                such as the primary key of a table.<br/>
+                If set, rows are sorted on this column by default, and consecutive pages
+                are read using keyset pagination, which does not require the database to
+                skip the rows of the previous pages. If not set, rows are identified by
+                their position.
+            paramstyle (Optional[str]): The parameter marker format of the database
+                driver ("qmark", "numeric", "named", "format" or "pyformat").<br/>
+                If not set, the *paramstyle* of the driver module is used.
+            pool_size (int): The maximum number of idle connections kept open.
+            quote (Optional[str]): The character that column names are quoted with:
+                '"' (the SQL standard) or '`' (MySQL and MariaDB, unless the ANSI_QUOTES
+                SQL mode is set).<br/>
+                If not set, backticks are used with the MySQL and MariaDB drivers
+                (mysqlclient, PyMySQL, MySQL Connector/Python and MariaDB Connector/Python),
+                and double quotes with the other drivers.
+        """
+        if paramstyle is not None and paramstyle not in _PARAM_STYLES:
+            raise ValueError(f"Invalid parameter style '{paramstyle}'.")
+        if quote is not None and quote not in _QUOTES:
+            raise ValueError(f"Invalid identifier quote '{quote}'.")
+        self.__connect = connect
+        self.__query = query.strip().rstrip(";")
+        self.__params = params
+        self.__index = index
+        self.__paramstyle = paramstyle
+        self.__quote = quote
+        self.__driver: t.Optional[str] = None
+        self.__pool = _get_connection_pool(connect, pool_size)
+
+    @property
+    def connect(self) -> t.Callable[[], t.Any]:
+        """The function that creates the connections to the database."""
+        return self.__connect
+
+    @property
+    def query(self) -> str:
+        """The SQL query that returns the rows of the table."""
+        return self.__query
+
+    @property
+    def params(self) -> t.Optional[t.Union[t.Sequence[t.Any], t.Mapping[str, t.Any]]]:
+        """The parameters of the query."""
+        return self.__params
+
+    @property
+    def index(self) -> t.Optional[str]:
+        """The name of the column that identifies the rows."""
+        return self.__index
+
+    @property
+    def quote(self) -> t.Optional[str]:
+        """The character that column names are quoted with.
+
+        If it was not set, it is None until the first connection to the database is made.
+        """
+        return self.__quote
+
+    @property
+    def _driver(self) -> t.Optional[str]:
+        # the top-level package of the database driver, known after the first connection
+        return self.__driver
+
+    def _get_version(self) -> t.Optional[t.Hashable]:
+        params = self.__params
+        try:
+            if isinstance(params, t.Mapping):
+                params = tuple(sorted(params.items()))
+            elif params is not None:
+                params = tuple(params)
+            version = (self.__query, params)
+            hash(version)
+        except TypeError:
+            return None
+        return version
+
+    def _execute(
+        self, sql_builder: t.Callable[[str], t.Tuple[str, t.Union[t.List[t.Any], t.Dict[str, t.Any]]]]
+    ) -> t.Tuple[t.List[str], t.List[t.Tuple[t.Any, ...]]]:
+        """Run a query and return the names of its columns and its rows.
+
+        *sql_builder* is given the parameter style and returns the query and its parameters.
+        The identifier quote (see `quote`) and the driver are known when *sql_builder* is called.
+        """
+        with self.__pool.connection() as connection:
+            if self.__driver is None:
+                self.__driver = _get_driver(connection)
+            if self.__quote is None:
+                self.__quote = _get_identifier_quote(connection)
+            sql, params = sql_builder(self.__paramstyle or _get_param_style(connection))
+            cursor = connection.cursor()
+            try:
+                cursor.execute(sql, params)
+                rows = cursor.fetchall()
+                names = [d[0] for d in cursor.description or []]
+            finally:
+                cursor.close()
+        return names, [tuple(r) for r in rows]
@@ -34,6 +34,8 @@ class Decimator(ABC):
     """
 
     _CHART_MODES: t.List[str] = []
+    # set to True by decimators that select the points of the displayed x range themselves
+    _FILTERS_RANGE = False
 
     def __init__(self, threshold: t.Optional[int], zoom: t.Optional[bool]) -> None:
         """Initialize a new `Decimator`.
@@ -82,6 +84,28 @@ class Decimator(ABC):
         return NotImplementedError  # type: ignore
 
 
+def vectorized(user_function: t.Callable) -> t.Callable:
+    """Decorator for the style and tooltip functions of tables that process all the rows at once.
+
+    A style or tooltip function is called for each row of the table that is sent to the
+    browser. When decorated with `vectorized`, it is instead called once, with the values
+    (as a pandas Series), the indexes (as a pandas Index) and the rows (as a pandas DataFrame)
+    of all these rows. It must then return one value per row.
+
+    Arguments:
+        user_function (Callable): The style or tooltip function.
+
+    Returns:
+        The decorated function.
+    """
+    setattr(user_function, "_tp_vectorized", True)
+    return user_function
+
+
+def _is_vectorized(user_function: t.Callable) -> bool:
+    return getattr(user_function, "_tp_vectorized", False) is True
+
+
 def _df_data_filter(
     dataframe: pd.DataFrame,
     x_column_name: t.Optional[str],
@@ -104,6 +128,61 @@ def _df_data_filter(
     return df[mask], is_copied
 
 
+def _get_page_range(payload: t.Dict[str, t.Any], rowcount: int) -> t.Tuple[int, int]:
+    """Return the positions of the first and last rows of the requested page."""
+    try:
+        start = int(str(payload.get("start")), base=10)
+    except Exception:
+        _warn(f'start should be an int value {payload.get("start")}.')
+        start = 0
+    try:
+        end = int(str(payload.get("end")), base=10)
+    except Exception:
+        end = -1
+    if start < 0 or start >= rowcount:
+        start = 0
+    if end < 0 or end >= rowcount:
+        end = rowcount - 1
+    return start, end
+
+
+def _argsort_window(values: np.ndarray, start: int, end: int, descending: bool) -> np.ndarray:
+    """Return the indexes of the rows *start* to *end* of the sorted *values*.
+
+    The result is the slice [start:end + 1] of `values.argsort(kind="stable")` (or of its reverse
+    if *descending* is True), computed by selecting the first (or last) end + 1 values then
+    sorting only those.
+    """
+    nb_values = len(values)
+    nb_selected = end + 1
+    kth_pos = nb_values - nb_selected if descending else nb_selected - 1
+    kth = np.partition(values, kth_pos)[kth_pos]
+    # missing values are sorted last
+    missing: t.Optional[np.ndarray] = None
+    if values.dtype.kind == "f":
+        missing, kth_missing = np.isnan(values), np.isnan(kth)
+    elif values.dtype.kind in "mM":
+        missing, kth_missing = np.isnat(values), np.isnat(kth)
+    if missing is not None and kth_missing:
+        strict = np.zeros(nb_values, dtype=bool) if descending else ~missing
+        equal = missing
+    else:
+        strict = values > kth if descending else values < kth
+        if descending and missing is not None:
+            strict |= missing
+        equal = values == kth
+    selected = np.flatnonzero(strict)
+    equal_indexes = np.flatnonzero(equal)
+    nb_equal = nb_selected - len(selected)
+    # a stable sort keeps equal values in index order
+    equal_indexes = equal_indexes[len(equal_indexes) - nb_equal :] if descending else equal_indexes[:nb_equal]
+    selected = np.sort(np.concatenate((selected, equal_indexes)))
+    selected = selected[np.argsort(values[selected], kind="stable")]
+    if descending:
+        selected = selected[::-1]
+    return selected[start : end + 1]
+
+
 def _df_relayout(
     dataframe: pd.DataFrame,
     x_column: t.Optional[str],
@@ -12,6 +12,7 @@
 from __future__ import annotations
 
 import contextlib
+import hashlib
 import importlib
 import inspect
 import json
@@ -23,6 +24,7 @@ import tempfile
 import time
 import typing as t
 import warnings
+from collections import OrderedDict
 from importlib import metadata, util
 from importlib.util import find_spec
 from types import FrameType, SimpleNamespace
@@ -31,7 +33,7 @@ from urllib.parse import unquote, urlencode, urlparse
 import __main__
 import markdown as md_lib
 import tzlocal
-from flask import Blueprint, Flask, g, jsonify, request, send_file, send_from_directory
+from flask import Blueprint, Flask, g, has_app_context, jsonify, request, send_file, send_from_directory
 from werkzeug.utils import secure_filename
 
 from taipy.logger._taipy_logger import _TaipyLogger
@@ -51,8 +53,10 @@ from .builder import _ElementApiGenerator
 from .config import Config, ConfigParameter, _Config
 from .data.content_accessor import _ContentAccessor
 from .data.data_accessor import _DataAccessor, _DataAccessors
+from .data.data_cache import _DataCache, _get_data_version
 from .data.data_format import _DataFormat
 from .data.data_scope import _DataScopes
+from .data.sql_table import SqlTable
 from .extension.library import Element, ElementLibrary
 from .page import Page
 from .partial import Partial
@@ -208,6 +212,10 @@ class Gui:
     __BRDCST_CALLBACK_G_ID = "taipy_brdcst_callback"
     __SELF_VAR = "__gui"
     __DO_NOT_UPDATE_VALUE = _DoNotUpdate()
+
+    __MAX_ELEMENT_CONFIGS = 128
+    __MAX_DATA_REQUESTS = 16
+    __APPENDED_ROWS_G_ID = "taipy_appended_rows"
     _HTML_CONTENT_KEY = "__taipy_html_content"
     __USER_CONTENT_CB = "custom_user_content_cb"
 
@@ -320,6 +328,15 @@ class Gui:
         # sid from client_id
         self.__client_id_2_sid: t.Dict[str, t.Set[str]] = {}
 
+        # table columns and chart configurations, from the attributes and the column types
+        self.__element_configs: t.OrderedDict[t.Hashable, str] = OrderedDict()
+
+        # last data requests of each client, by variable and page key
+        self.__data_requests: t.Dict[str, t.Dict[str, t.OrderedDict[str, t.Dict[str, t.Any]]]] = {}
+
+        # incremented when the data held by a variable is modified
+        self.__data_generations: t.Dict[str, int] = {}
+
         # Load default config
         self._flask_blueprint: t.List[Blueprint] = []
         self._config._load(default_config)
@@ -535,6 +552,10 @@ class Gui:
             else getattr(g, Gui.__ARG_CLIENT_ID, "unknown id")
         )
 
+    def _get_connected_client_id(self) -> t.Optional[str]:
+        # the client that sent the request, even in single client mode
+        return getattr(g, Gui.__ARG_CLIENT_ID, None) if has_app_context() else None
+
     def __set_client_id_in_context(self, client_id: t.Optional[str] = None, force=False):
         if not client_id and request:
             client_id = request.args.get(Gui.__ARG_CLIENT_ID, "")
@@ -550,6 +571,17 @@ class Gui:
                 sids.add(sid)
         g.client_id = client_id
 
+    def _handle_disconnect(self):
+        if sid := getattr(request, "sid", None):
+            for client_id, sids in list(self.__client_id_2_sid.items()):
+                if sid in sids:
+                    sids.discard(sid)
+                    if not sids:
+                        # no more connection for this client: release what was cached for it
+                        del self.__client_id_2_sid[client_id]
+                        self.__data_requests.pop(client_id, None)
+                        self._accessors._drop_client(client_id)
+
     def __is_var_modified_in_context(self, var_name: str, derived_vars: t.Set[str]) -> bool:
         modified_vars: t.Optional[t.Set[str]] = getattr(g, "modified_vars", None)
         der_vars: t.Optional[t.Set[str]] = getattr(g, "derived_vars", None)
@@ -926,8 +958,10 @@ class Gui:
         self,
         modified_vars: t.List[str],
         front_var: t.Optional[str] = None,
+        data_changed: bool = True,
     ):
         ws_dict = {}
+        data_deltas: t.List[t.Dict[str, t.Any]] = []
         values = {v: _getscopeattr_drill(self, v) for v in modified_vars}
         for k, v in values.items():
             if isinstance(v, (_TaipyData, _TaipyContentHtml)) and v.get_name() in modified_vars:
@@ -937,6 +971,14 @@ class Gui:
         for _var in modified_vars:
             newvalue = values.get(_var)
             if isinstance(newvalue, _TaipyData):
+                if data_changed:
+                    # Results computed from the previous content are obsolete
+                    self._accessors._invalidate(newvalue)
+                    self.__data_generations[_var] = self.__data_generations.get(_var, 0) + 1
+                if (deltas := self.__get_data_deltas(_var, newvalue)) is not None:
+                    # only the appended rows are sent
+                    data_deltas.extend(deltas)
+                    continue
                 # A changing integer that triggers a data request
                 newvalue = Gui._data_request_counter
                 Gui._data_request_counter = (Gui._data_request_counter % 100) + 1
@@ -985,6 +1027,53 @@ class Gui:
             ws_dict[_var] = newvalue
         # TODO: What if value == newvalue?
         self.__send_ws_update_with_dict(ws_dict)
+        if data_deltas:
+            self.__send_ws({"type": _WsType.MULTIPLE_UPDATE.value, "payload": data_deltas})
+
+    def _append_rows(self, var_name: str, rows: t.Any) -> None:
+        value = _getscopeattr(self, var_name)
+        new_value = self._accessors._append_rows(value, rows)
+        if new_value is None:
+            _warn(f"Cannot append rows to a variable of type {type(value).__name__}.")
+            return
+        # the number of rows that the front-end may already have, by data set
+        appended_rows: t.Dict[int, int] = getattr(g, Gui.__APPENDED_ROWS_G_ID, {})
+        setattr(g, Gui.__APPENDED_ROWS_G_ID, appended_rows)
+        appended_rows[id(new_value)] = len(value)
+        try:
+            setattr(self._bindings(), var_name, new_value)
+        finally:
+            appended_rows.pop(id(new_value), None)
+
+    def __get_data_deltas(self, var_name: str, value: _TaipyData) -> t.Optional[t.List[t.Dict[str, t.Any]]]:
+        # the updates of the data the client requested for var_name, if they only hold appended rows
+        start = getattr(g, Gui.__APPENDED_ROWS_G_ID, {}).get(id(value.get()))
+        if start is None or self._is_broadcasting():
+            return None
+        requests = self.__data_requests.get(self._get_client_id(), {}).get(var_name)
+        if not requests:
+            return None
+        page_keys = list(requests.keys())
+        deltas: t.List[t.Dict[str, t.Any]] = []
+        for payload in requests.values():
+            delta = self._accessors._get_data_delta(self, var_name, value, payload, start)
+            if delta is None:
+                return None
+            # the front-end drops the pages that were not updated
+            deltas.append(
+                {"name": _get_client_var_name(var_name), "payload": {**delta, "append": True, "pagekeys": page_keys}}
+            )
+        return deltas
+
+    def __record_data_request(self, var_name: str, payload: t.Dict[str, t.Any]) -> None:
+        page_key = payload.get("pagekey")
+        if not isinstance(page_key, str):
+            return
+        requests = self.__data_requests.setdefault(self._get_client_id(), {}).setdefault(var_name, OrderedDict())
+        requests.pop(page_key, None)
+        requests[page_key] = payload
+        if len(requests) > Gui.__MAX_DATA_REQUESTS:
+            requests.popitem(last=False)
 
     def __request_data_update(self, var_name: str, payload: t.Any) -> None:
         # Use custom attrgetter function to allow value binding for _MapDict
@@ -1010,9 +1099,47 @@ class Gui:
                                 e,
                             )
             if not isinstance(ret_payload, dict):
-                ret_payload = self._accessors._get_data(self, var_name, newvalue, payload)
+                version = self.__get_data_response_version(var_name, newvalue, payload)
+                if version is not None and payload.get("version") == version:
+                    # the front-end already has this response
+                    ret_payload = {"pagekey": payload.get("pagekey"), "value": None, "unchanged": True}
+                else:
+                    ret_payload = self._accessors._get_data(self, var_name, newvalue, payload)
+                if isinstance(payload, dict):
+                    self.__record_data_request(var_name, payload)
+                if version is not None and isinstance(ret_payload, dict):
+                    ret_payload = {**ret_payload, "version": version}
             self.__send_ws_update_with_dict({var_name: ret_payload})
 
+    def __get_data_response_version(self, var_name: str, value: _TaipyData, payload: t.Any) -> t.Optional[str]:
+        # identifies the response to a data request: the same request on the same data gets the same version
+        if not isinstance(payload, dict):
+            return None
+        data = value.get()
+        # a query result can change without the query changing
+        if isinstance(data, SqlTable):
+            return None
+        # user functions and decimators can return a different response for the same data
+        if payload.get("decimatorPayload", {}).get("decimators"):
+            return None
+        for functions in (payload.get("styles"), payload.get("tooltips")):
+            if isinstance(functions, dict) and any(callable(self._get_user_function(f)) for f in functions.values()):
+                return None
+        data_version = _get_data_version(data)
+        if data_version is None:
+            return None
+        # the Arrow schema identifier only changes the encoding of the response
+        request = {k: v for k, v in payload.items() if k not in ("version", "arrowschema")}
+        try:
+            key = json.dumps(
+                [self.__data_generations.get(var_name, 0), repr(data_version), request],
+                sort_keys=True,
+                default=str,
+            )
+        except Exception:
+            return None
+        return hashlib.sha1(key.encode()).hexdigest()
+
     def __request_var_update(self, payload: t.Any):
         if isinstance(payload, dict) and isinstance(payload.get("names"), list):
             if payload.get("refresh", False):
@@ -1023,7 +1150,7 @@ class Gui:
                         val.get_name() if isinstance(val, _TaipyBase) else _var,
                         val if isinstance(val, _TaipyBase) else None,
                     )
-            self.__send_var_list_update(payload["names"])
+            self.__send_var_list_update(payload["names"], data_changed=bool(payload.get("refresh", False)))
 
     def __send_ws(self, payload: dict, allow_grouping=True) -> None:
         grouping_message = self.__get_message_grouping() if allow_grouping else None
@@ -1317,6 +1444,54 @@ class Gui:
         attributes.update({k: args_dict.get(v) for k, v in hashes.items()})
         return attributes, hashes
 
+    @staticmethod
+    def __get_hashable(value: t.Any) -> t.Any:
+        if isinstance(value, _MapDict):
+            value = value._dict
+        if isinstance(value, dict):
+            return tuple((k, Gui.__get_hashable(v)) for k, v in value.items())
+        if isinstance(value, (list, tuple)):
+            return tuple(Gui.__get_hashable(v) for v in value)
+        return value
+
+    def __get_element_config_key(
+        self,
+        name: str,
+        attr_json: str,
+        hash_json: str,
+        data_hash: str,
+        col_types: t.Optional[t.Dict[str, str]],
+        args_dict: t.Dict[str, t.Any],
+    ) -> t.Optional[t.Hashable]:
+        # the configuration only depends on the attributes and the column types of the data
+        if col_types is None:
+            return None
+        key = (
+            name,
+            attr_json,
+            hash_json,
+            tuple(col_types.items()),
+            tuple((k, Gui.__get_hashable(v)) for k, v in args_dict.items() if k != data_hash),
+        )
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def __get_element_config(self, key: t.Optional[t.Hashable], build: t.Callable[[], str]) -> str:
+        if key is None:
+            return build()
+        config = self.__element_configs.get(key)
+        if config is None:
+            config = build()
+            self.__element_configs[key] = config
+            if len(self.__element_configs) > Gui.__MAX_ELEMENT_CONFIGS:
+                self.__element_configs.popitem(last=False)
+        else:
+            self.__element_configs.move_to_end(key)
+        return config
+
     def _tbl_cols(
         self, rebuild: bool, rebuild_val: t.Optional[bool], attr_json: str, hash_json: str, **kwargs
     ) -> t.Union[str, _DoNotUpdate]:
@@ -1324,19 +1499,27 @@ class Gui:
             try:
                 rebuild = rebuild_val if rebuild_val is not None else rebuild
                 if rebuild:
-                    attributes, hashes = self.__get_attributes(attr_json, hash_json, kwargs)
+                    hashes: t.Dict[str, str] = json.loads(unquote(hash_json))
                     data_hash = hashes.get("data", "")
                     data = kwargs.get(data_hash)
-                    col_dict = _get_columns_dict(
-                        data,
-                        attributes.get("columns", {}),
-                        self._accessors._get_col_types(data_hash, _TaipyData(data, data_hash)),
-                        attributes.get("date_format"),
-                        attributes.get("number_format"),
-                    )
-                    _enhance_columns(attributes, hashes, col_dict, "table(cols)")
+                    col_types = self._accessors._get_col_types(data_hash, _TaipyData(data, data_hash))
+
+                    def build_col_dict() -> str:
+                        attributes, hashes = self.__get_attributes(attr_json, hash_json, kwargs)
+                        col_dict = _get_columns_dict(
+                            data,
+                            attributes.get("columns", {}),
+                            col_types,
+                            attributes.get("date_format"),
+                            attributes.get("number_format"),
+                        )
+                        _enhance_columns(attributes, hashes, col_dict, "table(cols)")
+                        return json.dumps(col_dict, cls=_TaipyJsonEncoder)
 
-                    return json.dumps(col_dict, cls=_TaipyJsonEncoder)
+                    return self.__get_element_config(
+                        self.__get_element_config_key("table", attr_json, hash_json, data_hash, col_types, kwargs),
+                        build_col_dict,
+                    )
             except Exception as e:  # pragma: no cover
                 _warn("Exception while rebuilding table columns", e)
         return Gui.__DO_NOT_UPDATE_VALUE
@@ -1348,15 +1531,18 @@ class Gui:
             try:
                 rebuild = rebuild_val if rebuild_val is not None else rebuild
                 if rebuild:
-                    attributes, hashes = self.__get_attributes(attr_json, hash_json, kwargs)
+                    hashes: t.Dict[str, str] = json.loads(unquote(hash_json))
                     data_hash = hashes.get("data", "")
-                    config = _build_chart_config(
-                        self,
-                        attributes,
-                        self._accessors._get_col_types(data_hash, _TaipyData(kwargs.get(data_hash), data_hash)),
-                    )
+                    col_types = self._accessors._get_col_types(data_hash, _TaipyData(kwargs.get(data_hash), data_hash))
+
+                    def build_config() -> str:
+                        attributes, _ = self.__get_attributes(attr_json, hash_json, kwargs)
+                        return json.dumps(_build_chart_config(self, attributes, col_types), cls=_TaipyJsonEncoder)
 
-                    return json.dumps(config, cls=_TaipyJsonEncoder)
+                    return self.__get_element_config(
+                        self.__get_element_config_key("chart", attr_json, hash_json, data_hash, col_types, kwargs),
+                        build_config,
+                    )
             except Exception as e:  # pragma: no cover
                 _warn("Exception while rebuilding chart config", e)
         return Gui.__DO_NOT_UPDATE_VALUE
@@ -2269,6 +2455,9 @@ class Gui:
         # Register data accessor communication data format (JSON, Apache Arrow)
         self._accessors._set_data_format(_DataFormat.APACHE_ARROW if app_config["use_arrow"] else _DataFormat.JSON)
 
+        # Share the memory of the data caches
+        _DataCache._set_memory_budget(app_config["data_cache_memory"])
+
         # Use multi user or not
         self._bindings()._set_single_client(bool(app_config["single_client"]))
 
@@ -80,6 +80,7 @@ class State:
         "_context_list",
     )
     __methods = (
+        "append_rows",
         "assign",
         "broadcast",
         "get_gui",
@@ -212,6 +213,30 @@ class State:
         _attrsetter(self, name, value)
         return val
 
+    def append_rows(self, name: str, rows: t.Any):
+        """Append rows to a tabular state variable.
+
+        A new value, holding the rows of the current value followed by *rows*, is assigned
+        to the variable.<br/>
+        The tables and charts that represent this variable only receive the new rows,
+        unless they are filtered, sorted, grouped or decimated: the new value is then
+        requested as a whole.
+
+        Arguments:
+            name (str): The name of the variable, which value must be a pandas DataFrame.
+            rows (Any): The rows to append. This can be a DataFrame, a dictionary (holding
+                a single row or the values of each column) or a list of rows.
+        """
+        gui: "Gui" = super().__getattribute__(State.__gui_attr)
+        if gui._is_in_brdcst_callback() and (
+            name not in gui._get_shared_variables() and not gui._bindings()._is_single_client()
+        ):
+            raise AttributeError(f"Variable '{name}' is not available to be accessed in shared callback.")
+        if name not in super().__getattribute__(State.__attrs[1]):
+            raise AttributeError(f"Variable '{name}' is not accessible.")
+        with self._notebook_context(gui), self._set_context(gui):
+            gui._append_rows(gui._bind_var(name), rows)
+
     def refresh(self, name: str):
         """Refresh a state variable.
 
@@ -82,6 +82,7 @@ def test_gui_service_arguments_hierarchy():
     assert service_config["chart_dark_template"] is None
     assert service_config["dark_mode"]
     assert service_config["dark_theme"] is None
+    assert service_config["data_workers"] == 0
     assert not service_config["debug"]
     assert not service_config["extended_status"]
     assert service_config["favicon"] is None
@@ -9,10 +9,15 @@
 # an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
 # specific language governing permissions and limitations under the License.
 
+import sys
 from importlib import util
 
+import numpy
+import pandas
+
 from taipy.gui import Gui
 from taipy.gui.data.array_dict_data_accessor import _ArrayDictDataAccessor
+from taipy.gui.data.data_cache import _get_data_version
 from taipy.gui.data.data_format import _DataFormat
 from taipy.gui.utils import _MapDict
 
@@ -163,3 +168,49 @@ def test_array_of_Mapdicts(gui: Gui, helpers, small_dataframe):
     assert len(data) == 2
     assert len(data[0]["temperatures"]) == 5
     assert len(data[1]["seasons"]) == 4
+
+
+def test_dataframe_cache(gui: Gui, helpers, monkeypatch):
+    accessor = _ArrayDictDataAccessor()
+    build_dataframe = accessor._ArrayDictDataAccessor__build_dataframe  # type: ignore
+    calls = []
+
+    def counting_build_dataframe(value):
+        calls.append(value)
+        return build_dataframe(value)
+
+    monkeypatch.setattr(accessor, "_ArrayDictDataAccessor__build_dataframe", counting_build_dataframe)
+    value = {"a": [1, 2, 3], "b": [4, 5, 6]}
+    accessor.get_data(gui, "x", value, {"start": 0, "end": -1}, _DataFormat.JSON)
+    accessor.get_data(gui, "x", value, {"start": 1, "end": 2}, _DataFormat.JSON)
+    accessor.get_col_types("x", value)
+    assert len(calls) == 1
+    value["a"][1] = 7
+    data = accessor.get_data(gui, "x", value, {"start": 0, "end": -1}, _DataFormat.JSON)["value"]["data"]
+    assert len(calls) == 2
+    assert data[1]["a"] == 7
+    accessor._invalidate(value)
+    accessor.get_col_types("x", value)
+    assert len(calls) == 3
+
+
+def test_dataframe_cache_references(gui: Gui, helpers):
+    accessor = _ArrayDictDataAccessor()
+    value = [[1, 2, 3], [4, 5, 6]]
+    nb_references = sys.getrefcount(value)
+    accessor.get_data(gui, "x", value, {"start": 0, "end": -1}, _DataFormat.JSON)
+    # lists have no weak references: the cache does not keep the value alive
+    assert sys.getrefcount(value) == nb_references
+
+
+def test_invalidate_list_of_dataframes(gui: Gui, helpers):
+    accessor = _ArrayDictDataAccessor()
+    df = pandas.DataFrame({"a": [3, 1, 2]})
+    value = [df, pandas.DataFrame({"b": [1]})]
+    accessor.get_col_types("x", value)
+    sort_cache = accessor._PandasDataAccessor__sort_cache  # type: ignore
+    version = _get_data_version(df)
+    sort_cache.set(df, version, "a", numpy.array([1, 2, 0]))
+    accessor._invalidate(value)
+    # the caches of the DataFrames of the list are dropped too
+    assert sort_cache.get(df, version, "a") is None
@@ -0,0 +1,199 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import inspect
+from datetime import datetime
+from importlib import util
+
+import pandas as pd
+import pytest
+from flask import g
+
+from taipy.gui import Gui
+from taipy.gui.data.data_accessor import _DataAccessors
+from taipy.gui.data.data_format import _DataFormat
+from taipy.gui.data.decimator import ScatterDecimator
+from taipy.gui.data.pandas_data_accessor import _PandasDataAccessor
+from taipy.gui.utils import _TaipyData
+
+if not util.find_spec("pyarrow"):
+    pytest.skip("pyarrow is not installed", allow_module_level=True)
+
+import pyarrow as pa  # noqa: E402
+
+from taipy.gui.data.arrow_data_accessor import _ArrowDataAccessor  # noqa: E402
+
+
+def test_simple_data(gui: Gui, helpers, small_dataframe):
+    accessor = _ArrowDataAccessor()
+    table = pa.table(small_dataframe)
+    ret_data = accessor.get_data(gui, "x", table, {"start": 0, "end": -1}, _DataFormat.JSON)
+    assert ret_data
+    value = ret_data["value"]
+    assert value["rowcount"] == 3
+    assert [d["_tp_index"] for d in value["data"]] == [0, 1, 2]
+
+
+def test_simple_data_with_arrow(gui: Gui, helpers, small_dataframe):
+    accessor = _ArrowDataAccessor()
+    table = pa.table(small_dataframe)
+    value = accessor.get_data(gui, "x", table, {"start": 1, "end": 2}, _DataFormat.APACHE_ARROW)["value"]
+    assert value["rowcount"] == 3
+    data = pa.ipc.open_stream(value["data"]).read_all()
+    assert data.column("_tp_index").to_pylist() == [1, 2]
+
+
+def test_col_types(gui: Gui, helpers):
+    accessor = _ArrowDataAccessor()
+    table = pa.table({"i": [1], "f": [1.5], "s": ["a"], "b": [True], "d": [datetime(2020, 1, 1)]})
+    assert accessor.get_col_types("x", table) == {
+        "i": "int64",
+        "f": "float64",
+        "s": "object",
+        "b": "bool",
+        "d": "datetime64[ns]",
+    }
+
+
+def test_accessor_registration(gui: Gui, helpers, small_dataframe):
+    accessors = _DataAccessors()
+    col_types = accessors._get_col_types("x", _TaipyData(pa.table(small_dataframe), "x"))
+    assert col_types["value"] == "int64"
+
+
+def test_filter_sort_and_dates(gui: Gui, helpers):
+    accessor = _ArrowDataAccessor()
+    table = pa.table(
+        {
+            "name": ["A", "b", "C", None],
+            "value": [4.0, float("nan"), 2.0, 1.0],
+            "date": [datetime(2020, 1, i + 1) for i in range(4)],
+        }
+    )
+    tz = Gui._get_timezone()
+    Gui._set_timezone("UTC")
+    query = {
+        "columns": ["name", "value", "date"],
+        "start": 0,
+        "end": -1,
+        "orderby": "value",
+        "sort": "desc",
+        "filters": [{"col": "date", "action": ">=", "value": "2020-01-02T00:00:00Z"}],
+    }
+    value = accessor.get_data(gui, "x", table, query, _DataFormat.JSON)["value"]
+    assert value["rowcount"] == 3
+    assert [d["_tp_index"] for d in value["data"]] == [1, 2, 3]
+    assert value["data"][0]["value"] is None
+    assert value["data"][1]["date_str"] == "2020-01-03T00:00:00.000000Z"
+    Gui._set_timezone(tz)
+    query["filters"] = [{"col": "name", "action": "contains", "value": "b", "matchcase": False}]
+    value = accessor.get_data(gui, "x", table, query, _DataFormat.JSON)["value"]
+    assert [d["name"] for d in value["data"]] == ["b"]
+    query["filters"] = [{"col": "*", "action": "startswith", "value": "c", "matchcase": False}]
+    value = accessor.get_data(gui, "x", table, query, _DataFormat.JSON)["value"]
+    assert [d["name"] for d in value["data"]] == ["C"]
+
+
+def test_column_stats(gui: Gui, helpers):
+    accessor = _ArrowDataAccessor()
+    table = pa.table({"name": ["A", "b", "A", None], "value": [4.0, 1.0, 2.0, 1.0]})
+    query = {"stats": ["name", "value"], "filters": [{"col": "value", "action": ">", "value": 1}]}
+    stats = accessor.get_data(gui, "x", table, query, _DataFormat.JSON)["value"]["stats"]
+    assert stats["name"] == {"count": 2, "nulls": 0, "distinct": 1, "values": [["A", 2]]}
+    assert stats["value"]["min"] == 2.0 and stats["value"]["max"] == 4.0
+
+
+def test_same_as_pandas(gui: Gui, helpers):
+    data = {"name": ["A", "b", "C", None, "A"], "value": [4.0, float("nan"), 2.0, 1.0, None], "count": [3, 1, 3, 2, 0]}
+    df, table = pd.DataFrame(data), pa.table(data)
+    # missing values are sorted last in ascending order, first in descending order
+    for sort in ["asc", "desc"]:
+        query = {"columns": list(data), "start": 0, "end": -1, "orderby": "value", "sort": sort}
+        expected = _PandasDataAccessor().get_data(gui, "x", df, dict(query), _DataFormat.JSON)["value"]["data"]
+        value = _ArrowDataAccessor().get_data(gui, "x", table, dict(query), _DataFormat.JSON)["value"]
+        assert [d["_tp_index"] for d in value["data"]] == [d["_tp_index"] for d in expected]
+    query = {"stats": list(data), "top": 2, "bins": 3}
+    expected = _PandasDataAccessor().get_data(gui, "x", df, dict(query), _DataFormat.JSON)["value"]["stats"]
+    assert _ArrowDataAccessor().get_data(gui, "x", table, query, _DataFormat.JSON)["value"]["stats"] == expected
+
+
+def test_aggregate(gui: Gui, helpers):
+    accessor = _ArrowDataAccessor()
+    table = pa.table({"name": ["A", "B", "A", "B"], "value": [1, 2, 3, 4]})
+    query = {
+        "columns": ["name", "value"],
+        "start": 0,
+        "end": -1,
+        "aggregates": ["name"],
+        "applies": {"value": "sum"},
+    }
+    value = accessor.get_data(gui, "x", table, query, _DataFormat.JSON)["value"]
+    assert value["data"] == [{"name": "A", "value": 4, "_tp_index": 0}, {"name": "B", "value": 6, "_tp_index": 1}]
+
+
+def test_decimator(gui: Gui, helpers, small_dataframe):
+    a_decimator = ScatterDecimator()  # noqa: F841
+
+    accessor = _ArrowDataAccessor()
+    table = pa.table(small_dataframe)
+
+    # set gui frame
+    gui._set_frame(inspect.currentframe())
+
+    gui.add_page("test", "<|Hello {a_decimator}|button|id={btn_id}|>")
+    gui.run(run_server=False)
+    flask_client = gui._server.test_client()
+
+    cid = helpers.create_scope_and_get_sid(gui)
+    # Get the jsx once so that the page will be evaluated -> variable will be registered
+    flask_client.get(f"/taipy-jsx/test?client_id={cid}")
+    with gui.get_flask_app().test_request_context(f"/taipy-jsx/test/?client_id={cid}", data={"client_id": cid}):
+        g.client_id = cid
+
+        ret_data = accessor.get_data(
+            gui,
+            "x",
+            table,
+            {
+                "alldata": True,
+                "decimatorPayload": {
+                    "decimators": [{"decimator": "a_decimator", "chartMode": "markers"}],
+                    "width": 100,
+                },
+            },
+            _DataFormat.JSON,
+        )
+        assert ret_data["alldata"] is True
+        value = ret_data["value"]
+        assert value["dataExtraction"] is True
+        assert len(value["data"]) == 2
+
+
+def test_polars_dataframe(gui: Gui, helpers):
+    pl = pytest.importorskip("polars")
+    accessor = _ArrowDataAccessor()
+    df = pl.DataFrame({"name": ["A", "b", "C", "d", "E"], "value": [4.0, 3.0, 2.0, None, 5.0]})
+    query = {"columns": ["name", "value"], "start": 1, "end": 2}
+    value = accessor.get_data(gui, "x", df, query, _DataFormat.JSON)["value"]
+    assert value["rowcount"] == 5
+    assert [d["name"] for d in value["data"]] == ["b", "C"]
+    query = {
+        "columns": ["name", "value"],
+        "start": 0,
+        "end": -1,
+        "orderby": "value",
+        "sort": "asc",
+        "filters": [{"col": "value", "action": ">", "value": 2.5}],
+    }
+    value = accessor.get_data(gui, "x", df, query, _DataFormat.JSON)["value"]
+    assert value["rowcount"] == 3
+    assert [d["name"] for d in value["data"]] == ["b", "A", "E"]
+    assert [d["_tp_index"] for d in value["data"]] == [1, 0, 4]
@@ -0,0 +1,50 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from taipy.gui.data.column_stats import _get_column_stats, _get_stats_request
+
+
+def test_stats_request():
+    assert _get_stats_request({"start": 0}) is None
+    assert _get_stats_request({"stats": []}) is None
+    assert _get_stats_request({"stats": ["a"]}) == (["a"], 10, 10)
+    assert _get_stats_request({"stats": ["a"], "top": 0, "bins": 4}) == (["a"], 0, 4)
+
+
+def test_number_stats():
+    values = pd.Series([1.0, 2.0, np.nan, 10.0, np.inf])
+    stats = _get_column_stats(values, np.array([3, 1, 2, 1, 1]), top=2, bins=3)
+    assert stats["count"] == 6
+    assert stats["nulls"] == 2
+    assert stats["distinct"] == 4
+    assert stats["values"] == [[1.0, 3], [2.0, 1]]
+    assert stats["min"] == 1.0
+    assert stats["max"] == np.inf
+    assert stats["histogram"]["counts"] == [4, 0, 1]
+    assert stats["histogram"]["edges"] == [1.0, 4.0, 7.0, 10.0]
+
+
+def test_text_and_date_stats():
+    stats = _get_column_stats(pd.Series(["b", None, "a"]), np.array([1, 1, 1]))
+    assert stats["values"] == [["b", 1], ["a", 1]]
+    assert "min" not in stats and "histogram" not in stats
+    dates = pd.Series(pd.to_datetime(["2020-01-02", "2020-01-01"]))
+    stats = _get_column_stats(dates, np.array([1, 2]))
+    assert stats["min"] == datetime(2020, 1, 1)
+    assert stats["values"][0] == [datetime(2020, 1, 1), 2]
+    # categories that do not occur
+    stats = _get_column_stats(pd.Series(["a", "b"]), np.array([0, 2]))
+    assert stats["distinct"] == 1
@@ -0,0 +1,116 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import gc
+import weakref
+
+import numpy as np
+import pandas
+
+from taipy.gui.data.data_cache import _DataCache, _get_data_version
+
+
+def test_data_version(small_dataframe):
+    df = pandas.DataFrame(data=small_dataframe)
+    version = _get_data_version(df)
+    assert version is not None
+    assert version == _get_data_version(df)
+    df.loc[len(df)] = ["D", 4]
+    assert version != _get_data_version(df)
+    assert _get_data_version(object()) is None
+
+
+def test_data_cache_lru():
+    cache = _DataCache(max_entries=2)
+    df = pandas.DataFrame(data={"a": [1, 2, 3]})
+    version = _get_data_version(df)
+    cache.set(df, version, "a", np.arange(3))
+    cache.set(df, version, "b", np.arange(3))
+    assert cache.get(df, version, "a") is not None
+    cache.set(df, version, "c", np.arange(3))
+    assert cache.get(df, version, "b") is None
+    assert cache.get(df, version, "a") is not None
+    assert cache.get(df, ("other",), "a") is None
+    cache.invalidate(df)
+    assert cache.get(df, version, "a") is None
+
+
+def test_data_cache_memory():
+    cache = _DataCache(max_memory=1000)
+    df = pandas.DataFrame(data={"a": [1, 2, 3]})
+    version = _get_data_version(df)
+    cache.set(df, version, "a", np.arange(100))
+    cache.set(df, version, "b", np.arange(100))
+    assert cache.get(df, version, "a") is None
+    assert cache.get(df, version, "b") is not None
+    cache.set(df, version, "c", np.arange(1000))
+    assert cache.get(df, version, "c") is None
+
+
+def test_data_cache_collected():
+    cache = _DataCache()
+    df = pandas.DataFrame(data={"a": [1, 2, 3]})
+    version = _get_data_version(df)
+    cache.set(df, version, "a", np.arange(3))
+    del df
+    gc.collect()
+    df = pandas.DataFrame(data={"a": [1, 2, 3]})
+    assert cache.get(df, version, "a") is None
+
+
+def test_data_version_of_lists():
+    values = {"a": [1, 2, 3], "b": [[1, 2], [3, 4]]}
+    version = _get_data_version(values)
+    assert version is not None
+    assert version == _get_data_version({"a": [1, 2, 3], "b": [[1, 2], [3, 4]]})
+    values["b"][1][0] = 5
+    assert version != _get_data_version(values)
+
+
+def test_data_cache_strong_reference():
+    class Item:
+        pass
+
+    cache = _DataCache(max_entries=1)
+    item = Item()
+    item_ref = weakref.ref(item)
+    values = [item]
+    cache.set(values, _get_data_version(values), "a", np.arange(3))
+    del values, item
+    gc.collect()
+    # lists have no weak references: the source is kept alive while it has entries
+    assert item_ref() is not None
+    other = [1, 2]
+    cache.set(other, _get_data_version(other), "a", np.arange(3))
+    gc.collect()
+    assert item_ref() is None
+
+
+def test_data_cache_shared_memory():
+    budget = _DataCache._get_memory_budget()
+    try:
+        _DataCache._set_memory_budget(2000)
+        first, second = _DataCache(), _DataCache()
+        df = pandas.DataFrame(data={"a": [1, 2, 3]})
+        version = _get_data_version(df)
+        first.set(df, version, "a", np.arange(100))
+        second.set(df, version, "a", np.arange(100))
+        assert first.get(df, version, "a") is not None
+        # the least recently used entry of all the caches is dropped
+        second.set(df, version, "b", np.arange(100))
+        assert second.get(df, version, "a") is None
+        assert first.get(df, version, "a") is not None
+        assert second.get(df, version, "b") is not None
+        assert first.max_memory == 2000
+        second.set(df, version, "c", np.arange(1000))
+        assert second.get(df, version, "c") is None
+    finally:
+        _DataCache._set_memory_budget(budget)
@@ -0,0 +1,148 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+from importlib import util
+
+import pytest
+
+from taipy.gui import Gui
+from taipy.gui.data.data_accessor import _DataAccessors
+from taipy.gui.data.data_format import _DataFormat
+from taipy.gui.utils import _TaipyData
+
+if not util.find_spec("pyarrow"):
+    pytest.skip("pyarrow is not installed", allow_module_level=True)
+
+import pyarrow as pa  # noqa: E402
+import pyarrow.dataset as ds  # noqa: E402
+import pyarrow.feather as feather  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+from taipy.gui.data.dataset_data_accessor import _ArrowDatasetDataAccessor  # noqa: E402
+
+_TABLE = pa.table({"id": list(range(100)), "value": [(i * 37) % 100 for i in range(100)]})
+
+
+@pytest.fixture
+def parquet_dataset(tmp_path):
+    path = tmp_path / "data.parquet"
+    pq.write_table(_TABLE, path, row_group_size=10)
+    return ds.dataset(str(path), format="parquet")
+
+
+@pytest.fixture
+def feather_dataset(tmp_path):
+    path = tmp_path / "data.feather"
+    feather.write_feather(_TABLE, path, chunksize=10)
+    return ds.dataset(str(path), format="feather")
+
+
+def _get_ids(value):
+    return [d["id"] for d in value["data"]]
+
+
+def test_page(gui: Gui, helpers, parquet_dataset, feather_dataset):
+    accessor = _ArrowDatasetDataAccessor()
+    for dataset in (parquet_dataset, feather_dataset):
+        value = accessor.get_data(gui, "x", dataset, {"start": 15, "end": 24}, _DataFormat.JSON)["value"]
+        assert value["rowcount"] == 100
+        assert value["start"] == 15
+        assert _get_ids(value) == list(range(15, 25))
+        assert [d["_tp_index"] for d in value["data"]] == list(range(15, 25))
+
+
+def test_filter_and_sort(gui: Gui, helpers, parquet_dataset, feather_dataset):
+    accessor = _ArrowDatasetDataAccessor()
+    payload = {
+        "start": 0,
+        "end": 4,
+        "filters": [{"col": "id", "action": ">=", "value": 50}],
+        "orderby": "value",
+        "sort": "desc",
+    }
+    expected = sorted((r for r in _TABLE.to_pylist() if r["id"] >= 50), key=lambda r: r["value"], reverse=True)
+    for dataset in (parquet_dataset, feather_dataset):
+        value = accessor.get_data(gui, "x", dataset, payload, _DataFormat.JSON)["value"]
+        assert value["rowcount"] == 50
+        assert _get_ids(value) == [r["id"] for r in expected[:5]]
+        assert [d["_tp_index"] for d in value["data"]] == [r["id"] for r in expected[:5]]
+
+
+def test_filter_prunes_row_groups(gui: Gui, helpers, parquet_dataset):
+    accessor = _ArrowDatasetDataAccessor()
+    payload = {"start": 0, "end": -1, "filters": [{"col": "id", "action": "<", "value": 5}]}
+    value = accessor.get_data(gui, "x", parquet_dataset, payload, _DataFormat.JSON)["value"]
+    assert _get_ids(value) == list(range(5))
+
+
+def test_filter_all_columns(gui: Gui, helpers, tmp_path):
+    accessor = _ArrowDatasetDataAccessor()
+    path = tmp_path / "text.parquet"
+    pq.write_table(pa.table({"id": [0, 1, 2], "a": ["xa", "b", None], "b": ["c", "Xb", "ax"]}), path)
+    dataset = ds.dataset(str(path), format="parquet")
+    payload = {
+        "start": 0,
+        "end": -1,
+        "filters": [{"col": "*", "action": "startswith", "value": "x", "matchcase": False}],
+    }
+    value = accessor.get_data(gui, "x", dataset, payload, _DataFormat.JSON)["value"]
+    assert _get_ids(value) == [0, 1]
+
+
+def test_index_sort(gui: Gui, helpers, parquet_dataset):
+    accessor = _ArrowDatasetDataAccessor()
+    payload = {"start": 0, "end": 2, "orderby": "_tp_index", "sort": "desc"}
+    value = accessor.get_data(gui, "x", parquet_dataset, payload, _DataFormat.JSON)["value"]
+    assert _get_ids(value) == [99, 98, 97]
+
+
+def test_aggregate(gui: Gui, helpers, parquet_dataset):
+    accessor = _ArrowDatasetDataAccessor()
+    payload = {
+        "start": 0,
+        "end": -1,
+        "columns": ["id", "value"],
+        "aggregates": ["value"],
+        "applies": {"id": "count"},
+        "filters": [{"col": "value", "action": "<", "value": 3}],
+    }
+    value = accessor.get_data(gui, "x", parquet_dataset, payload, _DataFormat.JSON)["value"]
+    assert value["rowcount"] == 3
+    assert {d["value"]: d["id"] for d in value["data"]} == {0: 1, 1: 1, 2: 1}
+
+
+def test_alldata(gui: Gui, helpers, parquet_dataset):
+    accessor = _ArrowDatasetDataAccessor()
+    payload = {"alldata": True, "columns": ["id"], "filters": [{"col": "value", "action": "==", "value": 37}]}
+    value = accessor.get_data(gui, "x", parquet_dataset, payload, _DataFormat.JSON)["value"]
+    assert value["data"] == {"id": [1]}
+
+
+def test_col_types(gui: Gui, helpers, parquet_dataset):
+    accessor = _ArrowDatasetDataAccessor()
+    assert accessor.get_col_types("x", parquet_dataset) == {"id": "int64", "value": "int64"}
+
+
+def test_cache_invalidation(gui: Gui, helpers, tmp_path):
+    accessor = _ArrowDatasetDataAccessor()
+    path = tmp_path / "data.parquet"
+    pq.write_table(_TABLE, path)
+    dataset = ds.dataset(str(path), format="parquet")
+    assert accessor.get_data(gui, "x", dataset, {"start": 0, "end": -1}, _DataFormat.JSON)["value"]["rowcount"] == 100
+    accessor._invalidate(dataset)
+    assert accessor.get_data(gui, "x", dataset, {"start": 0, "end": 1}, _DataFormat.JSON)["value"]["rowcount"] == 100
+
+
+def test_registered_accessor(gui: Gui, helpers, parquet_dataset):
+    accessors = _DataAccessors()
+    data = _TaipyData(parquet_dataset, "x")
+    value = accessors._get_data(gui, "x", data, {"start": 0, "end": 2})["value"]
+    assert _get_ids(value) == [0, 1, 2]
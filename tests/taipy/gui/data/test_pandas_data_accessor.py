@@ -13,13 +13,18 @@ import inspect
 from datetime import datetime
 from importlib import util
 
+import numpy as np
 import pandas  # type: ignore
+import pytest
 from flask import g
 
 from taipy.gui import Gui
+from taipy.gui.data import pandas_data_accessor
+from taipy.gui.data.data_cache import _DataCache
 from taipy.gui.data.data_format import _DataFormat
-from taipy.gui.data.decimator import ScatterDecimator
+from taipy.gui.data.decimator import M4, ScatterDecimator
 from taipy.gui.data.pandas_data_accessor import _PandasDataAccessor
+from taipy.gui.data.utils import _argsort_window, vectorized
 
 
 def test_simple_data(gui: Gui, helpers, small_dataframe):
@@ -47,6 +52,55 @@ def test_simple_data_with_arrow(gui: Gui, helpers, small_dataframe):
         assert isinstance(data, bytes)
 
 
+@pytest.mark.skipif(not util.find_spec("pyarrow"), reason="pyarrow is not installed")
+def test_arrow_pages(gui: Gui, helpers):
+    import pyarrow as pa
+
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame({"value": range(10), "date": [datetime(2020, 1, i + 1) for i in range(10)]})
+    query = {"columns": ["value", "date"], "start": 2, "end": 4}
+    value = accessor.get_data(gui, "x", pd, query, _DataFormat.APACHE_ARROW)["value"]
+    assert value["rowcount"] == 10
+    schema = value["schema"]
+    table = pa.ipc.open_stream(schema + value["data"]).read_all()
+    assert table.column("value").to_pylist() == [2, 3, 4]
+    assert table.column("_tp_index").to_pylist() == [2, 3, 4]
+    assert table.column("date_str").to_pylist()[0].startswith("2020-01-03")
+    # the front-end already holds the schema
+    query = {**query, "orderby": "value", "sort": "desc", "arrowschema": value["schemaId"]}
+    value = accessor.get_data(gui, "x", pd, query, _DataFormat.APACHE_ARROW)["value"]
+    assert "schema" not in value
+    table = pa.ipc.open_stream(schema + value["data"]).read_all()
+    assert table.column("value").to_pylist() == [7, 6, 5]
+
+
+@pytest.mark.skipif(not util.find_spec("pyarrow"), reason="pyarrow is not installed")
+def test_arrow_pages_not_cached(gui: Gui, helpers, monkeypatch):
+    import pyarrow as pa
+
+    accessor = _PandasDataAccessor()
+    # the Arrow table of the whole data set cannot be cached
+    accessor._PandasDataAccessor__arrow_cache = _DataCache(max_memory=1000)
+    converted_rows = []
+    build_transferred_cols = _PandasDataAccessor._PandasDataAccessor__build_transferred_cols
+
+    def spy(*args, **kwargs):
+        dataframe = build_transferred_cols(*args, **kwargs)
+        converted_rows.append(len(dataframe))
+        return dataframe
+
+    monkeypatch.setattr(_PandasDataAccessor, "_PandasDataAccessor__build_transferred_cols", spy)
+    pd = pandas.DataFrame({"value": range(1000), "date": pandas.date_range("2020-01-01", periods=1000)})
+    for start in [2, 500]:
+        query = {"columns": ["value", "date"], "start": start, "end": start + 2}
+        value = accessor.get_data(gui, "x", pd, query, _DataFormat.APACHE_ARROW)["value"]
+        assert value["rowcount"] == 1000
+        table = pa.ipc.open_stream(value["data"]).read_all()
+        assert table.column("value").to_pylist() == [start, start + 1, start + 2]
+    # only the pages were converted
+    assert converted_rows == [3, 3]
+
+
 def test_get_all_simple_data(gui: Gui, helpers, small_dataframe):
     accessor = _PandasDataAccessor()
     pd = pandas.DataFrame(data=small_dataframe)
@@ -59,6 +113,28 @@ def test_get_all_simple_data(gui: Gui, helpers, small_dataframe):
     assert data == small_dataframe
 
 
+def test_columnar_data(gui: Gui, helpers):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(
+        {
+            "f": [1.5, np.nan, 3.0],
+            "i": pandas.array([1, None, 3], dtype="Int64"),
+            "s": ["a", None, "c"],
+        }
+    )
+    query = {"columns": ["f", "i", "s"], "start": 0, "end": -1}
+    records = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]
+    assert records["data"] == [
+        {"f": 1.5, "i": 1, "s": "a", "_tp_index": 0},
+        {"f": None, "i": None, "s": None, "_tp_index": 1},
+        {"f": 3.0, "i": 3, "s": "c", "_tp_index": 2},
+    ]
+    value = accessor.get_data(gui, "x", pd, {**query, "columnar": True}, _DataFormat.JSON)["value"]
+    assert value["columnar"] is True
+    assert value["orient"] == "records"
+    assert value["data"] == {"f": [1.5, None, 3.0], "i": [1, None, 3], "s": ["a", None, "c"], "_tp_index": [0, 1, 2]}
+
+
 def test_slice(gui: Gui, helpers, small_dataframe):
     accessor = _PandasDataAccessor()
     pd = pandas.DataFrame(data=small_dataframe)
@@ -240,3 +316,480 @@ def test_decimator(gui: Gui, helpers, small_dataframe):
         assert value
         data = value["data"]
         assert len(data) == 2
+
+
+def test_decimator_m4_zoom(gui: Gui, helpers):
+    a_decimator = M4()  # noqa: F841
+
+    accessor = _PandasDataAccessor()
+    df = pandas.DataFrame({"x": np.arange(1000, dtype=float), "y": np.sin(np.arange(1000) / 10)})
+
+    # set gui frame
+    gui._set_frame(inspect.currentframe())
+
+    gui.add_page("test", "<|Hello {a_decimator}|button|>")
+    gui.run(run_server=False)
+    flask_client = gui._server.test_client()
+
+    cid = helpers.create_scope_and_get_sid(gui)
+    # Get the jsx once so that the page will be evaluated -> variable will be registered
+    flask_client.get(f"/taipy-jsx/test?client_id={cid}")
+    with gui.get_flask_app().test_request_context(f"/taipy-jsx/test/?client_id={cid}", data={"client_id": cid}):
+        g.client_id = cid
+
+        ret_data = accessor.get_data(
+            gui,
+            "x",
+            df,
+            {
+                "columns": ["x", "y"],
+                "alldata": True,
+                "decimatorPayload": {
+                    "decimators": [
+                        {"decimator": "a_decimator", "chartMode": "lines+markers", "xAxis": "x", "yAxis": "y"}
+                    ],
+                    "width": 10,
+                    "relayoutData": {"xaxis.range[0]": 100.5, "xaxis.range[1]": 199.5},
+                },
+            },
+            _DataFormat.JSON,
+        )
+        xs = ret_data["value"]["data"]["x"]
+        # the points next to the displayed range are kept
+        assert 100 in xs and 200 in xs
+        assert len([x for x in xs if 100.5 <= x <= 199.5]) <= 4 * 10
+
+
+def test_decimator_m4_pyramid(gui: Gui, helpers):
+    class CountingM4(M4):
+        builds = 0
+
+        def _build_pyramid(self, x, y):
+            CountingM4.builds += 1
+            return super()._build_pyramid(x, y)
+
+    a_decimator = CountingM4(pyramid=True)  # noqa: F841
+
+    accessor = _PandasDataAccessor()
+    df = pandas.DataFrame({"x": np.arange(10000, dtype=float), "y": np.sin(np.arange(10000) / 10)})
+
+    # set gui frame
+    gui._set_frame(inspect.currentframe())
+
+    gui.add_page("test", "<|Hello {a_decimator}|button|>")
+    gui.run(run_server=False)
+    flask_client = gui._server.test_client()
+
+    cid = helpers.create_scope_and_get_sid(gui)
+    # Get the jsx once so that the page will be evaluated -> variable will be registered
+    flask_client.get(f"/taipy-jsx/test?client_id={cid}")
+    with gui.get_flask_app().test_request_context(f"/taipy-jsx/test/?client_id={cid}", data={"client_id": cid}):
+        g.client_id = cid
+
+        for x_range in [(100.5, 1999.5), (5000, 5100)]:
+            decimator_payload = {
+                "decimators": [{"decimator": "a_decimator", "chartMode": "lines", "xAxis": "x", "yAxis": "y"}],
+                "width": 10,
+                "relayoutData": {"xaxis.range[0]": x_range[0], "xaxis.range[1]": x_range[1]},
+            }
+            ret_data = accessor.get_data(
+                gui,
+                "x",
+                df,
+                {"columns": ["x", "y"], "alldata": True, "decimatorPayload": decimator_payload},
+                _DataFormat.JSON,
+            )
+            expected = df["x"][M4().decimate(df.to_numpy(), decimator_payload)].tolist()
+            assert ret_data["value"]["data"]["x"] == expected
+        # the pyramid is built once for the data set
+        assert CountingM4.builds == 1
+
+
+def test_sort_cache(gui: Gui, helpers, small_dataframe):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(data=small_dataframe)
+    query = {"columns": ["name", "value"], "start": 0, "end": 0, "orderby": "value", "sort": "desc"}
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert data[0]["value"] == 3
+    query["start"] = query["end"] = 1
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert data[0]["value"] == 2
+    pd.loc[len(pd)] = ["D", 4]
+    query["start"] = query["end"] = 0
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert data[0]["value"] == 4
+    pd.loc[0, "value"] = 5
+    accessor._invalidate(pd)
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert data[0]["value"] == 5
+
+
+def test_argsort_window():
+    rng = np.random.default_rng(0)
+    floats = rng.integers(0, 50, 1000).astype(float)
+    floats[rng.integers(0, 1000, 50)] = np.nan
+    dates = rng.integers(0, 50, 1000).astype("datetime64[D]")
+    dates[rng.integers(0, 1000, 50)] = np.datetime64("NaT")
+    for values in (rng.integers(0, 50, 1000), floats, dates):
+        indexes = values.argsort(kind="stable")
+        for start, end in ((0, 9), (20, 39), (900, 999), (960, 979)):
+            assert np.array_equal(_argsort_window(values, start, end, False), indexes[start : end + 1])
+            assert np.array_equal(_argsort_window(values, start, end, True), indexes[::-1][start : end + 1])
+
+
+def test_partial_sort(gui: Gui, helpers):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(data={"value": np.arange(20000) % 1000})
+    query = {"columns": ["value"], "start": 0, "end": 99, "orderby": "value", "sort": "desc"}
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert [d["value"] for d in data[:21]] == [999] * 20 + [998]
+    assert data[0]["_tp_index"] == 19999
+    query = {"columns": ["value"], "start": 19900, "end": 19999, "orderby": "value"}
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert data[-1]["value"] == 999
+
+
+def test_filter_contains(gui: Gui, helpers):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(data={"name": ["Alpha", "beta", None, "ALPHABET"], "value": [1, 2, 3, 4]})
+    query = {
+        "columns": ["name", "value"],
+        "start": 0,
+        "end": -1,
+        "filters": [{"col": "name", "action": "contains", "value": "alpha"}],
+    }
+    value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    assert len(value["value"]["data"]) == 0
+    query["filters"][0]["matchcase"] = False
+    value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    assert [d["value"] for d in value["value"]["data"]] == [1, 4]
+    query["filters"].append({"col": "value", "action": ">", "value": 2})
+    value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    assert [d["value"] for d in value["value"]["data"]] == [4]
+    # cached masks
+    value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    assert [d["value"] for d in value["value"]["data"]] == [4]
+
+
+def test_filter_all_columns(gui: Gui, helpers):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(data={"name": ["Alpha", "beta", None], "other": ["x", "y", "alpha"], "value": [1, 2, 3]})
+    query = {
+        "columns": ["name", "other", "value"],
+        "start": 0,
+        "end": -1,
+        "filters": [{"col": "*", "action": "startswith", "value": "alpha", "matchcase": False}],
+    }
+    value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    assert [d["value"] for d in value["value"]["data"]] == [1, 3]
+    query["filters"][0]["cols"] = ["name"]
+    value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    assert [d["value"] for d in value["value"]["data"]] == [1]
+
+
+def test_filter_search_index(gui: Gui, helpers, monkeypatch):
+    accessor = _PandasDataAccessor()
+    monkeypatch.setattr(_PandasDataAccessor, "_PandasDataAccessor__SEARCH_INDEX_MIN_ROWS", 0)
+    pd = pandas.DataFrame(data={"name": ["Alpha", "beta", None, "ALPHABET", 5], "value": [1, 2, 3, 4, 5]})
+    query = {
+        "columns": ["name", "value"],
+        "start": 0,
+        "end": -1,
+        "filters": [{"col": "name", "action": "contains", "value": "pha"}],
+    }
+    # the column is scanned while the index is built
+    value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    assert [d["value"] for d in value["value"]["data"]] == [1]
+    accessor._PandasDataAccessor__search_executor.submit(lambda: None).result()
+
+    def no_scan(dataframe, filter):
+        raise AssertionError("scanned")
+
+    monkeypatch.setattr(pandas_data_accessor, "_get_filter_mask", no_scan)
+    query["filters"] = [{"col": "name", "action": "contains", "value": "ALPHA", "matchcase": False}]
+    value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    assert [d["value"] for d in value["value"]["data"]] == [1, 4]
+    query["filters"] = [{"col": "name", "action": "startswith", "value": "ALP"}]
+    value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    assert [d["value"] for d in value["value"]["data"]] == [4]
+
+
+def test_column_stats(gui: Gui, helpers, monkeypatch):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(data={"name": ["A", "B", "A", None], "value": [1, 2, 3, 4]})
+    query = {"stats": ["name", "value", "unknown"], "top": 1, "bins": 2, "pagekey": "stats"}
+    value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    assert value["pagekey"] == "stats"
+    stats = value["value"]["stats"]
+    assert "unknown" not in stats
+    assert stats["name"] == {"count": 3, "nulls": 1, "distinct": 2, "values": [["A", 2]]}
+    assert stats["value"]["min"] == 1 and stats["value"]["max"] == 4
+    assert stats["value"]["histogram"]["counts"] == [2, 2]
+    query["filters"] = [{"col": "value", "action": ">", "value": 1}]
+    stats = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["stats"]
+    assert stats["name"]["values"] == [["B", 1]]
+    assert stats["value"]["min"] == 2
+    # cached statistics
+    monkeypatch.setattr(pandas.Series, "value_counts", None)
+    assert accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["stats"] == stats
+
+
+def test_invalid_filter(gui: Gui, helpers, small_dataframe):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(data=small_dataframe)
+    query = {
+        "columns": ["name", "value"],
+        "start": 0,
+        "end": -1,
+        "filters": [{"col": "name", "action": "~", "value": "A"}],
+    }
+    with pytest.warns(UserWarning):
+        value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    assert len(value["value"]["data"]) == 3
+
+
+def test_view_cache(gui: Gui, helpers, monkeypatch):
+    accessor = _PandasDataAccessor()
+    filtered = []
+    filter_rows = _PandasDataAccessor._PandasDataAccessor__filter_rows
+
+    def count_filter_rows(*args):
+        filtered.append(True)
+        return filter_rows(*args)
+
+    monkeypatch.setattr(_PandasDataAccessor, "_PandasDataAccessor__filter_rows", count_filter_rows)
+    pd = pandas.DataFrame(data={"name": ["A", "B", "A", "C", "A"], "value": [5, 4, 3, 2, 1]})
+    query = {
+        "columns": ["name", "value"],
+        "start": 0,
+        "end": 1,
+        "orderby": "value",
+        "filters": [{"col": "name", "action": "==", "value": "A"}],
+    }
+    gui.run(run_server=False, single_client=True)
+    with gui.get_flask_app().app_context():
+        # the views of single client applications belong to the connected client
+        g.client_id = "client"
+        value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]
+        assert value["rowcount"] == 3
+        assert [d["value"] for d in value["data"]] == [1, 3]
+        query["start"] = query["end"] = 2
+        value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]
+        assert value["rowcount"] == 3
+        assert [d["_tp_index"] for d in value["data"]] == [0]
+        assert len(filtered) == 1
+        accessor._drop_client("client")
+        accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+        assert len(filtered) == 2
+        pd.loc[5] = ["A", 0]
+        accessor._invalidate(pd)
+        query["start"] = 0
+        value = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]
+        assert value["rowcount"] == 4
+        assert [d["value"] for d in value["data"]] == [0, 1, 3]
+    # no view is kept without a client
+    accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)
+    assert len(filtered) == 5
+
+
+def test_aggregate_view_cache(gui: Gui, helpers):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(
+        data={"name": ["A", "B", "A"], "value": [1, 2, 3], "date": pandas.to_datetime(["2020-01-01"] * 3)}
+    )
+    query = {
+        "columns": ["name", "value", "date"],
+        "start": 0,
+        "end": -1,
+        "aggregates": ["name"],
+        "applies": {"value": "sum"},
+        "orderby": "value",
+        "sort": "desc",
+    }
+    for _ in range(2):
+        data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+        assert [d["value"] for d in data] == [4, 2]
+        assert "date" not in data[0]
+        assert "date_str" in data[0]
+
+
+def test_page_dates(gui: Gui, helpers):
+    accessor = _PandasDataAccessor()
+    Gui._set_timezone("UTC")
+    pd = pandas.DataFrame(data={"date": pandas.to_datetime(["2020-01-01", "2021-01-01", None, "2019-01-01"])})
+    query = {"columns": ["date"], "start": 1, "end": 2, "orderby": "date", "handlenan": True}
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert [d["date_str"] for d in data] == ["2020-01-01T00:00:00.000000Z", "2021-01-01T00:00:00.000000Z"]
+    assert "date" in pd.columns and len(pd.columns) == 1
+
+
+def test_no_full_copy(gui: Gui, helpers, monkeypatch):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(data={"name": ["A", "B", "C"] * 100, "value": range(300)})
+    copied_lengths = []
+    copy = pandas.DataFrame.copy
+
+    def spy_copy(df, *args, **kwargs):
+        copied_lengths.append(len(df))
+        return copy(df, *args, **kwargs)
+
+    monkeypatch.setattr(pandas.DataFrame, "copy", spy_copy)
+    query = {"columns": ["name", "value"], "start": 10, "end": 19, "orderby": "_tp_index", "sort": "desc"}
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert [d["_tp_index"] for d in data] == list(range(289, 279, -1))
+    assert max(copied_lengths) == 10
+    assert "_tp_index" not in pd.columns
+
+
+def test_aggregate_index(gui: Gui, helpers):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(data={"name": ["B", "A", "B", "A"], "value": [1, 2, 3, 4]}, index=[10, 11, 12, 13])
+    query = {"columns": ["name", "value"], "start": 0, "end": -1, "aggregates": ["name"], "applies": {"value": "sum"}}
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert [(d["value"], d["_tp_index"]) for d in data] == [(6, 11), (4, 10)]
+
+
+def test_style_page_rows(gui: Gui, helpers, monkeypatch):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(data={"value": range(100)})
+    styled_rows = []
+
+    def row_style(state, index, row):
+        styled_rows.append(index)
+        return "odd" if row["value"] % 2 else "even"
+
+    @vectorized
+    def value_tooltip(state, values, indexes, rows, column_name):
+        return np.where(values > 50, f"high {column_name}", f"low {column_name}")
+
+    functions = {"row_style": row_style, "value_tooltip": value_tooltip}
+    monkeypatch.setattr(gui, "_get_user_function", lambda name: functions.get(name, name))
+    monkeypatch.setattr(gui, "_Gui__get_state", lambda: None)
+    query = {
+        "columns": ["value"],
+        "start": 50,
+        "end": 52,
+        "styles": {"": "row_style"},
+        "tooltips": {"value": "value_tooltip"},
+    }
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert styled_rows == [50, 51, 52]
+    assert [d["row_style"] for d in data] == ["even", "odd", "even"]
+    assert [d["tpt__value__value_tooltip"] for d in data] == ["low value", "high value", "high value"]
+
+
+def test_style_annotated_row(gui: Gui, helpers, monkeypatch):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(data={"value": range(10)})
+
+    # annotated parameters do not make a function vectorized
+    def row_style(state, index: int, row: pandas.Series):
+        return "odd" if row["value"] % 2 else "even"
+
+    monkeypatch.setattr(gui, "_get_user_function", lambda name: row_style if name == "row_style" else name)
+    monkeypatch.setattr(gui, "_Gui__get_state", lambda: None)
+    query = {"columns": ["value"], "start": 3, "end": 5, "styles": {"": "row_style"}}
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert [d["row_style"] for d in data] == ["odd", "even", "odd"]
+
+
+def test_aggregate_cache(gui: Gui, helpers, monkeypatch):
+    accessor = _PandasDataAccessor()
+    pd = pandas.DataFrame(data={"name": ["A", "B", "A", "C"], "value": [1, 2, 3, 4], "other": [4, 3, 2, 1]})
+    calls = []
+
+    def spread(values):
+        calls.append(len(values))
+        return values.max() - values.min()
+
+    monkeypatch.setattr(gui, "_get_user_function", lambda name: spread if name == "spread" else name)
+    gui._config.config["data_workers"] = 2
+    query = {
+        "columns": ["name", "value", "other"],
+        "start": 0,
+        "end": -1,
+        "aggregates": ["name"],
+        "applies": {"value": "spread", "other": "spread"},
+        "orderby": "name",
+    }
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert [(d["name"], d["value"], d["other"]) for d in data] == [("A", 2, 2), ("B", 0, 0), ("C", 0, 0)]
+    nb_calls = len(calls)
+    query["sort"] = "desc"
+    data = accessor.get_data(gui, "x", pd, query, _DataFormat.JSON)["value"]["data"]
+    assert [d["name"] for d in data] == ["C", "B", "A"]
+    assert len(calls) == nb_calls
+
+
+def test_append_rows(gui: Gui, helpers):
+    accessor = _PandasDataAccessor()
+    df = pandas.DataFrame({"a": [1, 2], "b": ["x", "y"]})
+    assert accessor._append_rows(df, {"a": 3, "b": "z"})["a"].tolist() == [1, 2, 3]
+    assert accessor._append_rows(df, {"a": [3, 4], "b": ["z", "t"]}).index.tolist() == [0, 1, 2, 3]
+    assert accessor._append_rows(df, [(3, "z")])["b"].tolist() == ["x", "y", "z"]
+    assert accessor._append_rows(df, [{"a": 3, "b": "z"}])["b"].tolist() == ["x", "y", "z"]
+    assert accessor._append_rows([1, 2], [3]) is None
+
+
+def test_data_delta(gui: Gui, helpers):
+    accessor = _PandasDataAccessor()
+    df = pandas.DataFrame({"a": list(range(25))})
+    # the last page of a table
+    payload = {"columns": ["a"], "pagekey": "20-29", "start": 20, "end": 29, "orderby": ""}
+    value = accessor._get_data_delta(gui, "x", df, payload, 22, _DataFormat.JSON)["value"]
+    assert value["rowcount"] == 25
+    assert value["start"] == 22
+    assert [r["a"] for r in value["data"]] == [22, 23, 24]
+    # new rows that are not displayed
+    value = accessor._get_data_delta(gui, "x", df, {**payload, "start": 0, "end": 9}, 22, _DataFormat.JSON)["value"]
+    assert value["rowcount"] == 25
+    assert value["data"] == []
+    # chart
+    payload = {"columns": ["a"], "pagekey": "a", "alldata": True}
+    value = accessor._get_data_delta(gui, "x", df, payload, 22, _DataFormat.JSON)["value"]
+    assert value["data"] == {"a": [22, 23, 24]}
+    # sorted, filtered or decimated data is requested again
+    assert (
+        accessor._get_data_delta(gui, "x", df, {**payload, "alldata": False, "orderby": "a"}, 22, _DataFormat.JSON)
+        is None
+    )
+    assert accessor._get_data_delta(gui, "x", df, {**payload, "filters": [{}]}, 22, _DataFormat.JSON) is None
+    payload = {**payload, "decimatorPayload": {"decimators": [{"decimator": "d"}]}}
+    assert accessor._get_data_delta(gui, "x", df, payload, 22, _DataFormat.JSON) is None
+
+
+def test_multi_data_workers(gui: Gui, helpers, monkeypatch):
+    a_decimator = ScatterDecimator()  # noqa: F841
+
+    accessor = _PandasDataAccessor()
+    x = np.arange(200)
+    frames = [pandas.DataFrame({"x": x, "y": np.sin(x / 10)}), "not a frame", pandas.DataFrame({"x": x, "y": x % 7})]
+
+    gui._set_frame(inspect.currentframe())
+    gui.add_page("test", "<|Hello {a_decimator}|button|>")
+    gui.run(run_server=False)
+    flask_client = gui._server.test_client()
+    cid = helpers.create_scope_and_get_sid(gui)
+    flask_client.get(f"/taipy-jsx/test?client_id={cid}")
+    on_changes = []
+    monkeypatch.setattr(gui, "_call_on_change", lambda name, value: on_changes.append((name, value)))
+    payload = {
+        "columns": ["0/x", "0/y", "2/x", "2/y"],
+        "alldata": True,
+        "decimatorPayload": {
+            "decimators": [{"decimator": "a_decimator", "chartMode": "markers", "xAxis": "x", "yAxis": "y"}],
+            "width": 50,
+        },
+    }
+    with gui.get_flask_app().test_request_context(f"/taipy-jsx/test/?client_id={cid}", data={"client_id": cid}):
+        g.client_id = cid
+        expected = accessor.get_data(gui, "x", frames, payload, _DataFormat.JSON)
+        expected_changes = list(on_changes)
+        on_changes.clear()
+        gui._config.config["data_workers"] = 2
+        # the decimator is found in the scope of the client from the worker threads
+        assert accessor.get_data(gui, "x", frames, payload, _DataFormat.JSON) == expected
+    assert on_changes == expected_changes
+    assert len(on_changes) == 2
+    assert expected["value"]["data"][1] is None
@@ -0,0 +1,48 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import numpy as np
+import pandas as pd
+
+from taipy.gui.data.search_index import _SearchIndex
+
+
+def test_search_index():
+    column = pd.Series(["Hello World", "world peace", None, "HELLO", "abc", 3, "hello world", "Hello World"])
+    index = _SearchIndex(column)
+    assert index.get_mask("world").tolist() == [False, True, False, False, False, False, True, False]
+    assert index.get_mask("WORLD", match_case=False).tolist() == [True, True, False, False, False, False, True, True]
+    assert index.get_mask("hel", match_case=False, starts_with=True).tolist() == [
+        True,
+        False,
+        False,
+        True,
+        False,
+        False,
+        True,
+        True,
+    ]
+    # too short to use the trigrams
+    assert index.get_mask("o").sum() == 4
+    assert not index.get_mask("xyz").any()
+    assert not index.get_mask("ld p", starts_with=True).any()
+    assert index.get_mask("").sum() == 6
+
+
+def test_search_index_matches_scan():
+    rng = np.random.default_rng(0)
+    words = np.array(["error", "warning", "user", "login", "failed", "timeout", "Cache", "request"])
+    column = pd.Series([" ".join(rng.choice(words, 5)) + f" id={i % 997}" for i in range(5000)])
+    index = _SearchIndex(column)
+    for text in ["id=12", "failed time", "CACHE", "ure", "zz"]:
+        for match_case in (True, False):
+            expected = column.str.contains(text, case=match_case, regex=False).to_numpy()
+            assert (index.get_mask(text, match_case) == expected).all()
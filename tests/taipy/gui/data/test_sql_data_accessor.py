@@ -0,0 +1,318 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import sqlite3
+from functools import partial
+
+import pandas as pd
+import pytest
+
+from taipy.gui import Gui
+from taipy.gui.data import SqlTable
+from taipy.gui.data.data_accessor import _DataAccessors
+from taipy.gui.data.data_format import _DataFormat
+from taipy.gui.data.pandas_data_accessor import _PandasDataAccessor
+from taipy.gui.data.sql_data_accessor import _SqlDataAccessor
+from taipy.gui.data.sql_table import _get_identifier_quote
+from taipy.gui.utils import _TaipyData
+
+
+@pytest.fixture
+def connect(tmp_path):
+    path = str(tmp_path / "data.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, category TEXT, price REAL)")
+        connection.executemany(
+            "INSERT INTO items VALUES (?, ?, ?, ?)",
+            [(i, f"item_{i}%", "abc"[i % 3], float(i % 7)) for i in range(100)],
+        )
+    connection.close()
+    return partial(sqlite3.connect, path, check_same_thread=False)
+
+
+def _get_ids(value):
+    return [d["id"] for d in value["data"]]
+
+
+def test_page(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    table = SqlTable(connect, "SELECT * FROM items", index="id")
+    value = accessor.get_data(gui, "x", table, {"start": 10, "end": 19}, _DataFormat.JSON)["value"]
+    assert value["rowcount"] == 100
+    assert value["start"] == 10
+    assert _get_ids(value) == list(range(10, 20))
+    assert [d["_tp_index"] for d in value["data"]] == list(range(10, 20))
+
+
+def test_keyset_pagination(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    table = SqlTable(connect, "SELECT * FROM items WHERE id % 2 = 0", index="id")
+    payload = {"start": 0, "end": 9, "sort": "desc"}
+    assert _get_ids(accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]) == list(range(98, 79, -2))
+    # the next page starts after the last index of the previous one
+    payload = {"start": 10, "end": 19, "sort": "desc"}
+    assert _get_ids(accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]) == list(range(78, 59, -2))
+
+
+def test_filter_and_sort(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    table = SqlTable(connect, "SELECT * FROM items WHERE price < ?", params=[6], index="id")
+    payload = {
+        "start": 0,
+        "end": 2,
+        "filters": [{"col": "category", "action": "==", "value": "a"}, {"col": "id", "action": ">=", "value": 50}],
+        "orderby": "price",
+        "sort": "desc",
+    }
+    value = accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]
+    assert value["rowcount"] == len([i for i in range(50, 100) if i % 3 == 0 and i % 7 < 6])
+    assert _get_ids(value) == [96, 75, 54]
+
+
+def test_contains_filter(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    table = SqlTable(connect, "SELECT * FROM items", index="id")
+    # wildcards are escaped
+    payload = {"start": 0, "end": -1, "filters": [{"col": "name", "action": "contains", "value": "_9%"}]}
+    value = accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]
+    assert _get_ids(value) == [9]
+    payload["filters"][0].update(value="M_9%", matchcase=False)
+    value = accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]
+    assert _get_ids(value) == [9]
+
+
+def test_text_filters_match_case(gui: Gui, helpers, tmp_path):
+    path = str(tmp_path / "names.db")
+    names = ["Alpha", "alpha", "ALPHABET", "beta", "alphaBeta", None]
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE names (id INTEGER PRIMARY KEY, name TEXT)")
+        connection.executemany("INSERT INTO names VALUES (?, ?)", list(enumerate(names)))
+    connection.close()
+    accessor = _SqlDataAccessor()
+    table = SqlTable(partial(sqlite3.connect, path, check_same_thread=False), "SELECT * FROM names", index="id")
+    df = pd.DataFrame({"id": range(len(names)), "name": names})
+    for action, value, matchcase in [
+        ("contains", "lpha", True),
+        ("contains", "Beta", True),
+        ("contains", "BETA", False),
+        ("startswith", "alpha", True),
+        ("startswith", "ALPHA", False),
+    ]:
+        payload = {
+            "columns": ["id", "name"],
+            "start": 0,
+            "end": -1,
+            "filters": [{"col": "name", "action": action, "value": value, "matchcase": matchcase}],
+        }
+        expected = _get_ids(_PandasDataAccessor().get_data(gui, "x", df, payload, _DataFormat.JSON)["value"])
+        assert _get_ids(accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]) == expected
+
+
+def test_text_filters(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    table = SqlTable(connect, "SELECT * FROM items WHERE id < 20", index="id")
+    payload = {"start": 0, "end": -1, "filters": [{"col": "name", "action": "startswith", "value": "item_1"}]}
+    value = accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]
+    assert _get_ids(value) == [1] + list(range(10, 20))
+    payload["filters"] = [{"col": "*", "action": "startswith", "value": "c"}]
+    value = accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]
+    assert _get_ids(value) == list(range(2, 20, 3))
+    payload["filters"] = [{"col": "*", "action": "contains", "value": "2", "cols": ["category", "name"]}]
+    value = accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]
+    assert _get_ids(value) == [2, 12]
+
+
+def test_column_stats(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    table = SqlTable(connect, "SELECT * FROM items", index="id")
+    payload = {"stats": ["category", "price"], "top": 2, "filters": [{"col": "id", "action": "<", "value": 10}]}
+    stats = accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]["stats"]
+    assert stats["category"] == {"count": 10, "nulls": 0, "distinct": 3, "values": [["a", 4], ["b", 3]]}
+    assert stats["price"]["min"] == 0.0 and stats["price"]["max"] == 6.0
+    assert sum(stats["price"]["histogram"]["counts"]) == 10
+
+
+def test_invalid_filter(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    table = SqlTable(connect, "SELECT * FROM items")
+    payload = {"start": 0, "end": 4, "filters": [{"col": "id; DROP TABLE items", "action": "==", "value": 1}]}
+    with pytest.warns(UserWarning):
+        value = accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]
+    assert value["rowcount"] == 100
+
+
+def test_reversed_position(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    table = SqlTable(connect, "SELECT * FROM items")
+    payload = {"start": 0, "end": 2, "orderby": "_tp_index", "sort": "desc"}
+    value = accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]
+    assert _get_ids(value) == [99, 98, 97]
+    assert [d["_tp_index"] for d in value["data"]] == [99, 98, 97]
+
+
+def test_aggregate(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    table = SqlTable(connect, "SELECT * FROM items", index="id")
+    payload = {
+        "start": 0,
+        "end": -1,
+        "columns": ["id", "category", "price"],
+        "aggregates": ["category"],
+        "applies": {"price": "max", "id": "count"},
+    }
+    value = accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]
+    assert value["rowcount"] == 3
+    assert [(d["category"], d["id"], d["price"], d["_tp_index"]) for d in value["data"]] == [
+        ("a", 34, 6.0, 0),
+        ("b", 33, 6.0, 1),
+        ("c", 33, 6.0, 2),
+    ]
+
+
+def test_alldata(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    table = SqlTable(connect, "SELECT id, price FROM items", index="id")
+    payload = {"alldata": True, "columns": ["price"], "filters": [{"col": "id", "action": "<", "value": 3}]}
+    value = accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]
+    assert value["data"] == {"price": [0.0, 1.0, 2.0]}
+
+
+def test_col_types(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    table = SqlTable(connect, "SELECT * FROM items")
+    assert accessor.get_col_types("x", table) == {
+        "id": "int64",
+        "name": "object",
+        "category": "object",
+        "price": "float64",
+    }
+
+
+def test_col_types_leading_null(gui: Gui, helpers, tmp_path):
+    path = str(tmp_path / "nulls.db")
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE measures (id INTEGER, amount INTEGER, value REAL, name TEXT, at TIMESTAMP)")
+        connection.executemany(
+            "INSERT INTO measures VALUES (?, ?, ?, ?, ?)",
+            [(0, None, None, None, None), (1, 3, 1.5, "a", "2024-01-01 10:00:00")],
+        )
+    connection.close()
+    connect = partial(sqlite3.connect, path, check_same_thread=False, detect_types=sqlite3.PARSE_DECLTYPES)
+    accessor = _SqlDataAccessor()
+    assert accessor.get_col_types("x", SqlTable(connect, "SELECT * FROM measures")) == {
+        "id": "int64",
+        "amount": "int64",
+        "value": "float64",
+        "name": "object",
+        "at": "datetime64[ns]",
+    }
+
+
+def test_count_invalidation(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    table = SqlTable(connect, "SELECT * FROM items")
+    assert accessor.get_data(gui, "x", table, {"start": 0, "end": 1}, _DataFormat.JSON)["value"]["rowcount"] == 100
+    with connect() as connection:
+        connection.execute("DELETE FROM items WHERE id >= 50")
+    assert accessor.get_data(gui, "x", table, {"start": 0, "end": 1}, _DataFormat.JSON)["value"]["rowcount"] == 100
+    accessor._invalidate(table)
+    assert accessor.get_data(gui, "x", table, {"start": 0, "end": 1}, _DataFormat.JSON)["value"]["rowcount"] == 50
+
+
+def test_shared_connection_pool(connect):
+    opened = []
+
+    def tracked_connect():
+        opened.append(connect())
+        return opened[-1]
+
+    table1 = SqlTable(tracked_connect, "SELECT * FROM items")
+    table2 = SqlTable(tracked_connect, "SELECT id FROM items")
+    for table in (table1, table2, table1):
+        table._execute(lambda style: ("SELECT COUNT(*) FROM items", []))
+    assert len(opened) == 1
+
+
+def test_pooled_connection_rollback(connect):
+    class Connection(object):
+        def __init__(self):
+            self.connection = connect()
+            self.rollbacks = 0
+
+        def cursor(self):
+            return self.connection.cursor()
+
+        def rollback(self):
+            self.rollbacks += 1
+            self.connection.rollback()
+
+        def close(self):
+            self.connection.close()
+
+    opened = []
+
+    def tracked_connect():
+        opened.append(Connection())
+        return opened[-1]
+
+    table = SqlTable(tracked_connect, "SELECT * FROM items")
+    for _ in range(2):
+        table._execute(lambda style: ("SELECT COUNT(*) FROM items", []))
+    # the transaction is ended before the connection goes back to the pool
+    assert len(opened) == 1 and opened[0].rollbacks == 2
+
+
+def test_identifier_quote(gui: Gui, helpers, connect):
+    accessor = _SqlDataAccessor()
+    # SQLite also accepts the MySQL quotes
+    table = SqlTable(connect, "SELECT * FROM items", index="id", quote="`")
+    payload = {"start": 0, "end": 2, "filters": [{"col": "category", "action": "==", "value": "b"}], "orderby": "price"}
+    assert _get_ids(accessor.get_data(gui, "x", table, payload, _DataFormat.JSON)["value"]) == [7, 28, 49]
+    assert SqlTable(connect, "SELECT * FROM items").quote is None
+    with pytest.raises(ValueError):
+        SqlTable(connect, "SELECT * FROM items", quote="'")
+    mysql_connection = type("Connection", (object,), {"__module__": "pymysql.connections"})()
+    assert _get_identifier_quote(mysql_connection) == "`"
+    assert _get_identifier_quote(sqlite3.connect(":memory:")) == '"'
+
+
+def test_mysql_text_filters(gui: Gui, helpers):
+    queries = []
+
+    class Cursor:
+        description = [("name",)]
+
+        def execute(self, sql, params):
+            queries.append(sql)
+
+        def fetchall(self):
+            return [(1,)] if "COUNT(*)" in queries[-1] else [("a",)]
+
+        def close(self):
+            pass
+
+    connection_type = type(
+        "Connection",
+        (object,),
+        {"__module__": "pymysql.connections", "cursor": lambda self: Cursor(), "rollback": lambda self: None},
+    )
+    table = SqlTable(connection_type, "SELECT name FROM names", paramstyle="format")
+    payload = {"start": 0, "end": -1, "filters": [{"col": "name", "action": "contains", "value": "A"}]}
+    _SqlDataAccessor().get_data(gui, "x", table, payload, _DataFormat.JSON)
+    # the default collations of MySQL ignore the case
+    assert any("CAST(`name` AS BINARY) LIKE CAST(%s AS BINARY)" in q for q in queries)
+
+
+def test_registered_accessor(gui: Gui, helpers, connect):
+    accessors = _DataAccessors()
+    data = _TaipyData(SqlTable(connect, "SELECT * FROM items", index="id"), "x")
+    value = accessors._get_data(gui, "x", data, {"start": 0, "end": 2})["value"]
+    assert _get_ids(value) == [0, 1, 2]
@@ -0,0 +1,121 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+# Reference implementations of the decimators, one point or one bin at a time.
+# The tests check that the decimators select the same points, and tools/benchmark_decimators.py
+# measures how much faster the decimators are.
+import heapq
+import typing as t
+
+import numpy as np
+
+from taipy.gui.data.decimator.rdp import RDP
+
+
+def lttb_loop(data: np.ndarray, n_out: int) -> np.ndarray:
+    # previous implementation of LTTB, one bin at a time
+    if n_out >= data.shape[0]:
+        return np.full(len(data), True)
+    n_bins = n_out - 2
+    data_bins = np.array_split(data[1:-1], n_bins)
+    prev_a = data[0]
+    start_pos = 0
+    out_mask = np.full(len(data), False)
+    out_mask[0] = True
+    out_mask[len(data) - 1] = True
+    for i in range(len(data_bins)):
+        bs = data_bins[i]
+        c = (data_bins[i + 1] if i < n_bins - 1 else data[-1:]).mean(axis=0)
+        areas = 0.5 * abs((prev_a[0] - c[0]) * ((bs - prev_a)[:, 1]) - ((prev_a - bs)[:, 0]) * (c[1] - prev_a[1]))
+        bs_pos = np.argmax(areas)
+        prev_a = bs[bs_pos]
+        out_mask[start_pos + bs_pos] = True
+        start_pos += len(bs)
+    return out_mask
+
+
+def scatter_loop(data: np.ndarray, grid_x: int, grid_y: int, max_overlap_points: int) -> np.ndarray:
+    # previous implementation of ScatterDecimator, one point at a time
+    grid_sizes = [grid_x, grid_y, grid_x][: data.shape[1]]
+    cells = np.rint((data - data.min(axis=0)) * grid_sizes / np.ptp(data, axis=0)).astype(int)
+    grid = np.zeros([size + 1 for size in grid_sizes], dtype=int)
+    mask = np.full(len(data), False)
+    for i in np.arange(len(data)):
+        if grid[tuple(cells[i])] < max_overlap_points:
+            grid[tuple(cells[i])] += 1
+            mask[i] = True
+    return mask
+
+
+def rdp_epsilon_stack(data: np.ndarray, epsilon: float) -> np.ndarray:
+    # previous implementation of the RDP epsilon mode, one segment at a time
+    mask = np.full(len(data), True)
+    stack = [(0, len(data) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start <= 1:
+            continue
+        dsq = RDP.dsquared_line_points(data[start], data[end], data[start + 1 : end])
+        if (dsq > epsilon**2).any():
+            mid = np.argmax(dsq) + 1 + start
+            stack.extend([(start, mid), (mid, end)])
+        else:
+            mask[start + 1 : end] = False
+    return mask
+
+
+def rdp_points_tree(data: np.ndarray, n_out: int) -> np.ndarray:
+    # previous implementation of the RDP points mode, keeping the points with the largest distances
+    weights = np.empty(len(data))
+    weights[0] = weights[-1] = float("inf")
+    stack = [(0, len(data) - 1)]
+    while stack:
+        start, end = stack.pop()
+        if end - start <= 1:
+            continue
+        dsq = RDP.dsquared_line_points(data[start], data[end], data[start + 1 : end])
+        max_dist_index = np.argmax(dsq) + start + 1
+        weights[max_dist_index] = np.amax(dsq)
+        stack.append((start, max_dist_index))
+        stack.append((max_dist_index, end))
+    return weights >= np.sort(weights)[len(data) - n_out]
+
+
+def rdp_points_heap(data: np.ndarray, n_out: int) -> np.ndarray:
+    # greedy refinement with a priority queue on the distance of the farthest point of the segments
+    def push(start, end):
+        if end - start > 1:
+            dsq = RDP.dsquared_line_points(data[start], data[end], data[start + 1 : end])
+            heapq.heappush(heap, (-np.max(dsq), start, end, start + 1 + int(np.argmax(dsq))))
+
+    mask = np.full(len(data), False)
+    mask[[0, -1]] = True
+    heap: t.List[t.Tuple[float, int, int, int]] = []
+    push(0, len(data) - 1)
+    for _ in range(n_out - 2):
+        _, start, end, mid = heapq.heappop(heap)
+        mask[mid] = True
+        push(start, mid)
+        push(mid, end)
+    return mask
+
+
+def m4_loop(x: np.ndarray, y: np.ndarray, width: int, x0: float, x1: float) -> np.ndarray:
+    # M4 one point at a time, without missing values
+    edges = x0 + (x1 - x0) * np.arange(width) / width
+    columns: t.Dict[int, t.List[int]] = {}
+    for i in range(len(x)):
+        column = width if x[i] > x1 else int(np.searchsorted(edges, x[i], side="right")) - 1
+        columns.setdefault(column, []).append(i)
+    mask = np.full(len(x), False)
+    for rows in columns.values():
+        mask[[rows[0], rows[-1], rows[int(np.argmin(y[rows]))], rows[int(np.argmax(y[rows]))]]] = True
+    return mask
@@ -13,11 +13,14 @@ import numpy as np
 import pandas as pd
 
 from taipy.gui.data.decimator.lttb import LTTB
+from taipy.gui.data.decimator.m4 import M4
 from taipy.gui.data.decimator.minmax import MinMaxDecimator
 from taipy.gui.data.decimator.rdp import RDP
 from taipy.gui.data.decimator.scatter_decimator import ScatterDecimator
 from taipy.gui.data.utils import _df_data_filter
 
+from ..decimator_helpers import lttb_loop, m4_loop, rdp_epsilon_stack, rdp_points_heap, scatter_loop
+
 
 def test_data_filter_1(csvdata):
     df, _ = _df_data_filter(csvdata[:1500], None, "Daily hospital occupancy", "", MinMaxDecimator(100), {}, False)
@@ -44,3 +47,127 @@ def test_data_filter_5(csvdata):
         csvdata[:1500], None, "Daily hospital occupancy", "", ScatterDecimator(), {"width": 200, "height": 100}, False
     )
     assert df.shape[0] == 1150
+
+
+def test_lttb_vectorized():
+    rng = np.random.default_rng(42)
+    for n, n_out in [(10, 3), (100, 97), (1000, 50), (1000, 333), (5000, 100), (5000, 2000), (20000, 300)]:
+        x = np.arange(n)
+        for data in [
+            np.column_stack([x, rng.normal(size=n).cumsum()]),
+            np.column_stack([x, rng.integers(0, 5, n)]),
+            np.asfortranarray(np.column_stack([x, np.sin(x / 7.0), rng.normal(size=n)])),
+        ]:
+            assert np.array_equal(LTTB(n_out).decimate(data, {}), lttb_loop(data, n_out))
+
+
+def test_scatter_decimator_vectorized():
+    rng = np.random.default_rng(42)
+    for n, n_dims, ratio, max_overlap_points in [(1000, 2, 1, 3), (5000, 2, 4.5, 1), (5000, 3, 10, 2), (300, 3, 1, 5)]:
+        data = rng.normal(size=(n, n_dims))
+        decimator = ScatterDecimator(binning_ratio=ratio, max_overlap_points=max_overlap_points)
+        mask = decimator.decimate(data, {"width": 200, "height": 100})
+        assert np.array_equal(mask, scatter_loop(data, round(200 / ratio), round(100 / ratio), max_overlap_points))
+
+
+def test_scatter_decimator_edge_cases():
+    decimator = ScatterDecimator(max_overlap_points=2)
+    # all the x values are the same
+    data = np.column_stack([np.ones(6), [0.0, 0.0, 0.0, 1.0, 1.0, 1.0]])
+    assert decimator.decimate(data, {"width": 10, "height": 10}).tolist() == [True, True, False, True, True, False]
+    # points with missing coordinates are dropped
+    data[1, 1] = np.nan
+    assert decimator.decimate(data, {"width": 10, "height": 10}).tolist() == [True, False, True, True, True, False]
+    assert decimator.decimate(np.empty((0, 2)), {"width": 10, "height": 10}).tolist() == []
+
+
+def test_rdp_vectorized():
+    rng = np.random.default_rng(42)
+    for n in [10, 1000, 20000]:
+        data = np.column_stack([np.arange(n, dtype=float), rng.normal(size=n).cumsum()])
+        for epsilon in [0.5, 3]:
+            assert np.array_equal(RDP(epsilon=epsilon).decimate(data, {}), rdp_epsilon_stack(data, epsilon))
+        for n_out in [3, n // 10, n // 2]:
+            if n_out > 2:
+                assert np.array_equal(RDP(n_out=n_out).decimate(data, {}), rdp_points_heap(data, n_out))
+
+
+def test_rdp_windows():
+    rng = np.random.default_rng(42)
+    data = np.column_stack([np.arange(10000, dtype=float), rng.normal(size=10000).cumsum()])
+    mask = RDP(n_out=500, window_size=3000).decimate(data, {})
+    assert mask.sum() == 500
+    # the windows bounds are kept
+    assert mask[[0, 2500, 5000, 7499, 9999]].all()
+    mask = RDP(epsilon=3, window_size=3000).decimate(data, {})
+    assert mask[[0, 2500, 5000, 7499, 9999]].all()
+    assert np.array_equal(mask[:2501], RDP(epsilon=3).decimate(data[:2501], {}))
+
+
+def test_rdp_closed_shape():
+    # the first and last points are the same
+    data = np.array([[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 1.0], [0.0, 0.0]])
+    assert RDP(n_out=3).decimate(data, {}).tolist() == [True, False, True, False, True]
+    assert RDP(epsilon=0.5).decimate(data, {}).all()
+
+
+def test_m4():
+    rng = np.random.default_rng(42)
+    x = np.sort(rng.uniform(0, 100, 20000))
+    y = rng.normal(size=20000).cumsum()
+    data = np.column_stack([x, y])
+    mask = M4().decimate(data, {"width": 300})
+    assert mask.sum() <= 4 * 300
+    assert np.array_equal(mask, m4_loop(x, y, 300, x[0], x[-1]))
+    # zoomed: the points next to the displayed range are kept
+    mask = M4().decimate(data, {"width": 300, "relayoutData": {"xaxis.range[0]": 20, "xaxis.range[1]": 30}})
+    assert np.array_equal(mask, m4_loop(x, y, 300, 20, 30))
+    assert mask[np.searchsorted(x, 20) - 1] and mask[np.searchsorted(x, 30)]
+    # the order of the points is not relevant
+    shuffled = rng.permutation(20000)
+    assert np.array_equal(
+        M4().decimate(data[shuffled], {"width": 300}), m4_loop(x[shuffled], y[shuffled], 300, x[0], x[-1])
+    )
+
+
+def test_m4_edge_cases():
+    assert M4().decimate(np.empty((0, 2)), {"width": 300}).tolist() == []
+    data = np.column_stack([np.arange(10, dtype=float), np.arange(10, dtype=float)])
+    assert M4().decimate(data, {}).all()
+    assert M4().decimate(data, {"width": 1}).tolist() == [True] + [False] * 8 + [True]
+    # the gaps in the line are kept, with the points around them
+    data[4:7, 1] = np.nan
+    assert np.flatnonzero(M4().decimate(data, {"width": 1})).tolist() == [0, 3, 4, 7, 9]
+
+
+def test_m4_dates():
+    df = pd.DataFrame(
+        {"Date": pd.date_range("2024-01-01", periods=1000, freq="h"), "Value": np.sin(np.arange(1000) / 10)}
+    )
+    payload = {"width": 20, "relayoutData": {"xaxis.range[0]": "2024-01-10", "xaxis.range[1]": "2024-01-20 12:00"}}
+    df_filtered, _ = _df_data_filter(df, "Date", "Value", "", M4(), payload, False)
+    assert df_filtered.shape[0] <= 4 * 20 + 8
+    dates = df_filtered["Date"]
+    assert dates.min() < pd.Timestamp("2024-01-10") and dates.max() > pd.Timestamp("2024-01-20 12:00")
+    inside = df[(df["Date"] >= "2024-01-10") & (df["Date"] <= "2024-01-20 12:00")]["Value"]
+    inside_filtered = df_filtered[(dates >= "2024-01-10") & (dates <= "2024-01-20 12:00")]["Value"]
+    assert inside_filtered.max() == inside.max() and inside_filtered.min() == inside.min()
+
+
+def test_m4_pyramid():
+    rng = np.random.default_rng(42)
+    for n in [10, 1000, 30001]:
+        x = np.sort(rng.uniform(0, 100, n))
+        for y in [rng.normal(size=n).cumsum(), rng.integers(0, 3, n).astype(float)]:
+            data = np.column_stack([x, y])
+            decimator = M4(pyramid=True)
+            pyramid = decimator._build_pyramid(x, y)
+            for width, x_range in [(1, None), (300, None), (1000, (20, 30)), (50, (-10, 0.5)), (7, (99.9, 120))]:
+                payload = {"width": width}
+                if x_range:
+                    payload["relayoutData"] = {"xaxis.range[0]": x_range[0], "xaxis.range[1]": x_range[1]}
+                rows = decimator._decimate_pyramid(pyramid, payload)
+                assert np.array_equal(rows, np.flatnonzero(M4().decimate(data, payload)))
+    # the pyramid needs sorted values without missing ones
+    assert M4(pyramid=True)._build_pyramid(np.array([1.0, 0.0]), np.array([1.0, 2.0])) is None
+    assert M4(pyramid=True)._build_pyramid(np.array([0.0, 1.0]), np.array([1.0, np.nan])) is None
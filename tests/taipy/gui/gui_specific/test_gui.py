@@ -10,6 +10,7 @@
 # specific language governing permissions and limitations under the License.
 
 import json
+import sys
 
 import pandas as pd
 import pytest
@@ -69,6 +70,29 @@ def test__tbl_cols(gui: Gui):
         assert repr(res) == "Taipy: Do not update"
 
 
+def test__tbl_cols_cache(gui: Gui, monkeypatch):
+    gui_module = sys.modules[type(gui).__module__]
+    calls = []
+    get_columns_dict = gui_module._get_columns_dict
+
+    def counting_get_columns_dict(*args, **kwargs):
+        calls.append(args)
+        return get_columns_dict(*args, **kwargs)
+
+    monkeypatch.setattr(gui_module, "_get_columns_dict", counting_get_columns_dict)
+    gui.run(run_server=False)
+    with gui.get_flask_app().app_context():
+        data = pd.DataFrame({"col1": [0, 1, 2], "col2": [True, True, False]})
+        res = gui._tbl_cols(True, None, json.dumps({}), json.dumps({"data": "data"}), data=data)
+        data = pd.DataFrame({"col1": [3, 4], "col2": [False, True]})
+        assert gui._tbl_cols(True, None, json.dumps({}), json.dumps({"data": "data"}), data=data) == res
+        assert len(calls) == 1
+        data = pd.DataFrame({"col1": [0.5], "col2": [False]})
+        res = gui._tbl_cols(True, None, json.dumps({}), json.dumps({"data": "data"}), data=data)
+        assert json.loads(res)["col1"]["type"] == "float"
+        assert len(calls) == 2
+
+
 def test__chart_conf(gui: Gui):
     data = pd.DataFrame({"col1": [0, 1, 2], "col2": [True, True, False]})
     gui.run(run_server=False)
@@ -0,0 +1,79 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import inspect
+
+import pandas as pd
+from flask import g
+
+from taipy.gui import Gui, Markdown, State, invoke_callback
+
+
+def test_append_rows(gui: Gui, helpers):
+    data = pd.DataFrame({"a": [1, 2, 3]})
+
+    def append(state: State):
+        state.append_rows("data", {"a": 4})
+
+    def assign(state: State):
+        state.data = pd.DataFrame({"a": [1]})
+
+    gui._set_frame(inspect.currentframe())
+    gui.add_page("test", Markdown("<|{data}|table|>"))
+    gui.run(run_server=False)
+    flask_client = gui._server.test_client()
+    ws_client = gui._server._ws.test_client(gui._server.get_flask())
+    sid = helpers.create_scope_and_get_sid(gui)
+    flask_client.get(f"/taipy-jsx/test?client_id={sid}")
+    var_name = "_TpD_tpec_TpExPr_data_TPMDL_0"
+    ws_client.emit(
+        "message",
+        {
+            "client_id": sid,
+            "type": "DU",
+            "name": var_name,
+            "payload": {"columns": ["a"], "pagekey": "0-100--asc", "start": 0, "end": 99, "orderby": ""},
+        },
+    )
+    assert ws_client.get_received()
+    with gui.get_flask_app().app_context():
+        g.client_id = sid
+        invoke_callback(gui, sid, append, [])
+    received_messages = ws_client.get_received()
+    deltas = [
+        pl
+        for m in received_messages
+        if m["args"]["type"] == "MU"
+        for pl in m["args"]["payload"]
+        if pl["name"] == var_name
+    ]
+    assert len(deltas) == 1
+    payload = deltas[0]["payload"]
+    assert payload["append"] is True
+    assert payload["pagekeys"] == ["0-100--asc"]
+    assert payload["value"]["rowcount"] == 4
+    assert payload["value"]["start"] == 3
+    assert [r["a"] for r in payload["value"]["data"]] == [4]
+    with gui.get_flask_app().app_context():
+        g.client_id = sid
+        assert gui._Gui__state.data["a"].tolist() == [1, 2, 3, 4]
+        # a new value is requested as a whole
+        invoke_callback(gui, sid, assign, [])
+    received_messages = ws_client.get_received()
+    updates = [
+        pl
+        for m in received_messages
+        if m["args"]["type"] == "MU"
+        for pl in m["args"]["payload"]
+        if pl["name"] == var_name
+    ]
+    assert len(updates) == 1
+    assert isinstance(updates[0]["payload"]["value"], int)
@@ -0,0 +1,36 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import inspect
+
+from taipy.gui import Gui, Markdown
+
+
+def test_disconnect_drops_client_data(gui: Gui, helpers, csvdata):
+    # Bind test variables
+    csvdata = csvdata
+
+    # set gui frame
+    gui._set_frame(inspect.currentframe())
+
+    gui.add_page("test", Markdown("<|{csvdata}|table|>"))
+    gui.run(run_server=False)
+    flask_client = gui._server.test_client()
+    # WS client and emit
+    ws_client = gui._server._ws.test_client(gui._server.get_flask())
+    sid = helpers.create_scope_and_get_sid(gui)
+    # Get the jsx once so that the page will be evaluated -> variable will be registered
+    flask_client.get(f"/taipy-jsx/test?client_id={sid}")
+    ws_client.emit("message", {"client_id": sid, "type": "RU", "name": "", "payload": {"names": []}})
+    dropped_clients = []
+    gui._accessors._drop_client = dropped_clients.append  # type: ignore
+    ws_client.disconnect()
+    assert dropped_clients == [sid]
@@ -0,0 +1,96 @@
+# Copyright 2021-2024 Avaiga Private Limited
+#
+# Licensed under the Apache License, Version 2.0 (the "License"); you may not use this file except in compliance with
+# the License. You may obtain a copy of the License at
+#
+#        http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software distributed under the License is distributed on
+# an "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the License for the
+# specific language governing permissions and limitations under the License.
+
+import inspect
+
+import pandas as pd
+from flask import g
+
+from taipy.gui import Gui, Markdown, State, invoke_callback
+
+
+def test_du_unchanged(gui: Gui, helpers):
+    data = pd.DataFrame({"a": [1, 2, 3]})  # noqa: F841
+
+    def assign(state: State):
+        state.data = pd.DataFrame({"a": [1, 2, 3]})
+
+    gui._set_frame(inspect.currentframe())
+    gui.add_page("test", Markdown("<|{data}|table|>"))
+    gui.run(run_server=False)
+    flask_client = gui._server.test_client()
+    ws_client = gui._server._ws.test_client(gui._server.get_flask())
+    sid = helpers.create_scope_and_get_sid(gui)
+    flask_client.get(f"/taipy-jsx/test?client_id={sid}")
+    var_name = "_TpD_tpec_TpExPr_data_TPMDL_0"
+
+    def request_data(version=None):
+        payload = {"columns": ["a"], "pagekey": "0-100--asc", "start": 0, "end": 99, "orderby": ""}
+        if version is not None:
+            payload["version"] = version
+        ws_client.emit("message", {"client_id": sid, "type": "DU", "name": var_name, "payload": payload})
+        received_messages = ws_client.get_received()
+        assert received_messages
+        return received_messages[0]["args"]["payload"][0]["payload"]
+
+    payload = request_data()
+    version = payload["version"]
+    assert isinstance(version, str)
+    assert payload["value"]["rowcount"] == 3
+    # same request on the same data
+    payload = request_data(version)
+    assert payload["unchanged"] is True
+    assert payload["value"] is None
+    assert payload["version"] == version
+    # a first rendering does not change the data
+    ws_client.emit("message", {"client_id": sid, "type": "RU", "name": "", "payload": {"names": [var_name]}})
+    ws_client.get_received()
+    assert request_data(version).get("unchanged") is True
+    # an equal value is assigned
+    with gui.get_flask_app().app_context():
+        g.client_id = sid
+        invoke_callback(gui, sid, assign, [])
+    ws_client.get_received()
+    payload = request_data(version)
+    assert "unchanged" not in payload
+    assert payload["version"] != version
+    assert payload["value"]["rowcount"] == 3
+
+
+def test_du_styled_always_sent(gui: Gui, helpers):
+    data = pd.DataFrame({"a": [1, 2, 3]})  # noqa: F841
+
+    def style_fn(state, value, index, row, column_name):
+        return "class"
+
+    gui._set_frame(inspect.currentframe())
+    gui.add_page("test", Markdown("<|{data}|table|>"))
+    gui.run(run_server=False)
+    flask_client = gui._server.test_client()
+    ws_client = gui._server._ws.test_client(gui._server.get_flask())
+    sid = helpers.create_scope_and_get_sid(gui)
+    flask_client.get(f"/taipy-jsx/test?client_id={sid}")
+    var_name = "_TpD_tpec_TpExPr_data_TPMDL_0"
+
+    def request_data(**kwargs):
+        payload = {"columns": ["a"], "pagekey": "0-100--asc", "start": 0, "end": 99, "orderby": "", **kwargs}
+        ws_client.emit("message", {"client_id": sid, "type": "DU", "name": var_name, "payload": payload})
+        received_messages = ws_client.get_received()
+        assert received_messages
+        return received_messages[0]["args"]["payload"][0]["payload"]
+
+    # a style function can change its result without the data changing
+    payload = request_data(styles={"a": "style_fn"})
+    assert "version" not in payload
+    assert payload["value"]["rowcount"] == 3
+    # so can a decimator
+    payload = request_data(decimatorPayload={"decimators": [{"decimator": "d"}]})
+    assert "version" not in payload
@@ -0,0 +1,115 @@
+# ############################################################
+# Benchmark the decimators against their previous implementations
+#
+# Usage (from the repository root, with taipy installed):
+#     python -m tools.benchmark_decimators
+# ############################################################
+import time
+import typing as t
+
+import numpy as np
+
+from taipy.gui.data.decimator import LTTB, M4, RDP, ScatterDecimator
+from tests.taipy.gui.decimator_helpers import lttb_loop, rdp_epsilon_stack, rdp_points_tree, scatter_loop
+
+
+# ############################################################
+# Benchmarks
+# ############################################################
+def timed(function: t.Callable[[], np.ndarray], repeat: int = 3) -> t.Tuple[float, np.ndarray]:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def random_walk(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return np.column_stack([np.arange(n, dtype=float), rng.normal(size=n).cumsum()])
+
+
+def benchmark_lttb() -> None:
+    # The points of bins of 512 points and more are still selected one bin at a time, only their
+    # centroids are computed at once: the gain is smaller (see the 10M points, n_out=5000 case).
+    print("LTTB")
+    cases = [(200_000, 20_000), (1_000_000, 1_000), (1_000_000, 100_000), (10_000_000, 200_000), (10_000_000, 5_000)]
+    for n, n_out in cases:
+        data = random_walk(n)
+        previous, expected = timed(lambda: lttb_loop(data, n_out))
+        current, mask = timed(lambda: LTTB(n_out).decimate(data, {}))
+        print(
+            f"  {n:>10} points, n_out={n_out:>7}: previous {previous:.3f}s, current {current:.3f}s"
+            f" (x{previous / current:.1f}), identical masks: {np.array_equal(mask, expected)}"
+        )
+
+
+def benchmark_scatter() -> None:
+    print("ScatterDecimator")
+    rng = np.random.default_rng(0)
+    for n, width, height in [(100_000, 800, 500), (1_000_000, 800, 500), (3_000_000, 1600, 1000)]:
+        data = rng.normal(size=(n, 2))
+        previous, expected = timed(lambda: scatter_loop(data, width, height, 3), repeat=1)
+        current, mask = timed(lambda: ScatterDecimator().decimate(data, {"width": width, "height": height}))
+        print(
+            f"  {n:>10} points, {width}x{height}: previous {previous:.3f}s, current {current:.3f}s"
+            f" (x{previous / current:.1f}), identical masks: {np.array_equal(mask, expected)}"
+        )
+
+
+def benchmark_rdp() -> None:
+    print("RDP")
+    for n, n_out in [(100_000, 1_000), (100_000, 20_000), (1_000_000, 5_000)]:
+        data = random_walk(n)
+        previous, expected = timed(lambda: rdp_points_tree(data, n_out), repeat=1)
+        current, mask = timed(lambda: RDP(n_out=n_out).decimate(data, {}))
+        print(
+            f"  {n:>10} points, n_out={n_out:>7}: previous {previous:.3f}s, current {current:.3f}s"
+            f" (x{previous / current:.1f}), common points: {(mask & expected).sum() / n_out:.0%}"
+        )
+    for n, epsilon in [(100_000, 1), (1_000_000, 1), (1_000_000, 5)]:
+        data = random_walk(n)
+        previous, expected = timed(lambda: rdp_epsilon_stack(data, epsilon), repeat=1)
+        current, mask = timed(lambda: RDP(epsilon=epsilon).decimate(data, {}))
+        print(
+            f"  {n:>10} points, epsilon={epsilon:>5}: previous {previous:.3f}s, current {current:.3f}s"
+            f" (x{previous / current:.1f}), identical masks: {np.array_equal(mask, expected)}"
+        )
+
+
+def benchmark_m4() -> None:
+    print("M4 (compared to LTTB with as many points)")
+    for n, width in [(1_000_000, 1_000), (10_000_000, 2_000)]:
+        data = random_walk(n)
+        current, mask = timed(lambda: M4().decimate(data, {"width": width}))
+        lttb, _ = timed(lambda: LTTB(int(mask.sum())).decimate(data, {}))
+        print(
+            f"  {n:>10} points, width={width:>5}: LTTB {lttb:.3f}s, M4 {current:.3f}s"
+            f" (x{lttb / current:.1f}), {mask.sum()} points"
+        )
+
+
+def benchmark_m4_pyramid() -> None:
+    print("M4 pyramid (compared to M4 on the whole data)")
+    n, width = 20_000_000, 2_000
+    data = random_walk(n)
+    decimator = M4(pyramid=True)
+    build, pyramid = timed(lambda: decimator._build_pyramid(data[:, 0], data[:, 1]), repeat=1)
+    print(f"  {n:>10} points: pyramid built in {build:.3f}s, {pyramid.nbytes / n:.2f} bytes per point")
+    for x0, x1 in [(0, n - 1), (n // 4, 3 * n // 4), (n // 2, n // 2 + n // 100)]:
+        payload = {"width": width, "relayoutData": {"xaxis.range[0]": x0, "xaxis.range[1]": x1}}
+        previous, expected = timed(lambda: M4().decimate(data, payload))
+        current, rows = timed(lambda: decimator._decimate_pyramid(pyramid, payload))
+        print(
+            f"  range of {x1 - x0:>10} points: M4 {previous:.3f}s, pyramid {current:.4f}s"
+            f" (x{previous / current:.0f}), identical points: {np.array_equal(rows, np.flatnonzero(expected))}"
+        )
+
+
+if __name__ == "__main__":
+    benchmark_lttb()
+    benchmark_scatter()
+    benchmark_rdp()
+    benchmark_m4()
+    benchmark_m4_pyramid()